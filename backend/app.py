@@ -3,7 +3,7 @@ Main Flask application with API routes and endpoints
 
 Built by: Josh Topp, Josh Schmidt, Max Quirk
 """
-from flask import Flask, request, jsonify, session, send_from_directory
+from flask import Flask, request, jsonify, session, send_from_directory, g, Response
 from services.auth_service import AuthService
 from repositories.user_repository import UserRepository
 from repositories.group_repository import GroupRepository
@@ -13,13 +13,25 @@ from repositories.study_scheduler_repository import StudySchedulerRepository
 from repositories.chat_repository import ChatRepository
 from repositories.profile_repository import ProfileRepository
 from repositories.password_reset_token_repository import PasswordResetTokenRepository
+from repositories.json_store import SNAPSHOT_FORMATS
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from repositories.sqlite_group_repository import SQLiteGroupRepository
+from repositories.sqlite_friend_repository import SQLiteFriendRepository
+from repositories.sqlite_notification_repository import SQLiteNotificationRepository
+from repositories.sqlite_study_scheduler_repository import SQLiteStudySchedulerRepository
+from repositories.sqlite_chat_repository import SQLiteChatRepository
+from repositories.sqlite_profile_repository import SQLiteProfileRepository
+from repositories.sqlite_password_reset_token_repository import SQLitePasswordResetTokenRepository
 from services.group_service import GroupService
 from services.profile_service import ProfileService
 from services.notification_service import NotificationService
 from services.scheduler_services import SchedulerService
 from services.chat_service import ChatService
 from services.friend_service import FriendService
+from services.message_broker import MessageBroker, BrokerFullError
+from services.password_hasher import PasswordHasher, HasherBusyError
 from models.group import Group
+import json
 import os
 import secrets
 
@@ -40,38 +52,125 @@ app = Flask(
 # Use environment variable for secret key, fallback to generated key
 app.secret_key = os.environ.get('SECRET_KEY') or secrets.token_hex(32) 
 
-# Initialize repositories and services with absolute paths
-user_repo = UserRepository(os.path.join(DATA_DIR, 'users.json'))
-token_repo = PasswordResetTokenRepository(os.path.join(DATA_DIR, 'password_reset_tokens.json'))
-group_repo = GroupRepository(os.path.join(DATA_DIR, 'groups.json'))
-profile_repo = ProfileRepository(os.path.join(DATA_DIR, 'profiles.json'))
-friend_repo = FriendRepository(os.path.join(DATA_DIR, 'friends.json'))
-notification_repo = NotificationRepository(os.path.join(DATA_DIR, 'notifications.json'))
-study_scheduler_repo = StudySchedulerRepository(os.path.join(DATA_DIR, 'schedule.json'))
-chat_repo = ChatRepository(os.path.join(DATA_DIR, 'chat.json'))
-auth_service = AuthService(user_repo, token_repo)
+# Storage backend: 'json' (default, one file per repository) or 'sqlite' (single database)
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'json').lower()
+DATABASE_PATH = os.environ.get('DATABASE_PATH', os.path.join(DATA_DIR, 'study_buddy.db'))
+# JSON backend durability: 0 writes each change before responding, N > 0 saves
+# in the background at most every N seconds (and on shutdown)
+PERSIST_INTERVAL = float(os.environ.get('PERSIST_INTERVAL', 0))
+# JSON backend with several worker processes on the same data directory:
+# changes are made under a file lock and picked up by the other workers
+SHARED_STORAGE = os.environ.get('SHARED_STORAGE', '').lower() in ('1', 'true', 'yes')
+# JSON backend file format: 'json' (indented, the default) or 'compact' (versioned,
+# row-per-record and compressed). Both are read, so switching converts on the next save
+SNAPSHOT_FORMAT = os.environ.get('SNAPSHOT_FORMAT', 'json').lower()
+if SNAPSHOT_FORMAT not in SNAPSHOT_FORMATS:
+    raise ValueError(f"Unknown SNAPSHOT_FORMAT '{SNAPSHOT_FORMAT}', expected 'json' or 'compact'")
+# JSON backend: spread groups and chats over this many files so a change rewrites
+# one shard instead of the whole file (0 = a single file each, the default)
+STORAGE_SHARDS = int(os.environ.get('STORAGE_SHARDS', 0))
+
+# Initialize repositories and services with absolute paths. JSON repositories
+# are lazy: each file is parsed on the first request that needs it, not at startup
+if STORAGE_BACKEND == 'sqlite':
+    user_repo = SQLiteUserRepository(DATABASE_PATH)
+    token_repo = SQLitePasswordResetTokenRepository(DATABASE_PATH)
+    group_repo = SQLiteGroupRepository(DATABASE_PATH)
+    profile_repo = SQLiteProfileRepository(DATABASE_PATH)
+    friend_repo = SQLiteFriendRepository(DATABASE_PATH)
+    notification_repo = SQLiteNotificationRepository(DATABASE_PATH)
+    study_scheduler_repo = SQLiteStudySchedulerRepository(DATABASE_PATH)
+    chat_repo = SQLiteChatRepository(DATABASE_PATH)
+elif STORAGE_BACKEND == 'json':
+    json_options = dict(flush_interval=PERSIST_INTERVAL, shared=SHARED_STORAGE, lazy=True,
+                        snapshot_format=SNAPSHOT_FORMAT)
+    user_repo = UserRepository(os.path.join(DATA_DIR, 'users.json'), **json_options)
+    token_repo = PasswordResetTokenRepository(os.path.join(DATA_DIR, 'password_reset_tokens.json'), **json_options)
+    group_repo = GroupRepository(os.path.join(DATA_DIR, 'groups.json'), shards=STORAGE_SHARDS, **json_options)
+    profile_repo = ProfileRepository(os.path.join(DATA_DIR, 'profiles.json'), **json_options)
+    friend_repo = FriendRepository(os.path.join(DATA_DIR, 'friends.json'), **json_options)
+    notification_repo = NotificationRepository(os.path.join(DATA_DIR, 'notifications.json'), **json_options)
+    study_scheduler_repo = StudySchedulerRepository(os.path.join(DATA_DIR, 'schedule.json'), **json_options)
+    chat_repo = ChatRepository(os.path.join(DATA_DIR, 'chat.json'), journal=True, shards=STORAGE_SHARDS,
+                               **json_options)
+else:
+    raise ValueError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}', expected 'json' or 'sqlite'")
+
+# bcrypt runs in HASH_WORKERS processes (0 = on the request thread); once
+# HASH_QUEUE_SIZE more calls are waiting, or one takes longer than HASH_TIMEOUT
+# seconds, auth requests get 503 instead of queueing
+password_hasher = PasswordHasher(
+    workers=int(os.environ.get('HASH_WORKERS', os.cpu_count() or 1)),
+    max_queue=int(os.environ.get('HASH_QUEUE_SIZE', 32)),
+    timeout=float(os.environ.get('HASH_TIMEOUT', 30)),
+    rounds=int(os.environ.get('BCRYPT_ROUNDS', 12))
+)
+auth_service = AuthService(user_repo, token_repo, password_hasher)
 friend_service = FriendService(friend_repo,user_repo)
 profile_service = ProfileService(profile_repo)
-notification_service = NotificationService(notification_repo)
 study_scheduler_service = SchedulerService(study_scheduler_repo)
-chat_service = ChatService(chat_repo)
-
-group_repo = GroupRepository(os.path.join(DATA_DIR, 'groups.json'))
+# In-process pub/sub feeding the streaming endpoints. It only reaches streams held by
+# this process: with several workers (SHARED_STORAGE, gunicorn -w N) an event published
+# in one worker is not delivered to streams open on another. Clients therefore render
+# what their own requests return (e.g. 'sent' from /api/chat/send) and treat the streams
+# as a best-effort live feed; a reconnect replays what was missed from storage.
+# Every open stream holds a server thread, so at most STREAM_LIMIT are open per
+# process; beyond that the stream endpoints answer 503.
+message_broker = MessageBroker(max_queue=int(os.environ.get('STREAM_QUEUE_SIZE', 100)),
+                               max_subscribers=int(os.environ.get('STREAM_LIMIT', 64)))
+# Seconds between keep-alive comments on idle streams
+STREAM_KEEPALIVE = 15
+
+chat_service = ChatService(chat_repo, message_broker)
+notification_service = NotificationService(notification_repo, message_broker)
 group_service = GroupService(group_repo)
 
 
 # HELPER FUNCTIONS
 
+def sse_event(data, event_id=None):
+    """Format one Server-Sent Events frame"""
+    frame = f"id: {event_id}\n" if event_id is not None else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+def busy_response(error):
+    """503 telling the client to retry, when the password hasher or the stream limit is saturated"""
+    response = jsonify({'success': False, 'error': str(error)})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+def resolve_user_emails(user_ids):
+    """Batch-resolve user IDs into the per-request email memo"""
+    memo = g.setdefault('user_emails', {})
+    missing = {user_id for user_id in user_ids if user_id not in memo}
+    if missing:
+        found = user_repo.find_emails_by_ids(missing)
+        for user_id in missing:
+            memo[user_id] = found.get(user_id)
+    return memo
+
+
 def convert_ids_to_emails(user_ids):
     """Convert a list of user IDs to emails"""
-    emails = []
-    for user_id in user_ids:
-        user = user_repo.find_by_id(user_id)
-        if user:
-            emails.append(user.email)
-        else:
-            emails.append(str(user_id))  # Fallback to ID if user not found
-    return emails
+    memo = resolve_user_emails(user_ids)
+    # Fallback to ID if user not found
+    return [memo[user_id] or str(user_id) for user_id in user_ids]
+
+
+def convert_members_to_emails(entries):
+    """Convert the 'members' list of every dict in entries, resolving all IDs in one pass"""
+    resolve_user_emails([user_id for entry in entries for user_id in entry['members']])
+    for entry in entries:
+        entry['members'] = convert_ids_to_emails(entry['members'])
+    return entries
+
+def notify_members(members, actor_id, others_message, actor_message=None):
+    """Fan a notification out to every other member in one bulk write; the actor gets actor_message"""
+    notification_service.send_bulk([member for member in members if member != actor_id], others_message)
+    if actor_message is not None and actor_id in members:
+        notification_service.send_notification(actor_id, actor_message)
 
 # FRONTEND ROUTES
 
@@ -114,6 +213,8 @@ def register():
             'message': 'Account created successfully',
             'data': {'user': user.to_dict()}
         }), 201
+    except HasherBusyError as e:
+        return busy_response(e)
     except ValueError as e:
         return jsonify({'success': False, 'error': str(e)}), 400
 
@@ -134,6 +235,8 @@ def login():
         session['user_id'] = user.id
         session['email'] = user.email
         return jsonify({'success': True, 'message': 'Login successful', 'data': {'user': user.to_dict()}})
+    except HasherBusyError as e:
+        return busy_response(e)
     except ValueError as e:
         return jsonify({'success': False, 'error': str(e)}), 401
 
@@ -225,6 +328,8 @@ def reset_password():
             'success': True,
             'message': 'Password has been reset successfully. You can now login with your new password.'
         }), 200
+    except HasherBusyError as e:
+        return busy_response(e)
     except ValueError as e:
         error_message = str(e)
         # If it's a configuration error, return 503
@@ -299,11 +404,9 @@ def join_group():
         updated_group = group_service.join_group(user_id, group_id)
         chat_service.join_chat(user_id, group_id)
         group = group_service.get_group(group_id)
-        for member in group.to_dict()['members']:
-            if user_id == member:
-                notification_service.send_notification(member, f"You joined the group {group.to_dict()['name']}")
-            else:
-                notification_service.send_notification(member, f"{user_id} joined the group {group.to_dict()['name']}")
+        notify_members(group.members, user_id,
+                       f"{user_id} joined the group {group.name}",
+                       f"You joined the group {group.name}")
         # Convert member IDs to emails
         group_dict = updated_group.to_dict()
         group_dict['members'] = convert_ids_to_emails(group_dict['members'])
@@ -353,9 +456,7 @@ def leave_group():
 
         # Send notifications to remaining members
         if group_after:
-            for member in group_after.members:
-                if member != user_id:
-                    notification_service.send_notification(member, f"{user_id} left the group {group_name}")
+            notify_members(group_after.members, user_id, f"{user_id} left the group {group_name}")
 
         # Send notification to user who left
         notification_service.send_notification(user_id, f"You left the group {group_name}")
@@ -377,12 +478,7 @@ def list_groups():
 
     # Get groups user belongs to using service method
     user_groups = group_service.get_user_groups(user_id)
-    groups = [g.to_dict() for g in user_groups]
-    groups = []
-    for g in user_groups:
-        group_dict = g.to_dict()
-        group_dict['members'] = convert_ids_to_emails(group_dict['members'])
-        groups.append(group_dict)
+    groups = convert_members_to_emails([group.to_dict() for group in user_groups])
     return jsonify({
         'success': True,
         'groups': groups
@@ -401,11 +497,7 @@ def upload_profile():
 @app.route('/api/group/listall', methods=['GET'])
 def list_all_groups():
     all_groups = group_service.list_all_groups()
-    group_list = []
-    for group in all_groups:
-        group_dict = group.to_dict()
-        group_dict['members'] = convert_ids_to_emails(group_dict['members'])
-        group_list.append(group_dict)
+    group_list = convert_members_to_emails([group.to_dict() for group in all_groups])
     return jsonify({
         'success': True,
         'groups': group_list
@@ -418,6 +510,24 @@ def get_notifications():
         return jsonify({'success': False, 'error': 'Not logged in'}), 401
 
     user_id = session['user_id']
+
+    # Paginated mode: /api/notifications?after=<id>&limit=<n>
+    if 'after' in request.args or 'limit' in request.args:
+        try:
+            after = int(request.args['after']) if 'after' in request.args else None
+            limit = int(request.args.get('limit', 50))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'after and limit must be integers'}), 400
+        if limit < 1:
+            return jsonify({'success': False, 'error': 'limit must be at least 1'}), 400
+
+        notifications = notification_service.get_notifications_page(user_id, after=after, limit=limit)
+        return jsonify({
+            'success': True,
+            'notifications': [notification.to_dict() for notification in notifications],
+            'next': notifications[-1].id if len(notifications) == limit else None
+        })
+
     notifications = notification_service.get_notifications(user_id)
     return jsonify({
         'success': True,
@@ -425,6 +535,69 @@ def get_notifications():
     })
 
 
+@app.route("/api/notifications/stream", methods=['GET'])
+def stream_notifications():
+    """
+    Server-Sent Events stream of the user's new notifications.
+    Resumes after ?since=<notification id> or the Last-Event-ID header; without
+    either only notifications created after connecting are sent.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'}), 401
+
+    user_id = session['user_id']
+    try:
+        since = request.headers.get('Last-Event-ID') or request.args.get('since')
+        since = int(since) if since is not None else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'since must be an integer'}), 400
+
+    # Subscribe before reading the backlog so nothing created in between is missed
+    try:
+        subscription = message_broker.subscribe(NotificationService.topic(user_id))
+    except BrokerFullError as e:
+        return busy_response(e)
+
+    def generate():
+        last_id = since
+        try:
+            if last_id is not None:
+                for notification in notification_service.get_notifications_page(user_id, after=last_id):
+                    last_id = notification.id
+                    yield sse_event(notification.to_dict(), last_id)
+
+            while True:
+                notifications = subscription.get(timeout=STREAM_KEEPALIVE)
+                if subscription.overflowed:
+                    # Too slow to keep up; the browser reconnects with Last-Event-ID
+                    break
+                if not notifications:
+                    yield ": keep-alive\n\n"
+                for notification in notifications:
+                    if last_id is None or notification['id'] > last_id:
+                        last_id = notification['id']
+                        yield sse_event(notification, last_id)
+        finally:
+            subscription.close()
+
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Also released when the client leaves before the stream started
+    response.call_on_close(subscription.close)
+    return response
+
+
+@app.route("/api/notifications/unread_count", methods=['GET'])
+def get_unread_notification_count():
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'}), 401
+
+    return jsonify({
+        'success': True,
+        'unread': notification_service.get_unread_count(session['user_id'])
+    })
+
+
 @app.route("/api/notifications/read", methods=['POST'])
 def mark_notification_as_read():
     if 'user_id' not in session:
@@ -478,14 +651,12 @@ def create_study_schedule():
     try:
         if group_id:
             group = group_service.get_group(group_id)
-            for member in group.to_dict()['members']:
+            members = group.members
+            for member in members:
                 schedule = study_scheduler_service.create_study_scheduler(member, title, start_time, end_time, group_id)
-                if user_id == member:
-                    notification_service.send_notification(member,
-                                                           f"You created a Study Schedule for Group {group.to_dict()['name']} from {start_time} to {end_time}")
-                else:
-                    notification_service.send_notification(member,
-                                                           f"{user_id} rceated a Study Schedule for Group {group.to_dict()['name']} from {start_time} to {end_time}")
+            notify_members(members, user_id,
+                           f"{user_id} rceated a Study Schedule for Group {group.name} from {start_time} to {end_time}",
+                           f"You created a Study Schedule for Group {group.name} from {start_time} to {end_time}")
 
         return jsonify({
             'success': True,
@@ -538,11 +709,9 @@ def join_chat():
 
     chat = chat_service.join_chat(user_id, chat_id)
     group = chat_service.get_chat(chat_id)
-    for member in group.to_dict()['members']:
-        if user_id == member:
-            notification_service.send_notification(member, f"You joined a Chat {group.to_dict()['name']}!")
-        else:
-            notification_service.send_notification(member, f"{user_id} joined a Chat {group.to_dict()['name']}!")
+    notify_members(group.members, user_id,
+                   f"{user_id} joined a Chat {group.name}!",
+                   f"You joined a Chat {group.name}!")
     # Convert member IDs to emails
     chat_dict = chat.to_dict()
     chat_dict['members'] = convert_ids_to_emails(chat_dict['members'])
@@ -588,24 +757,107 @@ def send_message():
     user = user_repo.find_by_id(user_id)
     user_email = user.email if user else str(user_id)
 
-    chat = chat_service.send_message(user_id, chat_id, message, user_email)
-    group = chat_service.get_chat(chat_id)
-    for member in chat.members:
-        if user_id == member:
-            pass
-        else:
-            notification_service.send_notification(member, f"{user_email} just sent a message in {group.to_dict()['name']}!")
+    # Only the summary goes back; history is paged through /api/chat/<id>/messages
+    chat_dict = chat_service.send_message(user_id, chat_id, message, user_email)
+    notify_members(chat_dict['members'], user_id, f"{user_email} just sent a message in {chat_dict['name']}!")
 
-    # Convert member IDs to emails
-    chat_dict = chat.to_dict()
     chat_dict['members'] = convert_ids_to_emails(chat_dict['members'])
 
     return jsonify({
         'success': True,
         'message': f'Chat sent successfully!',
-        'study': chat_dict
+        'study': chat_dict,
+        'sent': chat_dict['last_message']
     })
 
+@app.route('/api/chat/<chat_id>/messages', methods=['GET'])
+def get_chat_messages(chat_id):
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'}), 401
+
+    chat = chat_service.get_chat(chat_id)
+    if not chat:
+        return jsonify({'success': False, 'error': 'Chat not found'}), 404
+    if session['user_id'] not in chat.members:
+        return jsonify({'success': False, 'error': 'Not a member of this chat'}), 403
+
+    # /api/chat/<id>/messages?before=<message id>&limit=<n>, or ?after=<message id> for newer ones
+    try:
+        before = int(request.args['before']) if 'before' in request.args else None
+        after = int(request.args['after']) if 'after' in request.args else None
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'before, after and limit must be integers'}), 400
+    if limit < 1:
+        return jsonify({'success': False, 'error': 'limit must be at least 1'}), 400
+
+    messages = chat_service.get_messages(chat_id, before=before, limit=limit, after=after)
+    return jsonify({
+        'success': True,
+        'messages': messages,
+        # Cursor for the next older page, None once the start of the history is reached
+        'before': messages[0]['id'] if messages and messages[0]['id'] > 1 else None
+    })
+
+@app.route('/api/chat/<chat_id>/stream', methods=['GET'])
+def stream_chat_messages(chat_id):
+    """
+    Server-Sent Events stream of new messages in a chat.
+    Resumes after ?since=<message id> or the Last-Event-ID header, so clients
+    that reconnect (including after falling behind) only receive what they missed.
+    """
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Not logged in'}), 401
+
+    chat = chat_service.get_chat(chat_id)
+    if not chat:
+        return jsonify({'success': False, 'error': 'Chat not found'}), 404
+    if session['user_id'] not in chat.members:
+        return jsonify({'success': False, 'error': 'Not a member of this chat'}), 403
+
+    try:
+        since = request.headers.get('Last-Event-ID') or request.args.get('since')
+        since = int(since) if since is not None else len(chat.messages or [])
+    except ValueError:
+        return jsonify({'success': False, 'error': 'since must be an integer'}), 400
+
+    # Subscribe before reading the backlog so nothing sent in between is missed
+    try:
+        subscription = message_broker.subscribe(ChatService.topic(chat_id))
+    except BrokerFullError as e:
+        return busy_response(e)
+
+    def generate():
+        last_id = since
+        try:
+            while True:
+                backlog = chat_service.get_messages(chat_id, after=last_id, limit=100)
+                for message in backlog:
+                    last_id = message['id']
+                    yield sse_event(message, last_id)
+                if len(backlog) < 100:
+                    break
+
+            while True:
+                messages = subscription.get(timeout=STREAM_KEEPALIVE)
+                if subscription.overflowed:
+                    # Too slow to keep up; the browser reconnects with Last-Event-ID
+                    break
+                if not messages:
+                    yield ": keep-alive\n\n"
+                for message in messages:
+                    if message['id'] > last_id:
+                        last_id = message['id']
+                        yield sse_event(message, last_id)
+        finally:
+            subscription.close()
+
+    response = Response(generate(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Also released when the client leaves before the stream started
+    response.call_on_close(subscription.close)
+    return response
+
 @app.route('/api/chat/receive', methods=['POST'])
 def get_chat():
     data = request.get_json() or {}
@@ -630,11 +882,9 @@ def leave_chat():
 
     chat = chat_service.leave_chat(user_id, chat_id)
     group = chat_service.get_chat(chat_id)
-    for member in group.to_dict()['members']:
-        if user_id == member:
-            notification_service.send_notification(member, f"You left a Chat {group.to_dict()['name']}!")
-        else:
-            notification_service.send_notification(member, f"{user_id} left a Chat {group.to_dict()['name']}!")
+    notify_members(group.members, user_id,
+                   f"{user_id} left a Chat {group.name}!",
+                   f"You left a Chat {group.name}!")
 
     # Convert member IDs to emails
     chat_dict = chat.to_dict()
@@ -655,8 +905,7 @@ def list_all_chats():
     user_chats = chat_service.list_all_chats(user_id)
 
     # Convert member IDs to emails in each chat
-    for chat_id, chat in user_chats.items():
-        chat['members'] = convert_ids_to_emails(chat['members'])
+    convert_members_to_emails(list(user_chats.values()))
 
     return jsonify({
         'success': True,
@@ -671,13 +920,23 @@ def filter_groups():
     value = data.get('value')
     print(data)
     print(filter_type, value)
-    if not filter_type or not value:
+
+    # Combined query: {"class": ..., "time": ..., "mode": "and" | "or"}
+    if not filter_type and (data.get('class') or data.get('time')):
+        mode = data.get('mode', 'and')
+        if mode not in ('and', 'or'):
+            return jsonify({'success': False, 'error': 'Mode must be "and" or "or"'}), 400
+        groups = group_service.filter_groups(
+            data.get('class') or None,
+            data.get('time') or None,
+            match_all=mode == 'and'
+        )
+    elif not filter_type or not value:
         return jsonify({
             "success": False,
             "error": "Missing a field"
         })
-
-    if filter_type == "class":
+    elif filter_type == "class":
         print(value)
         groups = group_service.filter_by_specified_class(value)
     elif filter_type == "time":
@@ -685,11 +944,7 @@ def filter_groups():
     else:
         return jsonify({'success': False, 'error': 'Invalid JSON format'}), 400
     # Convert member IDs to emails
-    group_list = []
-    for group in groups:
-        group_dict = group.to_dict()
-        group_dict['members'] = convert_ids_to_emails(group_dict['members'])
-        group_list.append(group_dict)
+    group_list = convert_members_to_emails([group.to_dict() for group in groups])
 
     return jsonify({
         'success': True,
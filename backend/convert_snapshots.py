@@ -0,0 +1,73 @@
+"""
+Rewrite the JSON repository data files in another snapshot format
+
+Repositories read both formats, so this is optional: with SNAPSHOT_FORMAT set,
+each file is converted on its next save anyway. Run it with the app stopped and
+the same STORAGE_SHARDS as the app:
+
+    python convert_snapshots.py [compact|json] [data_dir]
+
+The chat journal is folded into the chat snapshot first, so no message is left
+only in chat.json.log. Shard files are converted along with the single files.
+
+Built by:
+"""
+
+import glob
+import os
+import sys
+from repositories.chat_repository import ChatRepository
+from repositories.json_store import SNAPSHOT_FORMATS, read_json, snapshot_format, write_json
+
+DATA_FILES = [
+    'users.json',
+    'groups.json',
+    'friends.json',
+    'notifications.json',
+    'schedule.json',
+    'chat.json',
+    'profiles.json',
+    'password_reset_tokens.json',
+]
+
+
+def compact_chat_journal(data_dir, target, shards=0):
+    """Fold chat.json.log into the chat snapshot the app loads (single file or shards)"""
+    path = os.path.join(data_dir, 'chat.json')
+    if not os.path.exists(path + '.log'):
+        return
+    # Opened without journal mode, the repository replays the journal and compacts it
+    ChatRepository(path, snapshot_format=target, shards=shards)
+    if os.path.exists(path + '.log'):
+        raise RuntimeError(f"{path}.log could not be compacted; nothing was converted")
+    print("chat.json.log: compacted into the chat snapshot")
+
+
+def snapshot_files(data_dir, filename):
+    """The single file plus the shard files of every shard layout (see ShardedStore)"""
+    base = os.path.join(data_dir, os.path.splitext(filename)[0])
+    shards = sorted(glob.glob(os.path.join(glob.escape(base) + '.*-shards', '[0-9]*.json')))
+    return [os.path.join(data_dir, filename)] + shards
+
+
+def convert(data_dir, target, shards=0):
+    if target not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format '{target}', expected 'json' or 'compact'")
+    compact_chat_journal(data_dir, target, shards)
+    for filename in DATA_FILES:
+        for path in snapshot_files(data_dir, filename):
+            current = snapshot_format(path)
+            if current is None:
+                continue
+            before = os.path.getsize(path)
+            if current != target:
+                write_json(path, read_json(path), snapshot_format=target)
+            name = os.path.relpath(path, data_dir)
+            print(f"{name}: {current} -> {target}, {before} -> {os.path.getsize(path)} bytes")
+
+
+if __name__ == '__main__':
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    target = sys.argv[1] if len(sys.argv) > 1 else 'compact'
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, 'data')
+    convert(data_dir, target, int(os.environ.get('STORAGE_SHARDS', 0)))
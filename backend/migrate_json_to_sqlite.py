@@ -0,0 +1,57 @@
+"""
+One-off migration of the JSON data files into the SQLite database
+
+Run from the backend directory before starting with STORAGE_BACKEND=sqlite, with
+the same STORAGE_SHARDS the JSON backend ran with:
+
+    python migrate_json_to_sqlite.py [data_dir] [database_path]
+
+Built by:
+"""
+
+import os
+import sys
+from repositories.user_repository import UserRepository
+from repositories.group_repository import GroupRepository
+from repositories.friend_repository import FriendRepository
+from repositories.notification_repository import NotificationRepository
+from repositories.study_scheduler_repository import StudySchedulerRepository
+from repositories.chat_repository import ChatRepository
+from repositories.profile_repository import ProfileRepository
+from repositories.password_reset_token_repository import PasswordResetTokenRepository
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from repositories.sqlite_group_repository import SQLiteGroupRepository
+from repositories.sqlite_friend_repository import SQLiteFriendRepository
+from repositories.sqlite_notification_repository import SQLiteNotificationRepository
+from repositories.sqlite_study_scheduler_repository import SQLiteStudySchedulerRepository
+from repositories.sqlite_chat_repository import SQLiteChatRepository
+from repositories.sqlite_profile_repository import SQLiteProfileRepository
+from repositories.sqlite_password_reset_token_repository import SQLitePasswordResetTokenRepository
+
+# (JSON repository, JSON file, SQLite repository, takes STORAGE_SHARDS)
+MIGRATIONS = [
+    (UserRepository, 'users.json', SQLiteUserRepository, False),
+    (GroupRepository, 'groups.json', SQLiteGroupRepository, True),
+    (FriendRepository, 'friends.json', SQLiteFriendRepository, False),
+    (NotificationRepository, 'notifications.json', SQLiteNotificationRepository, False),
+    (StudySchedulerRepository, 'schedule.json', SQLiteStudySchedulerRepository, False),
+    (ChatRepository, 'chat.json', SQLiteChatRepository, True),
+    (ProfileRepository, 'profiles.json', SQLiteProfileRepository, False),
+    (PasswordResetTokenRepository, 'password_reset_tokens.json', SQLitePasswordResetTokenRepository, False),
+]
+
+
+def migrate(data_dir, database_path, shards=0):
+    """Import every JSON repository; shards must match the STORAGE_SHARDS the data was written with"""
+    for json_repo_class, filename, sqlite_repo_class, sharded in MIGRATIONS:
+        options = {'shards': shards} if sharded and shards else {}
+        entities = json_repo_class(os.path.join(data_dir, filename), **options).find_all()
+        sqlite_repo_class(database_path).import_all(entities)
+        print(f"{filename}: {len(entities)} records")
+
+
+if __name__ == '__main__':
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, 'data')
+    database_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(data_dir, 'study_buddy.db')
+    migrate(data_dir, database_path, int(os.environ.get('STORAGE_SHARDS', 0)))
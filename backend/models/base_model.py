@@ -9,6 +9,12 @@ from datetime import datetime
 
 class BaseModel(ABC):
     """Abstract base class for all models"""
+
+    # Models keep their attributes in slots rather than a per-instance dict, since
+    # repositories hold every entity in memory. _version is bumped by mark_changed();
+    # repositories reuse an entity's serialized form while it is unchanged
+    # (see repositories/snapshot_cache.py). Unset means never changed
+    __slots__ = ('_id', '_created_at', '_version')
     
     #Initialize the base model with optional ID and the timestamp for tracking 
     def __init__(self, id=None, created_at=None):
@@ -24,6 +30,11 @@ class BaseModel(ABC):
     @id.setter
     def id(self, value):
         self._id = value
+        self.mark_changed()
+
+    #Setters and in-place mutators call this so a cached serialization is not reused
+    def mark_changed(self):
+        self._version = getattr(self, '_version', 0) + 1
 
     #Getting created_at
     @property
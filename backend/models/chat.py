@@ -6,6 +6,7 @@ Built by: Josh Topp
 from models.base_model import BaseModel
 import uuid
 class Chat(BaseModel):
+    __slots__ = ('chat_id', 'name', 'messages', 'members')
 
     def __init__(self, name, chat_id=None, messages=None, members=None):
         self.chat_id = chat_id or str(uuid.uuid4())
@@ -13,12 +14,40 @@ class Chat(BaseModel):
         if messages is None:
             self.messages = []
         else:
-            self.messages = messages
+            self.messages = [self.normalize_message(m, i) for i, m in enumerate(messages)]
         if members is None:
             self.members = []
         else:
             self.members = members
 
+    @staticmethod
+    def dm_name(user_id, friend_id):
+        """Name of the direct-message chat started by user_id with friend_id"""
+        return f"DM_{user_id}_{friend_id}"
+
+    def is_dm(self):
+        return str(self.name).startswith("DM_")
+
+    @staticmethod
+    def normalize_message(message, position):
+        """
+        Messages are dicts with id, sender_id, sender, timestamp and body.
+        Older data stored "sender: text" strings; upgrade those in place.
+        Message ids are 1-based positions in the chat, so they double as cursors.
+        """
+        if isinstance(message, dict):
+            return message
+        sender, separator, body = str(message).partition(': ')
+        if not separator:
+            sender, body = None, str(message)
+        return {
+            'id': position + 1,
+            'sender_id': None,
+            'sender': sender,
+            'timestamp': None,
+            'body': body
+        }
+
 
     def validate(self):
         if not self.name:
@@ -33,4 +62,14 @@ class Chat(BaseModel):
             "chat_id": self.chat_id,
             "members": self.members,
             'messages': self.messages
-        }
\ No newline at end of file
+        }
+
+    def to_summary(self):
+        """Chat metadata plus the latest message, without the history"""
+        return {
+            "name": self.name,
+            "chat_id": self.chat_id,
+            "members": self.members,
+            "message_count": len(self.messages or []),
+            "last_message": self.messages[-1] if self.messages else None
+        }
@@ -13,6 +13,8 @@ class Friend(BaseModel):
     Supports different states: pending (for future AddFriend), accepted, blocked
     """
 
+    __slots__ = ('_user_id', '_friend_id', '_status')
+
     # Friendship status constants
     STATUS_PENDING = 'pending'
     STATUS_ACCEPTED = 'accepted'
@@ -48,6 +50,7 @@ class Friend(BaseModel):
         if value not in [self.STATUS_PENDING, self.STATUS_ACCEPTED, self.STATUS_BLOCKED]:
             raise ValueError(f"Invalid status: {value}")
         self._status = value
+        self.mark_changed()
 
 
     # TO check if a specific user is involved in this friendship (bidirectional check)
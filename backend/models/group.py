@@ -8,6 +8,8 @@ from models.base_model import BaseModel
 import uuid
 
 class Group(BaseModel):
+    __slots__ = ('_name', '_owner_id', '_members', '_study_times', '_specified_class', '_rating')
+
     def __init__(self, name, owner_id, members=None, specified_class = None, study_times = None, id=None, created_at=None, rating=0):
         # Call parent constructor with id (or generate new UUID)
         super().__init__(id or uuid.uuid4().hex, created_at)
@@ -37,6 +39,7 @@ class Group(BaseModel):
 
     def setRating(self, rate):
         self._rating = rate
+        self.mark_changed()
 
     @property
     def specified_class(self):
@@ -61,10 +64,12 @@ class Group(BaseModel):
     def add_member(self, user_id):
         if user_id not in self._members:
             self._members.append(user_id)
+            self.mark_changed()
 
     def remove_member(self, user_id):
         if user_id in self._members:
             self._members.remove(user_id)
+            self.mark_changed()
     
     def leave_group(self, user_id, profile=None):
         """
@@ -74,6 +79,7 @@ class Group(BaseModel):
         # Remove from group member list
         if user_id in self._members:
             self._members.remove(user_id)
+            self.mark_changed()
 
         # Update profile if passed (e.g., clear group association)
         if profile:
@@ -5,6 +5,9 @@ Built by: Josh Topp
 """
 
 class Notification:
+    # Slots instead of a per-instance dict: there is one of these per notification in memory
+    __slots__ = ('id', 'user_id', 'message', 'read', 'created_at')
+
     def __init__(self, user_id, message, read=False, id=None, created_at=None):
         self.id = id
         self.user_id = user_id
@@ -45,6 +45,7 @@ class PasswordResetToken(BaseModel):
     def is_used(self, value):
         """Allow marking token as used"""
         self._is_used = value
+        self.mark_changed()
 
     # Check if token is still valid by verifying it's not expired or already used
     def is_valid(self):
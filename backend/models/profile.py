@@ -8,6 +8,8 @@ from models.base_model import BaseModel
 
 class Profile(BaseModel):
     """Profile model - Features 1.1.4, 1.1.5"""
+
+    __slots__ = ('_user_id', '_name', '_major', '_availability', 'preferences')
     
     def __init__(self, user_id, name=None, major=None, availability=None,
                  id=None, created_at=None, preferences=None):
@@ -30,6 +32,7 @@ class Profile(BaseModel):
     @name.setter
     def name(self, value):
         self._name = value
+        self.mark_changed()
     
     @property
     def major(self):
@@ -38,6 +41,7 @@ class Profile(BaseModel):
     @major.setter
     def major(self, value):
         self._major = value
+        self.mark_changed()
     
     @property
     def availability(self):
@@ -46,11 +50,13 @@ class Profile(BaseModel):
     def changePreferences(self, prefDay, start, end):
         self.preferences[prefDay] = start
         self.preferences[prefDay+7] = end
+        self.mark_changed()
         
 
     def add_availability(self, time_slot):
         if time_slot not in self._availability:
             self._availability.append(time_slot)
+            self.mark_changed()
     
     def validate(self):
         errors = []
@@ -8,6 +8,8 @@ from models.base_model import BaseModel
 
 
 class StudyScheduler(BaseModel):
+    __slots__ = ('user_id', 'title', 'start_time', 'end_time')
+
     def __init__(self, user_id, title, start_time, end_time, id=None):
         self.id = id
         self.user_id = user_id
@@ -7,8 +7,37 @@ from models.base_model import BaseModel
 import bcrypt
 import re
 
+# bcrypt cost factor (2^rounds iterations); each +1 doubles hashing time
+DEFAULT_ROUNDS = 12
+
+
+def hash_password(password, rounds=DEFAULT_ROUNDS):
+    """Hash password using bcrypt with automatic salting"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def hash_rounds(password_hash):
+    """Cost factor a bcrypt hash was made with ("$2b$12$..." -> 12), or None"""
+    parts = str(password_hash or '').split('$')
+    if len(parts) == 4 and parts[2].isdigit():
+        return int(parts[2])
+    return None
+
+
+def check_password(password, password_hash):
+    """Verify password matches a stored hash"""
+    if not password or not password_hash:
+        return False
+    try:
+        return bcrypt.checkpw(password.encode(), password_hash.encode())
+    except (ValueError, AttributeError):
+        return False
+
+
 class User(BaseModel):
     """User model"""
+
+    __slots__ = ('_email', '_password_hash', '_is_active')
     
     def __init__(self, email, password=None, password_hash=None, 
                  is_active=True, id=None, created_at=None):
@@ -29,8 +58,7 @@ class User(BaseModel):
     
     def _hash_password(self, password):
         """Hash password using bcrypt with automatic salting"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode(), salt).decode()
+        return hash_password(password)
     
     @property
     def email(self):
@@ -40,19 +68,19 @@ class User(BaseModel):
     def email(self, value):
         """Allow email to be updated"""
         self._email = value.lower().strip()
+        self.mark_changed()
     
     @property
     def is_active(self):
         return self._is_active
+
+    @property
+    def password_hash(self):
+        return self._password_hash
     
     def verify_password(self, password):
         """Verify password matches stored hash"""
-        if not password or not self._password_hash:
-            return False
-        try:
-            return bcrypt.checkpw(password.encode(), self._password_hash.encode())
-        except (ValueError, AttributeError):
-            return False
+        return check_password(password, self._password_hash)
         
     # Validate user data ensuring email is valid .edu address and password exists
     def validate(self):
@@ -5,6 +5,7 @@ Built by: Max Quirk
 """
 
 from abc import ABC, abstractmethod
+from repositories.rw_lock import exclusive
 
 class BaseRepository(ABC):
     """Abstract base repository"""
@@ -22,4 +23,8 @@ class BaseRepository(ABC):
     
     @abstractmethod
     def find_all(self):
-        pass
\ No newline at end of file
+        pass
+
+    def transaction(self):
+        """Hold the write lock across several calls, e.g. a service's read-modify-write"""
+        return exclusive(self)
@@ -8,73 +8,318 @@ Built by: Josh Topp
 import json
 import os
 from models.chat import Chat
-from repositories.base_repository import BaseRepository
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes
+from repositories.shared_file import file_signature
 
-class ChatRepository(BaseRepository):
+class ChatRepository(JsonRepository):
+    """
+    Chat repository that persists to JSON.
 
-    def __init__(self, filepath='data/chat.json'):
-        self._json_file = os.path.abspath(filepath)
-        self._storage = {}
-        self._load_from_file()
+    In journal mode every mutation is appended to ``<filepath>.log`` as one
+    JSON line instead of rewriting the whole snapshot. New messages become a
+    single append record; the snapshot is only rebuilt on compaction.
+    """
 
+    def __init__(self, filepath='data/chat.json', journal=False, compact_every=1000, flush_interval=0,
+                 shared=False,
+                 lazy=False, snapshot_format='json', shards=0, only_shards=None):
+        if journal and only_shards is not None:
+            # Every process appends to the one journal, so none may hold only part of the data
+            raise ValueError("only_shards cannot be combined with journal=True")
+        self._log_file = os.path.abspath(filepath) + '.log'
+        self._journal = journal
+        self._compact_every = compact_every
+        self._log_records = 0
+        # Bytes of the journal applied so far (up to the last complete record)
+        self._log_offset = 0
+        # chat_id -> (name, members, message count) as last written to disk
+        self._persisted = {}
+        # DM chat name -> chat_id, so an existing DM is found without a scan
+        self._dms = {}
+        # Next numeric id handed out by next_id()
+        self._id_counter = 1
+        super().__init__(filepath, flush_interval, shared, lazy, snapshot_format, shards, only_shards)
 
+    @reads
     def storage(self):
         return self._storage
 
+    def _watched_paths(self):
+        # The journal is watched too
+        return self._snapshot_paths() + [self._log_file]
+
+    def _key(self, chat):
+        return chat.chat_id
+
+    def _build(self, key, c):
+        return Chat(
+            name=c['name'],
+            chat_id=c['chat_id'],
+            messages=c['messages'],
+            members=c['members']
+        )
+
     def _load_from_file(self):
         try:
-            with open(self._json_file, 'r') as f:
-                data = json.load(f)
-            for c in data.values():
-                chat = Chat(
-                    name=c['name'],
-                    chat_id=c['chat_id'],
-                    messages=c['messages'],
-                    members=c['members']
-                )
+            for chat in self._read_entities():
                 self._storage[chat.chat_id] = chat
         except (FileNotFoundError, json.JSONDecodeError):
             self._storage = {}
 
-    def _save_to_file(self):
-        directory = os.path.dirname(self._json_file)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
+        self._replay_log()
+        for chat in self._storage.values():
+            self._remember(chat)
+            self._track_id(chat.chat_id)
+            self._index(chat)
 
-        data = {str(chat.chat_id): {
+        # A leftover log with journaling switched off is folded into the snapshot
+        if self._log_records and not self._journal:
+            self.compact()
+
+    def _replay_log(self, offset=0):
+        """Apply journal records written since the last compaction, from a byte offset"""
+        if not offset:
+            self._log_records = 0
+        try:
+            with open(self._log_file, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            self._log_offset = 0
+            return
+
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                # Torn final line from a crash, or another process mid-append
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            self._apply(record)
+            self._log_records += 1
+            offset += len(line)
+        self._log_offset = offset
+
+    def _reload(self):
+        """
+        Catch up with another process. While the snapshot is unchanged only the
+        journal records appended since the last sync are replayed.
+        """
+        *snapshot_seen, log_seen = self._shared.last_seen if self._shared else (None, None)
+        log_now = file_signature(self._log_file)
+        # Only after a first full load (lazy repositories start empty)
+        if (self._loaded and self._shared is not None
+                and [file_signature(path) for path in self._snapshot_paths()] == snapshot_seen
+                and log_now is not None
+                and log_seen is not None and log_now[0] == log_seen[0]
+                and log_now[1] >= self._log_offset):
+            self._replay_log(self._log_offset)
+            return
+
+        self._storage = {}
+        self._persisted = {}
+        self._dms = {}
+        self._serialized.clear()
+        self._load_from_file()
+
+    def _apply(self, record):
+        if record['op'] == 'put':
+            chat = self._build(None, record['chat'])
+            self._storage[chat.chat_id] = chat
+            self._index(chat)
+        elif record['op'] == 'append':
+            chat = self._storage.get(record['chat_id'])
+            if chat is None:
+                return
+            if chat.messages is None:
+                chat.messages = []
+            # Positional so replaying over an already compacted snapshot is a no-op
+            start = record['start']
+            messages = [Chat.normalize_message(m, start + i) for i, m in enumerate(record['messages'])]
+            chat.messages[start:start + len(messages)] = messages
+        else:
+            return
+        # What was just applied is what is on disk
+        self._serialized.discard(chat.chat_id)
+        self._remember(chat)
+        self._track_id(chat.chat_id)
+        if self._shards:
+            # Not in the snapshot yet, so the next compaction must rewrite its shard
+            self._shards.touch(chat.chat_id)
+
+    def _serialize(self, chat):
+        return {
             'name': chat.name,
             'chat_id': chat.chat_id,
             'messages': chat.messages,
             'members': chat.members
-        } for chat in self._storage.values()}
+        }
+
+    def _track_id(self, chat_id):
+        if str(chat_id).isdigit() and int(chat_id) >= self._id_counter:
+            self._id_counter = int(chat_id) + 1
 
-        with open(self._json_file, 'w') as f:
-            json.dump(data, f, indent=4)
+    @writes
+    def next_id(self):
+        """Allocate a numeric chat id that has never been used"""
+        if self._shards and self._shards.only is not None:
+            raise ValueError("Cannot allocate chat ids with only some shards loaded")
+        chat_id = self._id_counter
+        self._id_counter += 1
+        return str(chat_id)
 
+    def _index(self, chat):
+        if chat.is_dm():
+            self._dms[chat.name] = chat.chat_id
+
+    def _remember(self, chat):
+        self._persisted[chat.chat_id] = (chat.name, list(chat.members), len(chat.messages or []))
+
+    def _append_log(self, record):
+        directory = os.path.dirname(self._log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        line = (json.dumps(record) + '\n').encode()
+        with open(self._log_file, 'ab') as f:
+            if f.tell() > self._log_offset:
+                # A torn record left by a crash; replay stops there, so anything
+                # appended after it would never be read back
+                f.truncate(self._log_offset)
+            f.write(line)
+
+        self._log_records += 1
+        self._log_offset += len(line)
+        if self._compact_every and self._log_records >= self._compact_every:
+            self.compact()
+
+    def _persist(self, chat):
+        """Write a single chat change, either to the journal or as a full snapshot"""
+        if not self._journal:
+            self._save_to_file(chat.chat_id)
+            self._remember(chat)
+            return
+        self._serialized.discard(chat.chat_id)
+        if self._shards:
+            self._shards.touch(chat.chat_id)
+
+        messages = chat.messages or []
+        previous = self._persisted.get(chat.chat_id)
+        if previous is not None:
+            name, members, count = previous
+            if name == chat.name and members == list(chat.members) and len(messages) >= count:
+                # Messages are append-only, so only the tail needs writing
+                if len(messages) > count:
+                    self._append_log({
+                        'op': 'append',
+                        'chat_id': chat.chat_id,
+                        'start': count,
+                        'messages': messages[count:]
+                    })
+                self._remember(chat)
+                return
+
+        self._append_log({'op': 'put', 'chat': self._serialize(chat)})
+        self._remember(chat)
+
+    @writes
+    def compact(self):
+        """Rebuild the JSON snapshot from memory and truncate the journal"""
+        # With shards only those touched since the last compaction are rewritten
+        self._persistence.mark_dirty()
+        self.flush()
+        if os.path.exists(self._log_file):
+            os.remove(self._log_file)
+        self._log_records = 0
+        self._log_offset = 0
+
+    @writes
     def create(self, entity):
+        if entity.chat_id in self._storage:
+            # An id handed out twice (e.g. by two processes) must not replace the first chat
+            raise ValueError(f"Chat {entity.chat_id} already exists")
+        if self._shards:
+            self._shards.check(entity.chat_id)
         self._storage[entity.chat_id] = entity
-        self._save_to_file()
+        self._track_id(entity.chat_id)
+        self._index(entity)
+        self._persist(entity)
 
+    @reads
     def find_by_id(self, id):
         return self._storage.get(id)
 
+    @reads
     def find_all(self):
         return list(self._storage.values())
 
 
+    @writes
     def add(self, chat):
         return self.create(chat)
 
+    @reads
     def get(self, chat_id):
         return self.find_by_id(chat_id)
 
+    @writes
     def update(self, chat_id, chat):
         if chat_id in self._storage:
             self._storage[chat_id] = chat
-            self._save_to_file()
+            self._index(chat)
+            self._persist(chat)
             return chat
         raise ValueError("Chat not found")
 
+    @writes
+    def append_message(self, chat_id, message):
+        """
+        Store message as the chat's next one, assigning its id. Returns the
+        chat's summary (see Chat.to_summary), or None if the chat does not exist.
+        """
+        chat = self._storage.get(chat_id)
+        if chat is None:
+            return None
+        if chat.messages is None:
+            chat.messages = []
+        chat.messages.append({'id': len(chat.messages) + 1, **message})
+        self._persist(chat)
+        return chat.to_summary()
+
+    @reads
+    def summaries_for_member(self, user_id):
+        """chat_id -> summary (see Chat.to_summary) of every chat user_id belongs to"""
+        return {chat.chat_id: chat.to_summary() for chat in self._storage.values() if user_id in chat.members}
+
+    @reads
+    def find_dm(self, user_id, friend_id):
+        """The DM between two users, whichever of them started it, or None"""
+        for name in (Chat.dm_name(user_id, friend_id), Chat.dm_name(friend_id, user_id)):
+            chat = self._storage.get(self._dms.get(name))
+            if chat is not None and chat.name == name:
+                return chat
+        return None
+
+    @reads
+    def get_messages(self, chat_id, before=None, limit=50, after=None):
+        """
+        One page of a chat's history, oldest first.
+        before: only messages with a smaller id (newest page when None).
+        after: only messages with a larger id, starting from the oldest (takes precedence).
+        Returns None if the chat does not exist.
+        """
+        chat = self._storage.get(chat_id)
+        if chat is None:
+            return None
+        messages = chat.messages or []
+        if after is not None:
+            start = max(0, after)
+            return messages[start:start + limit]
+        end = len(messages) if before is None else max(0, min(before - 1, len(messages)))
+        return messages[max(0, end - limit):end]
+
+    @reads
     def list_all(self):
         return self.find_all()
-
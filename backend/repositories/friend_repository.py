@@ -4,142 +4,193 @@ Friend repository for managing friendship relationships
 Built by: Max Quirk
 """
 
-import json
-import os
+from datetime import datetime
 from models.friend import Friend
-from repositories.base_repository import BaseRepository
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes, ensure_loaded
 
-class FriendRepository(BaseRepository):
+class FriendRepository(JsonRepository):
     """Friend repository that persists to JSON"""
 
     # Internal helper method to init
-    def __init__(self, filepath='data/friends.json'):
-        self.filepath = os.path.abspath(filepath)
-        self._storage = {}
-        self._load_data()
+    def __init__(self, filepath='data/friends.json', flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json'):
+        # Adjacency indexes over friendship ids, dicts used as ordered sets
+        self._by_user = {}          # user_id -> {friendship_id}
+        self._sent = {}             # (user_id, status) -> {friendship_id}
+        self._received = {}         # (friend_id, status) -> {friendship_id}
+        self._by_pair = {}          # frozenset({user_id, friend_id}) -> {friendship_id}
+        self._indexed = {}          # friendship_id -> (user_id, friend_id, status) as indexed
+        super().__init__(filepath, flush_interval, shared, lazy, snapshot_format)
+
+    @property
+    def filepath(self):
+        return self._json_file
 
     @property
     # Storage to perform required operation
     def storage(self):
         """Expose storage for backward compatibility"""
+        ensure_loaded(self)
         return self._storage
 
-    # Load data from storage into memory for processing
-    def _load_data(self):
-        if os.path.exists(self.filepath):
+    def _build(self, key, f_data):
+        # Parse created_at if it exists
+        created_at = None
+        if 'created_at' in f_data and f_data['created_at']:
             try:
-                with open(self.filepath, 'r') as f:
-                    data = json.load(f)
-                for f_data in data.values():
-                    # Parse created_at if it exists
-                    from datetime import datetime
-                    created_at = None
-                    if 'created_at' in f_data and f_data['created_at']:
-                        try:
-                            created_at = datetime.fromisoformat(f_data['created_at'])
-                        except (ValueError, TypeError):
-                            created_at = None
-
-                    friend = Friend(
-                        user_id=f_data['user_id'],
-                        friend_id=f_data['friend_id'],
-                        status=f_data.get('status', Friend.STATUS_ACCEPTED),
-                        id=f_data['id'],
-                        created_at=created_at
-                    )
-                    self._storage[friend.id] = friend
-            except (json.JSONDecodeError, KeyError):
-                self._storage = {}
-
-    # Save data from memory to persistent storage
-    def _save_data(self):
-        # Ensure directory exists
-        directory = os.path.dirname(self.filepath)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-
-        with open(self.filepath, 'w') as f:
-            json.dump(
-                {fid: friend.to_dict() for fid, friend in self._storage.items()},
-                f,
-                indent=4
-            )
+                created_at = datetime.fromisoformat(f_data['created_at'])
+            except (ValueError, TypeError):
+                created_at = None
+
+        return Friend(
+            user_id=f_data['user_id'],
+            friend_id=f_data['friend_id'],
+            status=f_data.get('status', Friend.STATUS_ACCEPTED),
+            id=f_data['id'],
+            created_at=created_at
+        )
+
+    def _serialize(self, friend):
+        return friend.to_dict()
+
+    # Rebuild every adjacency index from storage
+    def _rebuild_index(self):
+        self._by_user = {}
+        self._sent = {}
+        self._received = {}
+        self._by_pair = {}
+        self._indexed = {}
+        for friend in self._storage.values():
+            self._index(friend)
+
+    # Add a friendship to the adjacency indexes
+    def _index(self, friend):
+        key = (friend.user_id, friend.friend_id, friend.status)
+        self._indexed[friend.id] = key
+        for index, bucket in self._index_entries(key):
+            index.setdefault(bucket, {}).setdefault(friend.id, None)
+
+    # Drop a friendship from the adjacency indexes using the state it was indexed under
+    def _unindex(self, friendship_id):
+        key = self._indexed.pop(friendship_id, None)
+        if key is None:
+            return
+        for index, bucket in self._index_entries(key):
+            ids = index.get(bucket)
+            if ids is None:
+                continue
+            ids.pop(friendship_id, None)
+            if not ids:
+                # Empty buckets would otherwise pile up after every unfriend or decline
+                del index[bucket]
+
+    def _track(self, friend):
+        self._index(friend)
+
+    def _untrack(self, friend):
+        self._unindex(friend.id)
+
+    def _index_entries(self, key):
+        """(index, bucket key) pairs a friendship indexed under key belongs to"""
+        user_id, friend_id, status = key
+        return [
+            (self._by_user, user_id),
+            (self._by_user, friend_id),
+            (self._sent, (user_id, status)),
+            (self._received, (friend_id, status)),
+            (self._by_pair, frozenset((user_id, friend_id))),
+        ]
+
+    def _lookup(self, ids):
+        return [self._storage[fid] for fid in ids]
 
     # Abstract method implementations
+    @writes
     def create(self, entity):
         """Create/add a new friendship"""
         if not isinstance(entity, Friend):
             raise ValueError("Entity must be a Friend instance")
+        self._unindex(entity.id)
         self._storage[entity.id] = entity
-        self._save_data()
+        self._index(entity)
+        self._save_to_file(entity.id)
         return entity
 
     # Find and return entity by its unique identifier
+    @reads
     def find_by_id(self, entity_id):
         """Find friendship by ID"""
         return self._storage.get(entity_id)
 
     # Retrieve and return all entities from storage
+    @reads
     def find_all(self):
         """Return all friendships"""
         return list(self._storage.values())
 
     # Friend-specific methods
+    @writes
     def add(self, friend):
         """Add a friendship (alias for create)"""
         return self.create(friend)
 
     # Find and return entity matching criteria
+    @reads
     def get(self, friend_id):
         """Get friendship by ID (alias for find_by_id)"""
         return self.find_by_id(friend_id)
 
     # Update entity data and persist changes to storage
+    @writes
     def update(self, friend_id, friend):
         """Update an existing friendship"""
         if friend_id in self._storage:
+            self._unindex(friend_id)
             self._storage[friend_id] = friend
-            self._save_data()
+            self._index(friend)
+            self._save_to_file(friend_id)
             return friend
         raise ValueError("Friendship not found")
 
     # Remove entity from storage permanently or from collection
+    @writes
     def remove(self, friend_id):
         """Delete a friendship"""
         if friend_id in self._storage:
             del self._storage[friend_id]
-            self._save_data()
+            self._unindex(friend_id)
+            self._save_to_file()
             return True
         raise ValueError("Friendship not found")
 
     # Find and return entity matching criteria
+    @reads
     def get_friends_for_user(self, user_id, status=None):
         """
         Get all friendships for a user, optionally filtered by status.
         Returns Friend objects where user is involved.
         """
-        friends = [
-            f for f in self._storage.values()
-            if f.involves_user(user_id)
-        ]
+        if not status:
+            return self._lookup(self._by_user.get(user_id, {}))
 
-        if status:
-            friends = [f for f in friends if f.status == status]
-
-        return friends
+        ids = dict(self._sent.get((user_id, status), {}))
+        ids.update(self._received.get((user_id, status), {}))
+        return self._lookup(ids)
 
     # Find and return entity matching criteria
+    @reads
     def find_friendship(self, user_id, friend_id):
         """
         Find a friendship between two users (bidirectional).
         Returns the Friend object if exists, None otherwise.
         """
-        for friendship in self._storage.values():
-            if friendship.involves_user(user_id) and friendship.involves_user(friend_id):
-                return friendship
+        for friendship_id in self._by_pair.get(frozenset((user_id, friend_id)), {}):
+            return self._storage[friendship_id]
         return None
 
     # Find and return entity matching criteria
+    @reads
     def get_friend_ids(self, user_id, status=Friend.STATUS_ACCEPTED):
         """
         Get list of friend user IDs for a specific user.
@@ -148,6 +199,7 @@ class FriendRepository(BaseRepository):
         friendships = self.get_friends_for_user(user_id, status)
         return [f.get_other_user(user_id) for f in friendships]
 
+    @writes
     def send_friend_request(self, user_id, friend_id):
         """
         Send a friend request from user_id to friend_id.
@@ -162,6 +214,7 @@ class FriendRepository(BaseRepository):
         friend = Friend(user_id=user_id, friend_id=friend_id, status=Friend.STATUS_PENDING)
         return self.create(friend)
 
+    @writes
     def accept_friend_request(self, friendship_id):
         """
         Accept a friend request by changing status to accepted.
@@ -176,6 +229,7 @@ class FriendRepository(BaseRepository):
         friendship.status = Friend.STATUS_ACCEPTED
         return self.update(friendship_id, friendship)
 
+    @writes
     def reject_friend_request(self, friendship_id):
         """
         Reject a friend request by deleting it.
@@ -189,26 +243,23 @@ class FriendRepository(BaseRepository):
 
         return self.remove(friendship_id)
 
+    @reads
     def get_pending_requests_received(self, user_id):
         """
         Get pending friend requests where user_id is the recipient (friend_id).
         Returns Friend objects where the user was sent a request.
         """
-        return [
-            f for f in self._storage.values()
-            if f.friend_id == user_id and f.status == Friend.STATUS_PENDING
-        ]
+        return self._lookup(self._received.get((user_id, Friend.STATUS_PENDING), {}))
 
+    @reads
     def get_pending_requests_sent(self, user_id):
         """
         Get pending friend requests where user_id is the sender (user_id).
         Returns Friend objects where the user sent a request.
         """
-        return [
-            f for f in self._storage.values()
-            if f.user_id == user_id and f.status == Friend.STATUS_PENDING
-        ]
+        return self._lookup(self._sent.get((user_id, Friend.STATUS_PENDING), {}))
 
+    @reads
     def get_friends_list(self, user_id):
         """
         Get list of friend IDs for a user.
@@ -0,0 +1,60 @@
+"""
+Course code and study time matching shared by the group repositories
+
+Built by:
+"""
+
+import re
+
+
+def normalize_class(value):
+    """Course code key: 'it 326' and 'IT326' both become 'IT326'"""
+    return re.sub(r'\s+', '', str(value)).upper()
+
+
+def normalize_time(value):
+    """Study time key: case and whitespace insensitive"""
+    return ' '.join(str(value).split()).lower()
+
+
+def class_keys(group):
+    """Course code keys a group is filed under"""
+    raw = group._specified_class
+    if not raw:
+        return set()
+    # Stored as a list on create and as a comma-joined string after a reload
+    parts = raw if isinstance(raw, list) else str(raw).split(',')
+    return {normalize_class(part) for part in parts if str(part).strip()}
+
+
+def time_keys(group):
+    """Study time keys a group is filed under"""
+    return {normalize_time(t) for t in group.study_times if str(t).strip()}
+
+
+def criterion_values(criterion):
+    """A filter criterion as a list; a single value or a list (any value matches) is accepted"""
+    return criterion if isinstance(criterion, list) else [criterion]
+
+
+def matching_ids(match_class, match_time, specified_class=None, study_times=None, match_all=False):
+    """
+    Ordered group ids (a dict of id -> None) for filter_by. match_class and
+    match_time return the ids matching one criterion. With both criteria,
+    match_all=True requires both (AND), otherwise either (OR).
+    """
+    results = []
+    if specified_class is not None:
+        results.append(match_class(specified_class))
+    if study_times is not None:
+        results.append(match_time(study_times))
+    if not results:
+        return {}
+
+    ids = results[0]
+    for other in results[1:]:
+        if match_all:
+            ids = {gid: None for gid in ids if gid in other}
+        else:
+            ids = {**ids, **other}
+    return ids
@@ -4,109 +4,202 @@ Group repository for study group data persistence
 Built by: Max Quirk
 """
 
-import json
-import os
+import bisect
 from models.group import Group
-from repositories.base_repository import BaseRepository
+from repositories.group_filters import (normalize_class, normalize_time, class_keys, time_keys,
+                                        criterion_values, matching_ids)
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes, ensure_loaded
 
-class GroupRepository(BaseRepository):
+
+def _suffixes(key):
+    """(suffix, key) for every non-empty suffix of a course code key"""
+    return [(key[i:], key) for i in range(len(key))]
+
+
+class GroupRepository(JsonRepository):
     """Group repository that persists to JSON"""
 
-    def __init__(self, filepath='data/groups.json'):
-        self.filepath = os.path.abspath(filepath)  # Make absolute
-        self._storage = {}
-        self._load_data()
+    def __init__(self, filepath='data/groups.json', flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json', shards=0, only_shards=None):
+        # Inverted membership index: user_id -> {group_id}, dicts used as ordered sets
+        self._by_member = {}
+        self._indexed = {}  # group_id -> members as last indexed
+        # Inverted filter indexes: normalized course code / study time -> {group_id}
+        self._by_class = {}
+        self._by_time = {}
+        self._indexed_terms = {}  # group_id -> (class keys, time keys) as last indexed
+        # Sorted (suffix, course code) for every suffix of every indexed course code,
+        # so a partial class query is a bisect over the suffixes it prefixes
+        self._class_suffixes = []
+        super().__init__(filepath, flush_interval, shared, lazy, snapshot_format, shards, only_shards)
+
+    @property
+    def filepath(self):
+        return self._json_file
 
     @property
     def storage(self):
         """Expose storage for backward compatibility"""
+        ensure_loaded(self)
         return self._storage
 
-    def _load_data(self):
-        if os.path.exists(self.filepath):
-            try:
-                with open(self.filepath, 'r') as f:
-                    data = json.load(f)
-                for g in data.values():
-                    group = Group(
-                        name=g['name'],
-                        owner_id=g['owner_id'],
-                        members=g['members'],
-                        study_times=g['study_times'],
-                        specified_class=g['specified_class']
-                    )
-                    group.id = g['id']
-                    self._storage[group.id] = group
-            except (json.JSONDecodeError, KeyError) as e:
-                self._storage = {}
-
-    def _save_data(self):
-        # Ensure directory exists
-        directory = os.path.dirname(self.filepath)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-        
-        with open(self.filepath, 'w') as f:
-            json.dump(
-                {gid: group.to_dict() for gid, group in self._storage.items()}, 
-                f, 
-                indent=4
-            )
+    def _build(self, key, g):
+        group = Group(
+            name=g['name'],
+            owner_id=g['owner_id'],
+            members=g['members'],
+            study_times=g['study_times'],
+            specified_class=g['specified_class']
+        )
+        group.id = g['id']
+        return group
+
+    def _serialize(self, group):
+        return group.to_dict()
+
+    def _rebuild_index(self):
+        """Rebuild the membership index from storage"""
+        self._by_member = {}
+        self._indexed = {}
+        self._by_class = {}
+        self._by_time = {}
+        self._indexed_terms = {}
+        self._class_suffixes = None
+        for group in self._storage.values():
+            self._index(group)
+        # Sorted once here rather than inserted code by code
+        self._class_suffixes = sorted(pair for key in self._by_class for pair in _suffixes(key))
+
+    def _index(self, group):
+        """Sync the index with the group's current members, touching only the difference"""
+        # Read _members directly; the public property hands out a copy
+        members = set(group._members)
+        # Buckets left empty are dropped, so users who leave every group leave no entry behind
+        self._reindex_terms(self._by_member, group.id, self._indexed.get(group.id, set()), members)
+        self._indexed[group.id] = members
+
+        classes, times = class_keys(group), time_keys(group)
+        old_classes, old_times = self._indexed_terms.get(group.id, (set(), set()))
+        self._index_classes(group.id, old_classes, classes)
+        self._reindex_terms(self._by_time, group.id, old_times, times)
+        self._indexed_terms[group.id] = (classes, times)
+
+    def _reindex_terms(self, index, group_id, old_keys, new_keys):
+        """Move group_id between buckets; returns (keys added to, keys removed from) the index"""
+        added, removed = [], []
+        for key in old_keys - new_keys:
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(group_id, None)
+                if not bucket:
+                    del index[key]
+                    removed.append(key)
+        for key in new_keys - old_keys:
+            bucket = index.get(key)
+            if bucket is None:
+                bucket = index[key] = {}
+                added.append(key)
+            bucket[group_id] = None
+        return added, removed
+
+    def _index_classes(self, group_id, old_keys, new_keys):
+        added, removed = self._reindex_terms(self._by_class, group_id, old_keys, new_keys)
+        if self._class_suffixes is None:
+            # Rebuilding; the suffix list is sorted once at the end
+            return
+        for key in removed:
+            for pair in _suffixes(key):
+                del self._class_suffixes[bisect.bisect_left(self._class_suffixes, pair)]
+        for key in added:
+            for pair in _suffixes(key):
+                bisect.insort(self._class_suffixes, pair)
+
+    def _track(self, group):
+        self._index(group)
+
+    def _untrack(self, group):
+        self._unindex(group.id)
+
+    def _unindex(self, group_id):
+        self._reindex_terms(self._by_member, group_id, self._indexed.pop(group_id, set()), set())
+        classes, times = self._indexed_terms.pop(group_id, (set(), set()))
+        self._index_classes(group_id, classes, set())
+        self._reindex_terms(self._by_time, group_id, times, set())
 
     # Abstract method implementations
+    @writes
     def create(self, entity):
         """Create/add a new group"""
         if not isinstance(entity, Group):
             raise ValueError("Entity must be a Group instance")
+        if self._shards:
+            self._shards.check(entity.id)
         self._storage[entity.id] = entity
-        self._save_data()
+        self._index(entity)
+        self._save_to_file(entity.id)
         return entity
 
+    @reads
     def find_by_id(self, entity_id):
         """Find group by ID"""
         return self._storage.get(entity_id)
 
+    @reads
     def find_all(self):
         """Return all groups"""
         return list(self._storage.values())
 
     # Original methods (keeping for backward compatibility)
+    @writes
     def add(self, group):
         """Add a group (alias for create)"""
         return self.create(group)
 
+    @reads
     def get(self, group_id):
         """Get group by ID (alias for find_by_id)"""
         return self.find_by_id(group_id)
 
+    @writes
     def update(self, group_id, group):
         """Update an existing group"""
         if group_id in self._storage:
             self._storage[group_id] = group
-            self._save_data()
+            self._index(group)
+            self._save_to_file(group_id)
             return group
         raise ValueError("Group not found")
 
+    @reads
     def list_all(self):
         """List all groups (alias for find_all)"""
         return self.find_all()
 
+    @reads
     def get_groups_for_user(self, user_id):
         """Get all groups that a user is a member of"""
-        return [g for g in self._storage.values() if user_id in g.members]
+        return [self._storage[gid] for gid in self._by_member.get(user_id, {})]
 
+    @writes
     def remove(self, group_id):
         """Delete a group"""
         if group_id in self._storage:
             del self._storage[group_id]
-            self._save_data()
+            self._unindex(group_id)
+            self._save_to_file(group_id)
             return True
         raise ValueError("Group not found")
 
+    @writes
     def save_group_info(self, group):
+        if self._shards:
+            self._shards.check(group.id)
         self._storage[group.id] = group
-        self._save_data()
+        self._index(group)
+        self._save_to_file(group.id)
 
+    @reads
     def find_by_name(self, name):
         """Find group by name (case-insensitive)"""
         for group in self._storage.values():
@@ -114,15 +207,40 @@ class GroupRepository(BaseRepository):
                 return group
         return None
 
-    def filter_by(self, specified_class=None, study_times=None):
-        """Filter groups by specific class"""
-        groups = []
-        for group in self._storage.values():
-            if specified_class is not None:
-                if specified_class in group.specified_class:
-                    groups.append(group)
-            if study_times is not None:
-                if study_times in group.study_times:
-                    groups.append(group)
-
-        return groups
\ No newline at end of file
+    def _match_class(self, specified_class):
+        """Group ids whose course code contains the query, exact matches first"""
+        ids = {}
+        suffixes = self._class_suffixes
+        for value in criterion_values(specified_class):
+            query = normalize_class(value)
+            if not query:
+                continue
+            if query in self._by_class:
+                ids.update(self._by_class[query])
+            # A code contains the query exactly when one of its suffixes starts with it
+            keys = {}
+            i = bisect.bisect_left(suffixes, (query,))
+            while i < len(suffixes) and suffixes[i][0].startswith(query):
+                keys[suffixes[i][1]] = None
+                i += 1
+            keys.pop(query, None)
+            for key in keys:
+                ids.update(self._by_class[key])
+        return ids
+
+    def _match_time(self, study_times):
+        """Group ids offering any of the given study times"""
+        ids = {}
+        for value in criterion_values(study_times):
+            ids.update(self._by_time.get(normalize_time(value), {}))
+        return ids
+
+    @reads
+    def filter_by(self, specified_class=None, study_times=None, match_all=False):
+        """
+        Filter groups by class and/or study time.
+        Each criterion may be a single value or a list (any value matches).
+        With both criteria, match_all=True requires both (AND), otherwise either (OR).
+        """
+        ids = matching_ids(self._match_class, self._match_time, specified_class, study_times, match_all)
+        return [self._storage[gid] for gid in ids]
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Base class of the repositories that persist to a JSON snapshot
+
+Built by:
+"""
+
+import json
+import os
+from abc import abstractmethod
+from repositories.base_repository import BaseRepository
+from repositories.json_store import read_json, read_records
+from repositories.rw_lock import ReadWriteLock
+from repositories.shared_file import SharedFile
+from repositories.sharded_store import ShardedStore
+from repositories.snapshot_cache import SnapshotCache
+from repositories.write_behind import WriteBehind
+
+
+class JsonRepository(BaseRepository):
+    """
+    Storage, locking and persistence shared by the JSON repositories.
+
+    Subclasses supply ``_build(key, record)`` to turn a snapshot record into
+    an entity, ``_serialize(entity)`` for the reverse, and ``_track(entity)`` /
+    ``_untrack(entity)`` to keep their indexes in step as entities are loaded
+    and dropped (or ``_rebuild_index()`` for a full load). Index attributes are
+    set before calling ``__init__``, which loads the file unless lazy.
+    """
+
+    def __init__(self, json_file, flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json', shards=0, only_shards=None):
+        self._json_file = os.path.abspath(json_file)
+        self._storage = {}
+        self._lock = ReadWriteLock()
+        # 'json' (indented) or 'compact' (see json_store); either format is read
+        self._snapshot_format = snapshot_format
+        # With shards > 0 entities are spread over that many files and a change rewrites
+        # only its own; only_shards loads just those shard indexes (see sharded_store)
+        self._shards = ShardedStore(self._json_file, shards, snapshot_format, only_shards) if shards else None
+        # Unchanged entities are not serialized again on save
+        self._serialized = SnapshotCache(self._serialize)
+        # Snapshot writes are coalesced in the background when flush_interval > 0
+        self._persistence = WriteBehind(self._write_file, flush_interval, self._lock)
+        # Set when several processes share the data files. Created before loading so
+        # a write that races with the load is picked up on first use
+        self._shared = SharedFile(self._json_file, self._reload, self._watched_paths()) if shared else None
+        # With lazy=True the file is read on first use instead (see ensure_loaded)
+        self._loaded = not lazy
+        if not lazy:
+            self._load_from_file()
+
+    @abstractmethod
+    def _build(self, key, record):
+        """Entity for a snapshot record stored under key"""
+
+    @abstractmethod
+    def _serialize(self, entity):
+        """Snapshot record for an entity"""
+
+    def _key(self, entity):
+        """Key of an entity in _storage"""
+        return entity.id
+
+    def _snapshot_key(self, entity):
+        """Key of an entity in the snapshot file (see _snapshot_items)"""
+        return self._key(entity)
+
+    def _track(self, entity):
+        """Add an entity read from the file to the subclass's indexes"""
+
+    def _untrack(self, entity):
+        """Remove an entity that left the file from the subclass's indexes"""
+
+    def _rebuild_index(self):
+        """Derive the subclass's indexes from _storage after a full load"""
+        for entity in self._storage.values():
+            self._track(entity)
+
+    def _snapshot_paths(self):
+        return self._shards.paths() if self._shards else [self._json_file]
+
+    def _watched_paths(self):
+        """Files whose changes by another process trigger a reload"""
+        return self._snapshot_paths()
+
+    def _snapshot_items(self):
+        """(key, entity) pairs as saved; the keys of the snapshot file"""
+        return self._storage.items()
+
+    def _read_entities(self):
+        if self._shards:
+            return [self._build(key, record) for key, record in self._shards.load().items()]
+        # Streamed, so the file text and all parsed records are never in memory at once
+        return read_records(self._json_file, self._build)
+
+    def _load_from_file(self):
+        try:
+            for entity in self._read_entities():
+                self._storage[self._key(entity)] = entity
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._storage = {}
+        self._rebuild_index()
+
+    def _reload(self):
+        """
+        Catch up with a save by another process. Entities whose record did not
+        change are kept, along with their indexes and serialized form, and only
+        the others are rebuilt. With shards only the shard files that changed
+        are read. The first load, or a file that cannot be read, loads in full.
+        """
+        changed = self._changed_records() if self._loaded is True and self._shared is not None else None
+        if changed is None:
+            self._storage = {}
+            self._serialized.clear()
+            self._load_from_file()
+            return
+
+        records, in_scope = changed
+        current = {str(key): (key, entity) for key, entity in self._snapshot_items() if in_scope(key)}
+        for file_key, record in records:
+            previous = current.pop(file_key, None)
+            if previous is not None:
+                if self._serialized.record(*previous) == record:
+                    continue
+                self._drop(previous[1])
+            entity = self._build(file_key, record)
+            self._storage[self._key(entity)] = entity
+            self._track(entity)
+        # Removed by the other process
+        for key, entity in current.values():
+            self._drop(entity)
+
+    def _changed_records(self):
+        """
+        ((file key, record) pairs, filter of the keys they cover) for the snapshot
+        files changed since the last sync, or None to load everything again
+        """
+        try:
+            if not self._shards:
+                return read_records(self._json_file, lambda key, record: (key, record)), lambda key: True
+            indexes = self._shards.changed(self._shared.last_seen)
+            if indexes is None:
+                return None
+            records = []
+            for index in indexes:
+                records.extend(read_json(self._shards.shard_path(index)).items())
+            indexes = set(indexes)
+            return records, lambda key: self._shards.shard_of(key) in indexes
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _drop(self, entity):
+        key = self._key(entity)
+        if self._storage.get(key) is entity:
+            del self._storage[key]
+        self._serialized.discard(self._snapshot_key(entity))
+        self._untrack(entity)
+
+    def _save_to_file(self, *keys):
+        """Schedule a save; keys are the snapshot keys of entities changed in place"""
+        self._serialized.discard(*keys)
+        if self._shards:
+            for key in keys or [None]:
+                self._shards.touch(key)
+        self._persistence.mark_dirty()
+
+    def flush(self):
+        """Write any pending changes to disk now"""
+        self._persistence.flush()
+
+    def _write_file(self):
+        if self._shards:
+            self._shards.save(self._snapshot_items(), self._serialized)
+            return
+        self._serialized.write(self._json_file, self._snapshot_items(), self._snapshot_format)
@@ -0,0 +1,326 @@
+"""
+Crash-safe reading and writing of the JSON snapshot files
+
+Built by:
+"""
+
+import codecs
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import zlib
+
+# Compact snapshots start with this line, followed by a JSON header line and a
+# zlib-compressed body. Anything else is read as a plain JSON snapshot.
+SNAPSHOT_MAGIC = b'STUDYBUDDY-SNAPSHOT\n'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FORMATS = ('json', 'compact')
+# Characters read from a snapshot at a time by read_records
+STREAM_CHUNK = 1 << 16
+
+
+class SnapshotVersionError(RuntimeError):
+    """
+    A compact snapshot written by a newer version of the code. Not treated as
+    damage: the backup is not used in its place and repositories must not
+    start empty over it, since their next save would overwrite the data.
+    """
+
+
+def backup_path(path):
+    """Where the snapshot before the latest write is kept"""
+    return path + '.bak'
+
+
+def read_json(path):
+    """
+    Load a snapshot in either format, falling back to the previous one if it
+    is missing or damaged. Raises FileNotFoundError or json.JSONDecodeError,
+    like json.load, when neither file is usable, and SnapshotVersionError for
+    a snapshot too new to read.
+    """
+    return _with_backup(path, _read_snapshot)
+
+
+def read_records(path, build):
+    """
+    Load a snapshot of records one at a time, as [build(key, record), ...].
+
+    Unlike read_json, neither the whole file text nor every parsed record is
+    held at once: a chunk of text is parsed into the next record, which is
+    handed to build and dropped. Peak memory stays close to what build
+    returns. Falls back to the backup the same way read_json does.
+    """
+    return _with_backup(path, lambda p: [build(key, record) for key, record in _iter_records(p)])
+
+
+def _with_backup(path, read):
+    try:
+        return read(path)
+    except (FileNotFoundError, json.JSONDecodeError) as error:
+        if isinstance(error, json.JSONDecodeError):
+            # Keep the damaged file around; the next save would overwrite it
+            shutil.copyfile(path, path + '.corrupt')
+        try:
+            data = read(backup_path(path))
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise error
+        print(f"Recovered {path} from the previous snapshot")
+        return data
+
+
+def snapshot_format(path):
+    """'compact' or 'json' for an existing snapshot, None if there is none"""
+    try:
+        with open(path, 'rb') as f:
+            return 'compact' if f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC else 'json'
+    except FileNotFoundError:
+        return None
+
+
+def _read_snapshot(path):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if raw.startswith(SNAPSHOT_MAGIC):
+        return _decode_compact(raw, path)
+    return json.loads(raw)
+
+
+def _iter_records(path):
+    """(key, record) pairs of a snapshot in either format, parsed incrementally"""
+    with open(path, 'rb') as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            f.seek(0)
+            yield from _iter_entries(io.TextIOWrapper(f, encoding='utf-8').read)
+            return
+        try:
+            header = json.loads(f.readline())
+            _check_version(header, path)
+            entries = _iter_entries(_inflate(f))
+            if header['layout'] == 'raw':
+                yield from entries
+                return
+            fields = header['fields']
+            for _, (key, values) in entries:
+                yield key, dict(zip(fields, values)) if isinstance(values, list) else values
+        except (ValueError, KeyError, TypeError, zlib.error) as e:
+            if isinstance(e, json.JSONDecodeError):
+                raise
+            raise json.JSONDecodeError(f"Unreadable compact snapshot {path}: {e}", '', 0)
+
+
+def _inflate(f):
+    """read(size) over the decompressed, decoded body of a compact snapshot"""
+    inflater = zlib.decompressobj()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def read(size):
+        text = ''
+        while len(text) < size:
+            block = f.read(STREAM_CHUNK)
+            if not block:
+                text += decoder.decode(inflater.flush(), final=True)
+                break
+            text += decoder.decode(inflater.decompress(block))
+        return text
+    return read
+
+
+# Pieces of the top-level object or array that read_records steps through
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_KEY = re.compile(r'[ \t\n\r]*"((?:[^"\\]|\\.)*)"[ \t\n\r]*:[ \t\n\r]*')
+_AFTER_VALUE = re.compile(r'[ \t\n\r]*([,}\]])')
+_decoder = json.JSONDecoder()
+
+
+def _iter_entries(read):
+    """
+    (key, value) for each member of a top-level object, (None, value) for an
+    array, reading text with read(size) as needed. Each member is parsed by
+    the C decoder; when the buffer ends inside one, more text is read (at
+    least as much as is buffered, so a large value is retried only a few
+    times) and the member is parsed again.
+    """
+    buffer, pos, eof = '', 0, False
+    closer = None
+    while True:
+        try:
+            if closer is None:
+                pos = _WHITESPACE.match(buffer, pos).end()
+                opener = buffer[pos]
+                if opener not in '{[':
+                    raise ValueError("Expecting '{' or '['")
+                start = _WHITESPACE.match(buffer, pos + 1).end()
+                if buffer[start] == ('}' if opener == '{' else ']'):
+                    pos = start + 1
+                    break
+                closer = '}' if opener == '{' else ']'
+                pos += 1
+            key, value, pos, last = _next_member(buffer, pos, closer)
+        except (ValueError, IndexError) as e:
+            if eof:
+                raise json.JSONDecodeError(f"Unreadable snapshot: {e}", buffer, pos)
+            text = read(max(STREAM_CHUNK, len(buffer) - pos))
+            buffer, pos, eof = buffer[pos:] + text, 0, not text
+            continue
+        yield key, value
+        if last:
+            break
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+        buffer, pos = read(STREAM_CHUNK), 0
+        if not buffer:
+            return
+
+
+def _next_member(buffer, pos, closer):
+    """
+    (key, value, position after the separator, whether it was the last member)
+    for the member at pos. Raises ValueError or IndexError when the buffer
+    does not hold all of it yet.
+    """
+    key = None
+    if closer == '}':
+        match = _KEY.match(buffer, pos)
+        if match is None:
+            raise ValueError("Expecting property name")
+        key = match.group(1)
+        if '\\' in key:
+            key = json.loads(f'"{key}"')
+        pos = match.end()
+    else:
+        pos = _WHITESPACE.match(buffer, pos).end()
+    value, end = _decoder.raw_decode(buffer, pos)
+    # The separator must be buffered too: a number at the end may continue
+    match = _AFTER_VALUE.match(buffer, end)
+    if match is None:
+        raise ValueError("Expecting ',' delimiter")
+    if match.group(1) not in (',', closer):
+        raise ValueError(f"Unexpected {match.group(1)!r}")
+    return key, value, match.end(), match.group(1) == closer
+
+
+def _encode_compact(data):
+    """
+    Header line plus compressed body. A dict of records that share their keys
+    (every repository snapshot) is stored as one field list and a row of
+    values per record; other data is stored as-is.
+    """
+    fields = None
+    if isinstance(data, dict) and data and all(isinstance(r, dict) for r in data.values()):
+        fields = list(next(iter(data.values())))
+
+    if fields is None:
+        header = {'version': SNAPSHOT_VERSION, 'layout': 'raw'}
+        body = data
+    else:
+        header = {'version': SNAPSHOT_VERSION, 'layout': 'rows', 'fields': fields, 'count': len(data)}
+        # Records with other keys than the first one keep their dict form
+        same = set(fields)
+        body = [
+            [key, [record[f] for f in fields] if record.keys() == same else record]
+            for key, record in data.items()
+        ]
+
+    payload = zlib.compress(json.dumps(body, separators=(',', ':')).encode())
+    return SNAPSHOT_MAGIC + json.dumps(header).encode() + b'\n' + payload
+
+
+def encode_entry(key, record, indent=4):
+    """One top-level '"key": record' entry laid out exactly as json.dump(..., indent) does"""
+    pad = ' ' * indent
+    return pad + f"{json.dumps(str(key))}: {json.dumps(record, indent=indent)}".replace('\n', '\n' + pad)
+
+
+def _decode_compact(raw, path):
+    try:
+        header_line, payload = raw[len(SNAPSHOT_MAGIC):].split(b'\n', 1)
+        header = json.loads(header_line)
+        _check_version(header, path)
+        body = json.loads(zlib.decompress(payload))
+        if header['layout'] == 'raw':
+            return body
+        fields = header['fields']
+        return {
+            key: dict(zip(fields, values)) if isinstance(values, list) else values
+            for key, values in body
+        }
+    except (ValueError, KeyError, TypeError, zlib.error) as e:
+        # Reported like a damaged JSON file so callers fall back to the backup
+        raise json.JSONDecodeError(f"Unreadable compact snapshot {path}: {e}", '', 0)
+
+
+def _check_version(header, path):
+    if header['version'] > SNAPSHOT_VERSION:
+        raise SnapshotVersionError(f"{path} is snapshot version {header['version']}, "
+                                   f"but this code reads up to version {SNAPSHOT_VERSION}; upgrade it first")
+
+
+def write_json(path, data, indent=4, snapshot_format='json', entries=None):
+    """
+    Replace a snapshot atomically, as indented JSON or in the compact format.
+
+    The data is written to a temp file in the same directory and fsynced, the
+    current snapshot is kept as the backup, and the temp file is then renamed
+    over the target. Readers and crashes only ever see a complete file.
+
+    entries, if given, are data's records already encoded with encode_entry()
+    and are written instead of encoding data again (JSON format only).
+    """
+    if snapshot_format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unknown snapshot format '{snapshot_format}', expected 'json' or 'compact'")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory or None, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb' if snapshot_format == 'compact' else 'w') as f:
+            if snapshot_format == 'compact':
+                f.write(_encode_compact(data))
+            elif entries is not None:
+                f.write('{\n' + ',\n'.join(entries) + '\n}' if entries else '{}')
+            else:
+                json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            _keep_backup(path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _keep_backup(path):
+    # Hard link so the target never disappears; copy where links are unsupported
+    temp_backup = backup_path(path) + '.tmp'
+    if os.path.exists(temp_backup):
+        os.remove(temp_backup)
+    try:
+        os.link(path, temp_backup)
+    except OSError:
+        shutil.copy2(path, temp_backup)
+    os.replace(temp_backup, backup_path(path))
+
+
+def _fsync_directory(directory):
+    """Make the rename itself durable (POSIX only)"""
+    try:
+        fd = os.open(directory or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -4,84 +4,132 @@ Notification repository for managing user notifications
 Built by: Josh Topp
 """
 
-import json
-import os
+import bisect
 
 from models.notification import Notification
 from models import notification
-from repositories.base_repository import BaseRepository
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes
 
 
-class NotificationRepository(BaseRepository):
+class NotificationRepository(JsonRepository):
 
-    def __init__(self, json_file):
-        self._json_file = os.path.abspath(json_file)
-        self._storage = {}
+    def __init__(self, json_file, flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json'):
+        # user_id -> ascending notification ids, and user_id -> unread count
+        self._by_user = {}
+        self._unread = {}
         self._id_counter = 1
-        self._load_from_file()
-
-    def _load_from_file(self):
-        try:
-            with open(self._json_file, 'r') as f:
-                data = json.load(f)
-            for n in data.values():
-                notif = Notification(
-                    user_id=n['user_id'],
-                    message=n['message'],
-                    read=n.get('read', False),
-                    id=n['id'],
-                    created_at=None
-                )
-                self._storage[notif.id] = notif
-                self._id_counter += 1
-        except:
-            self._storage = {}
-
-    def _save_to_file(self):
-        directory = os.path.dirname(self._json_file)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-
-        data = {str(notifications.id): {
+        super().__init__(json_file, flush_interval, shared, lazy, snapshot_format)
+
+    def _build(self, key, n):
+        return Notification(
+            user_id=n['user_id'],
+            message=n['message'],
+            read=n.get('read', False),
+            id=n['id'],
+            created_at=None
+        )
+
+    def _rebuild_index(self):
+        self._by_user = {}
+        self._unread = {}
+        for notif in sorted(self._storage.values(), key=lambda n: n.id):
+            self._track(notif)
+
+    def _track(self, notif):
+        self._index(notif)
+        # Highest id + 1, not the record count, so ids freed by deletes are never reused
+        if notif.id >= self._id_counter:
+            self._id_counter = notif.id + 1
+
+    def _untrack(self, notif):
+        self._unindex(notif)
+
+    def _index(self, notif):
+        ids = self._by_user.setdefault(notif.user_id, [])
+        if not ids or ids[-1] < notif.id:
+            ids.append(notif.id)
+        else:
+            bisect.insort(ids, notif.id)
+        if not notif.read:
+            self._unread[notif.user_id] = self._unread.get(notif.user_id, 0) + 1
+
+    def _unindex(self, notif):
+        ids = self._by_user.get(notif.user_id, [])
+        pos = bisect.bisect_left(ids, notif.id)
+        if pos < len(ids) and ids[pos] == notif.id:
+            del ids[pos]
+        if not notif.read:
+            self._unread[notif.user_id] -= 1
+
+    def _serialize(self, notifications):
+        return {
             'id': notifications.id,
             'user_id': notifications.user_id,
             'message': notifications.message,
             'read': notifications.read,
             'created_at': notifications.created_at
-        } for notifications in self._storage.values()}
+        }
 
-        with open(self._json_file, 'w') as f:
-            json.dump(data, f, indent=4)
+    @reads
+    def find_by_user_id(self, user_id, after=None, limit=None):
+        """
+        Notifications for a user in id order.
+        after: only ids greater than this cursor; limit: maximum number returned.
+        """
+        ids = self._by_user.get(user_id, [])
+        start = bisect.bisect_right(ids, after) if after is not None else 0
+        end = len(ids) if limit is None else min(len(ids), start + limit)
+        return [self._storage[nid] for nid in ids[start:end]]
 
-    def find_by_user_id(self, user_id):
-        notifs = []
-        for notification in self._storage.values():
-            if notification.user_id == user_id:
-                notifs.append(notification)
-        return notifs
+    @reads
+    def count_unread(self, user_id):
+        return self._unread.get(user_id, 0)
 
+    @writes
     def create(self, notification):
         notification.id = self._id_counter
         self._id_counter += 1
         self._storage[notification.id] = notification
-        self._save_to_file()
+        self._index(notification)
+        self._save_to_file(notification.id)
         return notification
 
+    @writes
+    def create_many(self, notifications):
+        """Insert several notifications and persist once"""
+        for notification in notifications:
+            notification.id = self._id_counter
+            self._id_counter += 1
+            self._storage[notification.id] = notification
+            self._index(notification)
+        if notifications:
+            self._save_to_file()
+        return notifications
+
+    @writes
     def mark_as_read(self, notification_id):
         if notification_id in self._storage:
-            self._storage[notification_id].read = True
-            self._save_to_file()
+            notification = self._storage[notification_id]
+            if not notification.read:
+                self._unread[notification.user_id] -= 1
+            notification.read = True
+            self._save_to_file(notification_id)
             return self._storage[notification_id]
         raise ValueError("Notification not found")
 
+    @writes
     def delete(self, notification_id):
         if notification_id in self._storage:
-            del self._storage[notification_id]
+            self._unindex(self._storage.pop(notification_id))
             self._save_to_file()
             return True
         raise ValueError("Notification not found")
+    @reads
     def find_by_id(self, notification_id):
-        pass
+        return self._storage.get(notification_id)
 
+    @reads
     def find_all(self):
-        pass
\ No newline at end of file
+        return list(self._storage.values())
\ No newline at end of file
@@ -4,64 +4,56 @@ Password reset token repository for token management
 Built by: Max Quirk
 """
 
-import json
-import os
 from datetime import datetime
 from models.password_reset import PasswordResetToken
-from repositories.base_repository import BaseRepository
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes
 
-class PasswordResetTokenRepository(BaseRepository):
+class PasswordResetTokenRepository(JsonRepository):
     """Password reset token repository with JSON persistence"""
 
     # Internal helper method to init
-    def __init__(self, json_file):
-        self._json_file = os.path.abspath(json_file)
-        self._storage = {}
+    def __init__(self, json_file, flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json'):
         self._id_counter = 1
-        self._load_from_file()
-
-    # Load data from storage into memory for processing
-    def _load_from_file(self):
-        """Load tokens from JSON file"""
-        try:
-            with open(self._json_file, 'r') as f:
-                data = json.load(f)
-            for t in data.values():
-                token = PasswordResetToken(
-                    user_id=t['user_id'],
-                    token=t['token'],
-                    expires_at=t['expires_at'],
-                    is_used=t.get('is_used', False),
-                    id=t['id'],
-                    created_at=t.get('created_at')
-                )
-                self._storage[token.token] = token
-                if token.id >= self._id_counter:
-                    self._id_counter = token.id + 1
-        except (FileNotFoundError, json.JSONDecodeError):
-            self._storage = {}
-            self._id_counter = 1
-
-    # Save data from memory to persistent storage
-    def _save_to_file(self):
-        """Save tokens to JSON file"""
-        directory = os.path.dirname(self._json_file)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-
-        data = {token.token: {
+        super().__init__(json_file, flush_interval, shared, lazy, snapshot_format)
+
+    def _build(self, key, t):
+        # Saved as an ISO string; _serialize needs the datetime back
+        created_at = t.get('created_at')
+        if isinstance(created_at, str):
+            try:
+                created_at = datetime.fromisoformat(created_at)
+            except ValueError:
+                created_at = None
+        return PasswordResetToken(
+            user_id=t['user_id'],
+            token=t['token'],
+            expires_at=t['expires_at'],
+            is_used=t.get('is_used', False),
+            id=t['id'],
+            created_at=created_at
+        )
+
+    def _key(self, token):
+        return token.token
+
+    def _track(self, token):
+        if token.id >= self._id_counter:
+            self._id_counter = token.id + 1
+
+    def _serialize(self, token):
+        return {
             'id': token.id,
             'user_id': token.user_id,
             'token': token.token,
             'expires_at': token.expires_at.isoformat() if isinstance(token.expires_at, datetime) else token.expires_at,
             'is_used': token.is_used,
             'created_at': token._created_at.isoformat() if token._created_at else None
-        } for token in self._storage.values()}
-
-        with open(self._json_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        }
 
     # Create new entity with validation and persist to storage
+    @writes
     def create(self, entity):
         """Create new reset token"""
         if not isinstance(entity, PasswordResetToken):
@@ -75,10 +67,11 @@ class PasswordResetTokenRepository(BaseRepository):
         self._id_counter += 1
 
         self._storage[entity.token] = entity
-        self._save_to_file()
+        self._save_to_file(entity.token)
         return entity
 
     # Find and return entity by its unique identifier
+    @reads
     def find_by_id(self, entity_id):
         """Find token by ID"""
         for token in self._storage.values():
@@ -87,21 +80,25 @@ class PasswordResetTokenRepository(BaseRepository):
         return None
 
     # Retrieve and return all entities from storage
+    @reads
     def find_all(self):
         """Return all tokens"""
         return list(self._storage.values())
 
     # Find and return entity matching criteria
+    @reads
     def find_by_token(self, token_string):
         """Find token by token string"""
         return self._storage.get(token_string)
 
     # Find and return entities associated with specific user
+    @reads
     def find_by_user_id(self, user_id):
         """Find all tokens for a user"""
         return [token for token in self._storage.values() if token.user_id == user_id]
 
     # Update entity data and persist changes to storage
+    @writes
     def update(self, entity_id, updated_data):
         """Update token by ID"""
         token = self.find_by_id(entity_id)
@@ -111,10 +108,11 @@ class PasswordResetTokenRepository(BaseRepository):
         if 'is_used' in updated_data:
             token.is_used = updated_data['is_used']
 
-        self._save_to_file()
+        self._save_to_file(token.token)
         return token
 
     # Remove entity from storage permanently or from collection
+    @writes
     def delete(self, entity_id):
         """Delete token by ID"""
         token = self.find_by_id(entity_id)
@@ -126,6 +124,7 @@ class PasswordResetTokenRepository(BaseRepository):
         return True
 
     # Remove entity from storage permanently or from collection
+    @writes
     def delete_expired_tokens(self):
         """Clean up expired and used tokens"""
         tokens_to_delete = []
@@ -4,61 +4,44 @@ Profile repository for storing and retrieving user profiles
 Built by: Max Quirk
 """
 
-import json
-import os
 from models.profile import Profile
-from repositories.base_repository import BaseRepository
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes
 
-class ProfileRepository(BaseRepository):
+class ProfileRepository(JsonRepository):
     """Profile repository with JSON persistence"""
 
-    def __init__(self, json_file):
-        self._json_file = os.path.abspath(json_file)
-        self._storage = {}
+    def __init__(self, json_file, flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json'):
         self._id_counter = 1
-        self._load_from_file()
-
-    def _load_from_file(self):
-        """Load profiles from JSON file"""
-        try:
-            with open(self._json_file, 'r') as f:
-                data = json.load(f)
-            for p in data.values():
-                profile = Profile(
-                    user_id=p['user_id'],
-                    name=p.get('name'),
-                    major=p.get('major'),
-                    availability=p.get('availability', []),
-                    id=p['id'],
-                    created_at=None,
-                    preferences=p.get('preferences')
-                )
-                self._storage[profile.id] = profile
-                if profile.id >= self._id_counter:
-                    self._id_counter = profile.id + 1
-        except (FileNotFoundError, json.JSONDecodeError):
-            self._storage = {}
-            self._id_counter = 1
-
-    def _save_to_file(self):
-        """Save profiles to JSON file"""
-        # Ensure directory exists
-        directory = os.path.dirname(self._json_file)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-
-        data = {str(profile.id): {
+        super().__init__(json_file, flush_interval, shared, lazy, snapshot_format)
+
+    def _build(self, key, p):
+        return Profile(
+            user_id=p['user_id'],
+            name=p.get('name'),
+            major=p.get('major'),
+            availability=p.get('availability', []),
+            id=p['id'],
+            created_at=None,
+            preferences=p.get('preferences')
+        )
+
+    def _track(self, profile):
+        if profile.id >= self._id_counter:
+            self._id_counter = profile.id + 1
+
+    def _serialize(self, profile):
+        return {
             'id': profile.id,
             'user_id': profile.user_id,
             'name': profile.name,
             'major': profile.major,
             'availability': profile.availability,
             'preferences': profile.preferences
-        } for profile in self._storage.values()}
-
-        with open(self._json_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        }
 
+    @writes
     def create(self, entity):
         """Create a new profile"""
         if not isinstance(entity, Profile):
@@ -76,17 +59,20 @@ class ProfileRepository(BaseRepository):
         self._id_counter += 1
 
         self._storage[entity.id] = entity
-        self._save_to_file()
+        self._save_to_file(entity.id)
         return entity
 
+    @reads
     def find_by_id(self, entity_id):
         """Find profile by ID"""
         return self._storage.get(entity_id)
 
+    @reads
     def find_all(self):
         """Return all profiles"""
         return list(self._storage.values())
 
+    @reads
     def find_by_user_id(self, user_id):
         """Find profile by user ID"""
         for profile in self._storage.values():
@@ -94,6 +80,7 @@ class ProfileRepository(BaseRepository):
                 return profile
         return None
 
+    @writes
     def update(self, entity_id, updated_data):
         """Update profile by ID"""
         profile = self.find_by_id(entity_id)
@@ -113,9 +100,10 @@ class ProfileRepository(BaseRepository):
         if 'preferences' in updated_data:
             profile.preferences = updated_data['preferences']
 
-        self._save_to_file()
+        self._save_to_file(profile.id)
         return profile
 
+    @writes
     def delete(self, entity_id):
         """Delete profile by ID"""
         if entity_id not in self._storage:
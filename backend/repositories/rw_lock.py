@@ -0,0 +1,156 @@
+"""
+Reader/writer lock guarding the in-memory repositories
+
+Built by:
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    Many concurrent readers or one writer.
+
+    Waiting writers block new readers so a steady stream of reads cannot
+    starve them. Both sides are re-entrant per thread, and the writing thread
+    may also read, so repository methods can call each other freely.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def _read_depth(self):
+        return getattr(self._local, 'depth', 0)
+
+    def held(self):
+        """Whether the calling thread already holds either side"""
+        return self._writer == threading.get_ident() or bool(self._read_depth())
+
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        depth = self._read_depth()
+        if self._writer == me or depth:
+            # Already holding the lock on this thread
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+            else:
+                if self._read_depth():
+                    raise RuntimeError("Cannot upgrade a read lock to a write lock")
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = me
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+def ensure_loaded(repository):
+    """Load a repository created with lazy=True the first time it is used"""
+    if getattr(repository, '_loaded', True) is not False:
+        return
+    with repository._lock.write():
+        if repository._loaded is not False:
+            # Loaded meanwhile, or loading on this thread (e.g. a compaction during load)
+            return
+        shared = getattr(repository, '_shared', None)
+        if shared is not None:
+            # Before reading, so a write racing with the load is picked up later
+            shared.mark_current()
+        repository._loaded = None
+        try:
+            repository._reload()
+        except BaseException:
+            repository._loaded = False
+            raise
+        repository._loaded = True
+
+
+def reads(method):
+    """
+    Run a repository method under its shared lock.
+    With shared storage, first pick up changes written by other processes.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        ensure_loaded(self)
+        shared = getattr(self, '_shared', None)
+        if shared is not None and not self._lock.held() and shared.changed():
+            with self._lock.write():
+                shared.refresh()
+        with self._lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def exclusive(repository):
+    """
+    The repository's exclusive lock as a context manager.
+    With shared storage the inter-process lock is held too, the repository is
+    brought up to date first and changes are on disk before it is released.
+    """
+    shared = getattr(repository, '_shared', None)
+    with repository._lock.write():
+        ensure_loaded(repository)
+        if shared is None:
+            yield
+            return
+        with shared.exclusive():
+            shared.refresh()
+            try:
+                yield
+            finally:
+                repository.flush()
+                shared.mark_current()
+
+
+def writes(method):
+    """Run a repository method under its exclusive lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with exclusive(self):
+            return method(self, *args, **kwargs)
+    return wrapper
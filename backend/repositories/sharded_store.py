@@ -0,0 +1,127 @@
+"""
+Splits a repository snapshot into hash-bucketed shard files
+
+Built by:
+"""
+
+import glob
+import os
+import zlib
+from repositories.json_store import read_json, write_json
+from repositories.shared_file import file_signature
+
+MANIFEST_VERSION = 1
+
+
+class ShardedStore:
+    """
+    Records spread over ``count`` files by a stable hash of their key.
+
+    ``groups.json`` with 16 shards lives in ``groups.16-shards/``: files
+    ``000.json`` to ``015.json`` plus ``manifest.json``. Changes mark their
+    shard dirty and a save rewrites only the dirty shards.
+
+    The manifest is written once every shard has been written, so a layout
+    without it is incomplete and is rebuilt from the previous one (the single
+    file, or a layout with another shard count) on load.
+
+    ``only`` restricts loading to some shard indexes, for processes that
+    serve a subset of the records. Keys in other shards are rejected.
+    """
+
+    def __init__(self, path, count, snapshot_format='json', only=None):
+        if count < 1:
+            raise ValueError("Shard count must be at least 1")
+        self.path = path
+        self.count = count
+        self.directory = f"{os.path.splitext(path)[0]}.{count}-shards"
+        self.only = None if only is None else set(only)
+        self._snapshot_format = snapshot_format
+        self._manifest = os.path.join(self.directory, 'manifest.json')
+        self._dirty = set()
+
+    def shard_of(self, key):
+        # crc32 rather than hash(): str hashes differ between processes
+        return zlib.crc32(str(key).encode()) % self.count
+
+    def shard_path(self, index):
+        return os.path.join(self.directory, f"{index:03d}.json")
+
+    def paths(self):
+        """Every shard file and the manifest (for change detection)"""
+        return [self.shard_path(i) for i in range(self.count)] + [self._manifest]
+
+    @property
+    def complete(self):
+        return os.path.exists(self._manifest)
+
+    def check(self, key):
+        """Reject keys outside the shards this process loaded"""
+        if self.only is not None and self.shard_of(key) not in self.only:
+            raise ValueError(f"{key} is in shard {self.shard_of(key)}, which was not loaded")
+
+    def touch(self, key=None):
+        """Mark the shard holding key dirty (every shard when key is None)"""
+        if key is None:
+            self._dirty.update(range(self.count) if self.only is None else self.only)
+        else:
+            self._dirty.add(self.shard_of(key))
+
+    def changed(self, signatures):
+        """
+        Indexes of the loaded shards whose files no longer match signatures (as
+        taken of paths()), or None when the manifest changed and so may the layout
+        """
+        paths = self.paths()
+        if file_signature(self._manifest) != signatures[-1]:
+            return None
+        indexes = range(self.count) if self.only is None else sorted(self.only)
+        return [index for index in indexes if file_signature(paths[index]) != signatures[index]]
+
+    def load(self):
+        """
+        Records from the loaded shards. Records still in an older layout are
+        returned too, with every shard marked dirty so the next save moves them.
+        Raises FileNotFoundError when there is no data at all.
+        """
+        if self.complete:
+            records = {}
+            for index in range(self.count) if self.only is None else sorted(self.only):
+                try:
+                    records.update(read_json(self.shard_path(index)))
+                except FileNotFoundError:
+                    pass
+            return records
+
+        if self.only is not None:
+            raise ValueError(f"{self.directory} is incomplete; load every shard once before loading a subset")
+        records = self._load_previous_layout()
+        self.touch()
+        return records
+
+    def _load_previous_layout(self):
+        base = glob.escape(os.path.splitext(self.path)[0])
+        layouts = [manifest for manifest in glob.glob(f"{base}.*-shards/manifest.json")
+                   if os.path.dirname(manifest) != self.directory]
+        if not layouts:
+            return read_json(self.path)
+        newest = os.path.dirname(max(layouts, key=os.path.getmtime))
+        records = {}
+        for shard in glob.glob(os.path.join(glob.escape(newest), '[0-9]*.json')):
+            records.update(read_json(shard))
+        return records
+
+    def save(self, items, cache):
+        """Rewrite the dirty shards from (key, entity) pairs, serialized through a SnapshotCache"""
+        buckets = {index: [] for index in self._dirty}
+        for key, entity in items:
+            bucket = buckets.get(self.shard_of(key))
+            if bucket is not None:
+                bucket.append((key, entity))
+        for index in sorted(buckets):
+            data, entries = cache.encode(buckets[index], self._snapshot_format)
+            write_json(self.shard_path(index), data, snapshot_format=self._snapshot_format, entries=entries)
+            # Cleared one by one so a failed write leaves the rest pending
+            self._dirty.discard(index)
+        if not self.complete and self.only is None:
+            write_json(self._manifest, {'version': MANIFEST_VERSION, 'shards': self.count})
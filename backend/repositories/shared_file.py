@@ -0,0 +1,85 @@
+"""
+Keeps a JSON repository in step with other processes using the same files
+
+Built by:
+"""
+
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def file_signature(path):
+    """Identity of a file's current contents; changes on every rewrite or append"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class SharedFile:
+    """
+    Change detection and inter-process locking for one repository.
+
+    Writers hold an exclusive flock on ``<path>.lock`` while they reload,
+    mutate and save, so two processes never overwrite each other's changes.
+    Readers only compare file signatures and reload when another process
+    has written since this one last loaded or saved.
+    """
+
+    def __init__(self, path, reload, watched=None):
+        if fcntl is None:
+            raise RuntimeError("Shared storage needs POSIX file locking (fcntl)")
+        self._lock_path = path + '.lock'
+        self._reload = reload
+        # Files whose signatures are compared; the repository's journal can be added here
+        self._watched = watched or [path]
+        self._seen = None
+        self._lock_file = None
+        self._depth = 0
+        self.mark_current()
+
+    def _signatures(self):
+        return [file_signature(path) for path in self._watched]
+
+    @property
+    def last_seen(self):
+        """Signatures of the watched files when this process last loaded or saved them"""
+        return self._seen
+
+    def changed(self):
+        return self._signatures() != self._seen
+
+    def mark_current(self):
+        """Record the files as written or loaded by this process"""
+        self._seen = self._signatures()
+
+    def refresh(self):
+        """Reload if another process has written since"""
+        if self.changed():
+            self._reload()
+            self.mark_current()
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the inter-process write lock (re-entrant within one process)"""
+        if self._depth == 0:
+            directory = os.path.dirname(self._lock_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._lock_file = open(self._lock_path, 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
@@ -0,0 +1,72 @@
+"""
+Reuses the serialized form of entities that have not changed since the last save
+
+Built by:
+"""
+
+from repositories.json_store import encode_entry, write_json
+
+
+class SnapshotCache:
+    """
+    Per-entity cache of a repository snapshot.
+
+    Each entry keeps the record built by ``serialize`` and, once the JSON
+    format has been written, its encoded text. An entry is reused while the
+    same entity object is stored under the key and its version (see
+    ``BaseModel.mark_changed``) is unchanged. Repositories also ``discard`` a
+    key whenever they change that entity, which covers models without a
+    version and attributes changed in place, such as ``chat.messages``.
+    """
+
+    def __init__(self, serialize):
+        self._serialize = serialize
+        self._entries = {}  # key -> [entity, version, record, encoded text or None]
+
+    def discard(self, *keys):
+        """Forget the entries of entities that changed"""
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries = {}
+
+    def _entry(self, entry, entity):
+        """entry if it still describes entity, otherwise a new one"""
+        version = getattr(entity, '_version', 0)
+        if entry is None or entry[0] is not entity or entry[1] != version:
+            entry = [entity, version, self._serialize(entity), None]
+        return entry
+
+    def record(self, key, entity):
+        """The record a save would write for entity, serialized only if it changed"""
+        entry = self._entries[key] = self._entry(self._entries.get(key), entity)
+        return entry[2]
+
+    def encode(self, items, snapshot_format='json', prune=False):
+        """
+        (data, entries) for write_json from (key, entity) pairs: the records
+        for the compact format, or their encoded text for JSON. Only entities
+        that changed are serialized and encoded again. With prune=True the
+        entries of entities not in items are dropped.
+        """
+        cached = self._entries
+        kept = {} if prune else cached
+        compact = snapshot_format != 'json'
+        data, encoded = {}, []
+        for key, entity in items:
+            entry = kept[key] = self._entry(cached.get(key), entity)
+            if compact:
+                data[str(key)] = entry[2]
+                continue
+            if entry[3] is None:
+                entry[3] = encode_entry(key, entry[2])
+            encoded.append(entry[3])
+        self._entries = kept
+        # write_json only reads data for the compact format
+        return (data, None) if compact else (None, encoded)
+
+    def write(self, path, items, snapshot_format='json'):
+        """Save every (key, entity) pair to path"""
+        data, entries = self.encode(items, snapshot_format, prune=True)
+        write_json(path, data, snapshot_format=snapshot_format, entries=entries)
@@ -0,0 +1,232 @@
+"""
+SQLite chat repository with the same interface as ChatRepository
+
+Built by:
+"""
+
+from models.chat import Chat
+from repositories.sqlite_repository import SQLiteRepository
+
+class SQLiteChatRepository(SQLiteRepository):
+    """
+    Chat repository with SQLite persistence.
+    Messages live in their own table, so sending one is a single row insert,
+    and chat_members indexes membership so a user's chats are found without
+    reading the others.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS chats (
+        chat_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        members TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_chats_name ON chats (name);
+    CREATE TABLE IF NOT EXISTS chat_messages (
+        chat_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        body TEXT NOT NULL,
+        PRIMARY KEY (chat_id, position)
+    );
+    CREATE TABLE IF NOT EXISTS chat_members (
+        chat_id TEXT NOT NULL,
+        user_id NOT NULL,
+        PRIMARY KEY (chat_id, user_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_chat_members_user ON chat_members (user_id);
+    CREATE TABLE IF NOT EXISTS chat_ids (
+        id INTEGER PRIMARY KEY AUTOINCREMENT
+    );
+    """
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        with self._transaction() as conn:
+            if not conn.execute("SELECT 1 FROM chat_members LIMIT 1").fetchone():
+                # Databases created before chat_members existed only have the members column
+                for row in conn.execute("SELECT chat_id, members FROM chats").fetchall():
+                    self._write_members(conn, row['chat_id'], self._loads(row['members']))
+
+    def storage(self):
+        return {chat.chat_id: chat for chat in self.find_all()}
+
+    def _to_chats(self, rows):
+        messages = {row['chat_id']: [] for row in rows}
+        for chunk in self._chunks(list(messages)):
+            placeholders = ','.join('?' * len(chunk))
+            for m in self._query(
+                f"SELECT chat_id, body FROM chat_messages WHERE chat_id IN ({placeholders}) "
+                "ORDER BY chat_id, position",
+                chunk
+            ):
+                messages[m['chat_id']].append(self._loads(m['body']))
+        return [
+            Chat(
+                name=row['name'],
+                chat_id=row['chat_id'],
+                messages=messages[row['chat_id']],
+                members=self._loads(row['members'])
+            )
+            for row in rows
+        ]
+
+    def _to_summaries(self, rows):
+        """chat_id -> Chat.to_summary() from rows of _SUMMARY"""
+        summaries = {}
+        for row in rows:
+            last = row['position']
+            summaries[row['chat_id']] = {
+                "name": row['name'],
+                "chat_id": row['chat_id'],
+                "members": self._loads(row['members']),
+                "message_count": 0 if last is None else last + 1,
+                "last_message": None if last is None else Chat.normalize_message(self._loads(row['body']), last)
+            }
+        return summaries
+
+    # Chats with their newest message; the subquery is a lookup on the messages primary key
+    _SUMMARY = (
+        "SELECT c.chat_id, c.name, c.members, m.position, m.body FROM chats c "
+        "LEFT JOIN chat_messages m ON m.chat_id = c.chat_id AND m.position = "
+        "(SELECT MAX(position) FROM chat_messages WHERE chat_id = c.chat_id) "
+    )
+
+    def _write_members(self, conn, chat_id, members):
+        conn.execute("DELETE FROM chat_members WHERE chat_id = ?", (chat_id,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO chat_members (chat_id, user_id) VALUES (?, ?)",
+            [(chat_id, user_id) for user_id in members or []]
+        )
+
+    def _write(self, conn, chat):
+        conn.execute(
+            "INSERT INTO chats (chat_id, name, members) VALUES (?, ?, ?) "
+            "ON CONFLICT(chat_id) DO UPDATE SET name = excluded.name, members = excluded.members",
+            (chat.chat_id, chat.name, self._dumps(chat.members))
+        )
+        self._write_members(conn, chat.chat_id, chat.members)
+        messages = chat.messages or []
+        stored = conn.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM chat_messages WHERE chat_id = ?",
+            (chat.chat_id,)
+        ).fetchone()[0]
+        if stored > len(messages):
+            # History was rewritten rather than appended to
+            conn.execute("DELETE FROM chat_messages WHERE chat_id = ?", (chat.chat_id,))
+            stored = 0
+        conn.executemany(
+            "INSERT INTO chat_messages (chat_id, position, body) VALUES (?, ?, ?)",
+            [(chat.chat_id, position, self._dumps(messages[position]))
+             for position in range(stored, len(messages))]
+        )
+
+    def next_id(self):
+        """Allocate a numeric chat id that has never been used"""
+        with self._transaction() as conn:
+            # The insert takes SQLite's write lock, so the read below is serialized across connections
+            chat_id = conn.execute("INSERT INTO chat_ids DEFAULT VALUES").lastrowid
+            highest = conn.execute(
+                "SELECT COALESCE(MAX(CAST(chat_id AS INTEGER)), 0) FROM chats "
+                "WHERE chat_id NOT GLOB '*[^0-9]*'"
+            ).fetchone()[0]
+            if highest >= chat_id:
+                # Imported chats may already use higher ids
+                chat_id = highest + 1
+                conn.execute("INSERT INTO chat_ids (id) VALUES (?)", (chat_id,))
+        return str(chat_id)
+
+    def import_all(self, chats):
+        """Insert existing chats keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            for chat in chats:
+                self._write(conn, chat)
+
+    def create(self, entity):
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM chats WHERE chat_id = ?", (entity.chat_id,)).fetchone():
+                raise ValueError(f"Chat {entity.chat_id} already exists")
+            self._write(conn, entity)
+
+    def find_by_id(self, id):
+        chats = self._to_chats(self._query("SELECT * FROM chats WHERE chat_id = ?", (id,)))
+        return chats[0] if chats else None
+
+    def find_all(self):
+        return self._to_chats(self._query("SELECT * FROM chats ORDER BY rowid"))
+
+    def find_dm(self, user_id, friend_id):
+        """The DM between two users, whichever of them started it, or None"""
+        chats = self._to_chats(self._query(
+            "SELECT * FROM chats WHERE name IN (?, ?) ORDER BY rowid LIMIT 1",
+            (Chat.dm_name(user_id, friend_id), Chat.dm_name(friend_id, user_id))
+        ))
+        return chats[0] if chats else None
+
+    def add(self, chat):
+        return self.create(chat)
+
+    def get(self, chat_id):
+        return self.find_by_id(chat_id)
+
+    def update(self, chat_id, chat):
+        with self._transaction() as conn:
+            if not conn.execute("SELECT 1 FROM chats WHERE chat_id = ?", (chat_id,)).fetchone():
+                raise ValueError("Chat not found")
+            self._write(conn, chat)
+        return chat
+
+    def append_message(self, chat_id, message):
+        """
+        Store message as the chat's next one, assigning its id, without loading
+        the history. Returns the chat's summary (see Chat.to_summary), or None
+        if the chat does not exist.
+        """
+        with self.transaction():
+            conn = self._connection()
+            if not conn.execute("SELECT 1 FROM chats WHERE chat_id = ?", (chat_id,)).fetchone():
+                return None
+            position = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM chat_messages WHERE chat_id = ?", (chat_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO chat_messages (chat_id, position, body) VALUES (?, ?, ?)",
+                (chat_id, position, self._dumps({'id': position + 1, **message}))
+            )
+            return self._to_summaries(conn.execute(self._SUMMARY + "WHERE c.chat_id = ?", (chat_id,)))[chat_id]
+
+    def summaries_for_member(self, user_id):
+        """chat_id -> summary (see Chat.to_summary) of every chat user_id belongs to"""
+        return self._to_summaries(self._query(
+            self._SUMMARY + "JOIN chat_members cm ON cm.chat_id = c.chat_id WHERE cm.user_id = ? ORDER BY c.rowid",
+            (user_id,)
+        ))
+
+    def get_messages(self, chat_id, before=None, limit=50, after=None):
+        """
+        One page of a chat's history, oldest first.
+        before: only messages with a smaller id (newest page when None).
+        after: only messages with a larger id, starting from the oldest (takes precedence).
+        Returns None if the chat does not exist.
+        """
+        if not self._query_one("SELECT 1 FROM chats WHERE chat_id = ?", (chat_id,)):
+            return None
+        if after is not None:
+            rows = self._query(
+                "SELECT position, body FROM chat_messages WHERE chat_id = ? AND position >= ? "
+                "ORDER BY position LIMIT ?",
+                (chat_id, after, limit)
+            )
+            return [Chat.normalize_message(self._loads(row['body']), row['position']) for row in rows]
+        sql = "SELECT position, body FROM chat_messages WHERE chat_id = ?"
+        params = [chat_id]
+        if before is not None:
+            # Message ids are 1-based positions
+            sql += " AND position < ?"
+            params.append(before - 1)
+        sql += " ORDER BY position DESC LIMIT ?"
+        params.append(limit)
+        rows = reversed(self._query(sql, params))
+        return [Chat.normalize_message(self._loads(row['body']), row['position']) for row in rows]
+
+    def list_all(self):
+        return self.find_all()
@@ -0,0 +1,208 @@
+"""
+SQLite friend repository with the same interface as FriendRepository
+
+Built by:
+"""
+
+from datetime import datetime
+from models.friend import Friend
+from repositories.sqlite_repository import SQLiteRepository
+
+class SQLiteFriendRepository(SQLiteRepository):
+    """Friend repository with SQLite persistence"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS friends (
+        id TEXT PRIMARY KEY,
+        user_id NOT NULL,
+        friend_id NOT NULL,
+        status TEXT NOT NULL,
+        created_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_friends_user_status ON friends (user_id, status);
+    CREATE INDEX IF NOT EXISTS idx_friends_friend_status ON friends (friend_id, status);
+    """
+
+    @property
+    def storage(self):
+        """Expose storage for backward compatibility"""
+        return {friend.id: friend for friend in self.find_all()}
+
+    def _to_friend(self, row):
+        created_at = None
+        if row['created_at']:
+            try:
+                created_at = datetime.fromisoformat(row['created_at'])
+            except (ValueError, TypeError):
+                created_at = None
+        return Friend(
+            user_id=row['user_id'],
+            friend_id=row['friend_id'],
+            status=row['status'],
+            id=row['id'],
+            created_at=created_at
+        )
+
+    def _to_friends(self, rows):
+        return [self._to_friend(row) for row in rows]
+
+    def _write(self, conn, friend):
+        conn.execute(
+            "INSERT INTO friends (id, user_id, friend_id, status, created_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET user_id = excluded.user_id, friend_id = excluded.friend_id, "
+            "status = excluded.status",
+            (friend.id, friend.user_id, friend.friend_id, friend.status,
+             friend.created_at.isoformat() if friend.created_at else None)
+        )
+
+    def import_all(self, friends):
+        """Insert existing friendships keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            for friend in friends:
+                self._write(conn, friend)
+
+    # Abstract method implementations
+    def create(self, entity):
+        """Create/add a new friendship"""
+        if not isinstance(entity, Friend):
+            raise ValueError("Entity must be a Friend instance")
+        with self._transaction() as conn:
+            self._write(conn, entity)
+        return entity
+
+    def find_by_id(self, entity_id):
+        """Find friendship by ID"""
+        row = self._query_one("SELECT * FROM friends WHERE id = ?", (entity_id,))
+        return self._to_friend(row) if row else None
+
+    def find_all(self):
+        """Return all friendships"""
+        return self._to_friends(self._query("SELECT * FROM friends ORDER BY rowid"))
+
+    # Friend-specific methods
+    def add(self, friend):
+        """Add a friendship (alias for create)"""
+        return self.create(friend)
+
+    def get(self, friend_id):
+        """Get friendship by ID (alias for find_by_id)"""
+        return self.find_by_id(friend_id)
+
+    def update(self, friend_id, friend):
+        """Update an existing friendship"""
+        with self._transaction() as conn:
+            if not conn.execute("SELECT 1 FROM friends WHERE id = ?", (friend_id,)).fetchone():
+                raise ValueError("Friendship not found")
+            self._write(conn, friend)
+        return friend
+
+    def remove(self, friend_id):
+        """Delete a friendship"""
+        with self._transaction() as conn:
+            if not conn.execute("DELETE FROM friends WHERE id = ?", (friend_id,)).rowcount:
+                raise ValueError("Friendship not found")
+        return True
+
+    def get_friends_for_user(self, user_id, status=None):
+        """
+        Get all friendships for a user, optionally filtered by status.
+        Returns Friend objects where user is involved.
+        """
+        if status:
+            rows = self._query(
+                "SELECT * FROM friends WHERE user_id = ? AND status = ? "
+                "UNION SELECT * FROM friends WHERE friend_id = ? AND status = ?",
+                (user_id, status, user_id, status)
+            )
+        else:
+            rows = self._query(
+                "SELECT * FROM friends WHERE user_id = ? UNION SELECT * FROM friends WHERE friend_id = ?",
+                (user_id, user_id)
+            )
+        return self._to_friends(rows)
+
+    def find_friendship(self, user_id, friend_id):
+        """
+        Find a friendship between two users (bidirectional).
+        Returns the Friend object if exists, None otherwise.
+        """
+        row = self._query_one(
+            "SELECT * FROM friends WHERE (user_id = ? AND friend_id = ?) OR (user_id = ? AND friend_id = ?) "
+            "ORDER BY rowid LIMIT 1",
+            (user_id, friend_id, friend_id, user_id)
+        )
+        return self._to_friend(row) if row else None
+
+    def get_friend_ids(self, user_id, status=Friend.STATUS_ACCEPTED):
+        """
+        Get list of friend user IDs for a specific user.
+        Returns just the IDs of the friends, not the Friend objects.
+        """
+        friendships = self.get_friends_for_user(user_id, status)
+        return [f.get_other_user(user_id) for f in friendships]
+
+    def send_friend_request(self, user_id, friend_id):
+        """
+        Send a friend request from user_id to friend_id.
+        Creates a pending Friend object with user_id as the requester.
+        """
+        # Write lock held from the check to the insert, so two requests cannot both insert
+        with self.transaction():
+            existing = self.find_friendship(user_id, friend_id)
+            if existing:
+                return existing
+
+            friend = Friend(user_id=user_id, friend_id=friend_id, status=Friend.STATUS_PENDING)
+            return self.create(friend)
+
+    def accept_friend_request(self, friendship_id):
+        """
+        Accept a friend request by changing status to accepted.
+        """
+        friendship = self.find_by_id(friendship_id)
+        if not friendship:
+            raise ValueError("Friend request not found")
+
+        if friendship.status != Friend.STATUS_PENDING:
+            raise ValueError("Friend request is not pending")
+
+        friendship.status = Friend.STATUS_ACCEPTED
+        return self.update(friendship_id, friendship)
+
+    def reject_friend_request(self, friendship_id):
+        """
+        Reject a friend request by deleting it.
+        """
+        friendship = self.find_by_id(friendship_id)
+        if not friendship:
+            raise ValueError("Friend request not found")
+
+        if friendship.status != Friend.STATUS_PENDING:
+            raise ValueError("Friend request is not pending")
+
+        return self.remove(friendship_id)
+
+    def get_pending_requests_received(self, user_id):
+        """
+        Get pending friend requests where user_id is the recipient (friend_id).
+        """
+        return self._to_friends(self._query(
+            "SELECT * FROM friends WHERE friend_id = ? AND status = ? ORDER BY rowid",
+            (user_id, Friend.STATUS_PENDING)
+        ))
+
+    def get_pending_requests_sent(self, user_id):
+        """
+        Get pending friend requests where user_id is the sender (user_id).
+        """
+        return self._to_friends(self._query(
+            "SELECT * FROM friends WHERE user_id = ? AND status = ? ORDER BY rowid",
+            (user_id, Friend.STATUS_PENDING)
+        ))
+
+    def get_friends_list(self, user_id):
+        """
+        Get list of friend IDs for a user.
+        Returns list of user IDs who are friends with the given user.
+        """
+        return self.get_friend_ids(user_id, status=Friend.STATUS_ACCEPTED)
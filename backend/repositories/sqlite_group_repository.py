@@ -0,0 +1,207 @@
+"""
+SQLite group repository with the same interface as GroupRepository
+
+Built by:
+"""
+
+from models.group import Group
+from repositories.sqlite_repository import SQLiteRepository
+from repositories.group_filters import (normalize_class, normalize_time, class_keys, time_keys,
+                                        criterion_values, matching_ids)
+
+class SQLiteGroupRepository(SQLiteRepository):
+    """Group repository with SQLite persistence"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS groups (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        owner_id,
+        study_times TEXT,
+        specified_class TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_groups_name ON groups (name COLLATE NOCASE);
+    CREATE TABLE IF NOT EXISTS group_members (
+        group_id TEXT NOT NULL,
+        user_id NOT NULL,
+        position INTEGER NOT NULL,
+        PRIMARY KEY (group_id, user_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_group_members_user ON group_members (user_id);
+    CREATE TABLE IF NOT EXISTS group_classes (
+        group_id TEXT NOT NULL,
+        key TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_group_classes_key ON group_classes (key);
+    CREATE INDEX IF NOT EXISTS idx_group_classes_group ON group_classes (group_id);
+    CREATE TABLE IF NOT EXISTS group_times (
+        group_id TEXT NOT NULL,
+        key TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_group_times_key ON group_times (key);
+    CREATE INDEX IF NOT EXISTS idx_group_times_group ON group_times (group_id);
+    """
+
+    @property
+    def storage(self):
+        """Expose storage for backward compatibility"""
+        return {group.id: group for group in self.find_all()}
+
+    def _members_for(self, group_ids):
+        members = {gid: [] for gid in group_ids}
+        for chunk in self._chunks(group_ids):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._query(
+                f"SELECT group_id, user_id FROM group_members WHERE group_id IN ({placeholders}) "
+                "ORDER BY group_id, position",
+                chunk
+            )
+            for row in rows:
+                members[row['group_id']].append(row['user_id'])
+        return members
+
+    def _to_groups(self, rows):
+        members = self._members_for([row['id'] for row in rows])
+        groups = []
+        for row in rows:
+            group = Group(
+                name=row['name'],
+                owner_id=row['owner_id'],
+                members=members[row['id']],
+                study_times=self._loads(row['study_times']),
+                specified_class=self._loads(row['specified_class'])
+            )
+            group.id = row['id']
+            groups.append(group)
+        return groups
+
+    def _find_many(self, group_ids):
+        """Load groups by id, keeping the order of group_ids"""
+        found = {}
+        for chunk in self._chunks(group_ids):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._query(f"SELECT * FROM groups WHERE id IN ({placeholders})", chunk)
+            for group in self._to_groups(rows):
+                found[group.id] = group
+        return [found[gid] for gid in group_ids if gid in found]
+
+    def _write(self, conn, group):
+        conn.execute(
+            "INSERT INTO groups (id, name, owner_id, study_times, specified_class) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, owner_id = excluded.owner_id, "
+            "study_times = excluded.study_times, specified_class = excluded.specified_class",
+            (group.id, group.name, group.owner_id,
+             self._dumps(group._study_times), self._dumps(group._specified_class))
+        )
+        conn.execute("DELETE FROM group_members WHERE group_id = ?", (group.id,))
+        conn.executemany(
+            "INSERT INTO group_members (group_id, user_id, position) VALUES (?, ?, ?)",
+            [(group.id, user_id, position) for position, user_id in enumerate(group._members)]
+        )
+        conn.execute("DELETE FROM group_classes WHERE group_id = ?", (group.id,))
+        conn.executemany(
+            "INSERT INTO group_classes (group_id, key) VALUES (?, ?)",
+            [(group.id, key) for key in class_keys(group)]
+        )
+        conn.execute("DELETE FROM group_times WHERE group_id = ?", (group.id,))
+        conn.executemany(
+            "INSERT INTO group_times (group_id, key) VALUES (?, ?)",
+            [(group.id, key) for key in time_keys(group)]
+        )
+
+    def import_all(self, groups):
+        """Insert existing groups keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            for group in groups:
+                self._write(conn, group)
+
+    # Abstract method implementations
+    def create(self, entity):
+        """Create/add a new group"""
+        if not isinstance(entity, Group):
+            raise ValueError("Entity must be a Group instance")
+        with self._transaction() as conn:
+            self._write(conn, entity)
+        return entity
+
+    def find_by_id(self, entity_id):
+        """Find group by ID"""
+        groups = self._to_groups(self._query("SELECT * FROM groups WHERE id = ?", (entity_id,)))
+        return groups[0] if groups else None
+
+    def find_all(self):
+        """Return all groups"""
+        return self._to_groups(self._query("SELECT * FROM groups ORDER BY rowid"))
+
+    def add(self, group):
+        """Add a group (alias for create)"""
+        return self.create(group)
+
+    def get(self, group_id):
+        """Get group by ID (alias for find_by_id)"""
+        return self.find_by_id(group_id)
+
+    def update(self, group_id, group):
+        """Update an existing group"""
+        with self._transaction() as conn:
+            if not conn.execute("SELECT 1 FROM groups WHERE id = ?", (group_id,)).fetchone():
+                raise ValueError("Group not found")
+            self._write(conn, group)
+        return group
+
+    def list_all(self):
+        """List all groups (alias for find_all)"""
+        return self.find_all()
+
+    def get_groups_for_user(self, user_id):
+        """Get all groups that a user is a member of"""
+        rows = self._query(
+            "SELECT g.* FROM groups g JOIN group_members m ON m.group_id = g.id "
+            "WHERE m.user_id = ? ORDER BY g.rowid",
+            (user_id,)
+        )
+        return self._to_groups(rows)
+
+    def remove(self, group_id):
+        """Delete a group"""
+        with self._transaction() as conn:
+            if not conn.execute("DELETE FROM groups WHERE id = ?", (group_id,)).rowcount:
+                raise ValueError("Group not found")
+            for table in ('group_members', 'group_classes', 'group_times'):
+                conn.execute(f"DELETE FROM {table} WHERE group_id = ?", (group_id,))
+        return True
+
+    def save_group_info(self, group):
+        with self._transaction() as conn:
+            self._write(conn, group)
+
+    def find_by_name(self, name):
+        """Find group by name (case-insensitive)"""
+        rows = self._query("SELECT * FROM groups WHERE name = ? COLLATE NOCASE ORDER BY rowid LIMIT 1", (name,))
+        groups = self._to_groups(rows)
+        return groups[0] if groups else None
+
+    def _match_class(self, specified_class):
+        ids = {}
+        for value in criterion_values(specified_class):
+            query = normalize_class(value)
+            if not query:
+                continue
+            for row in self._query("SELECT group_id FROM group_classes WHERE instr(key, ?) > 0", (query,)):
+                ids[row['group_id']] = None
+        return ids
+
+    def _match_time(self, study_times):
+        ids = {}
+        for value in criterion_values(study_times):
+            for row in self._query("SELECT group_id FROM group_times WHERE key = ?", (normalize_time(value),)):
+                ids[row['group_id']] = None
+        return ids
+
+    def filter_by(self, specified_class=None, study_times=None, match_all=False):
+        """
+        Filter groups by class and/or study time.
+        With both criteria, match_all=True requires both (AND), otherwise either (OR).
+        """
+        ids = matching_ids(self._match_class, self._match_time, specified_class, study_times, match_all)
+        return self._find_many(list(ids))
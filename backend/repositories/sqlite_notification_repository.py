@@ -0,0 +1,100 @@
+"""
+SQLite notification repository with the same interface as NotificationRepository
+
+Built by:
+"""
+
+from models.notification import Notification
+from repositories.sqlite_repository import SQLiteRepository
+
+
+class SQLiteNotificationRepository(SQLiteRepository):
+    """Notification repository with SQLite persistence"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id NOT NULL,
+        message TEXT,
+        read INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications (user_id, id);
+    CREATE INDEX IF NOT EXISTS idx_notifications_unread ON notifications (user_id) WHERE read = 0;
+    """
+
+    def _to_notification(self, row):
+        return Notification(
+            user_id=row['user_id'],
+            message=row['message'],
+            read=bool(row['read']),
+            id=row['id'],
+            created_at=row['created_at']
+        )
+
+    def find_by_user_id(self, user_id, after=None, limit=None):
+        """
+        Notifications for a user in id order.
+        after: only ids greater than this cursor; limit: maximum number returned.
+        """
+        sql = "SELECT * FROM notifications WHERE user_id = ?"
+        params = [user_id]
+        if after is not None:
+            sql += " AND id > ?"
+            params.append(after)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._to_notification(row) for row in self._query(sql, params)]
+
+    def count_unread(self, user_id):
+        return self._query_one(
+            "SELECT COUNT(*) FROM notifications WHERE user_id = ? AND read = 0", (user_id,)
+        )[0]
+
+    def _insert(self, conn, notification):
+        cursor = conn.execute(
+            "INSERT INTO notifications (user_id, message, read, created_at) VALUES (?, ?, ?, ?)",
+            (notification.user_id, notification.message, int(notification.read), notification.created_at)
+        )
+        notification.id = cursor.lastrowid
+
+    def create(self, notification):
+        with self._transaction() as conn:
+            self._insert(conn, notification)
+        return notification
+
+    def create_many(self, notifications):
+        """Insert several notifications in one transaction"""
+        with self._transaction() as conn:
+            for notification in notifications:
+                self._insert(conn, notification)
+        return notifications
+
+    def import_all(self, notifications):
+        """Insert existing notifications keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO notifications (id, user_id, message, read, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(n.id, n.user_id, n.message, int(n.read), n.created_at) for n in notifications]
+            )
+
+    def mark_as_read(self, notification_id):
+        with self._transaction() as conn:
+            if not conn.execute("UPDATE notifications SET read = 1 WHERE id = ?", (notification_id,)).rowcount:
+                raise ValueError("Notification not found")
+        return self.find_by_id(notification_id)
+
+    def delete(self, notification_id):
+        with self._transaction() as conn:
+            if not conn.execute("DELETE FROM notifications WHERE id = ?", (notification_id,)).rowcount:
+                raise ValueError("Notification not found")
+        return True
+
+    def find_by_id(self, notification_id):
+        row = self._query_one("SELECT * FROM notifications WHERE id = ?", (notification_id,))
+        return self._to_notification(row) if row else None
+
+    def find_all(self):
+        return [self._to_notification(row) for row in self._query("SELECT * FROM notifications ORDER BY id")]
@@ -0,0 +1,118 @@
+"""
+SQLite password reset token repository with the same interface as PasswordResetTokenRepository
+
+Built by:
+"""
+
+from datetime import datetime
+from models.password_reset import PasswordResetToken
+from repositories.sqlite_repository import SQLiteRepository
+
+class SQLitePasswordResetTokenRepository(SQLiteRepository):
+    """Password reset token repository with SQLite persistence"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS password_reset_tokens (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        token TEXT NOT NULL UNIQUE,
+        user_id NOT NULL,
+        expires_at TEXT NOT NULL,
+        is_used INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_reset_tokens_user ON password_reset_tokens (user_id);
+    CREATE INDEX IF NOT EXISTS idx_reset_tokens_expires ON password_reset_tokens (expires_at);
+    """
+
+    @staticmethod
+    def _timestamp(value):
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    def _to_token(self, row):
+        return PasswordResetToken(
+            user_id=row['user_id'],
+            token=row['token'],
+            expires_at=row['expires_at'],
+            is_used=bool(row['is_used']),
+            id=row['id'],
+            created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None
+        )
+
+    def _row_values(self, token):
+        return (token.token, token.user_id, self._timestamp(token.expires_at),
+                int(token.is_used), self._timestamp(token._created_at))
+
+    def create(self, entity):
+        """Create new reset token"""
+        if not isinstance(entity, PasswordResetToken):
+            raise ValueError("Entity must be a PasswordResetToken instance")
+
+        is_valid, errors = entity.validate()
+        if not is_valid:
+            raise ValueError(f"Validation failed: {', '.join(errors)}")
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO password_reset_tokens (token, user_id, expires_at, is_used, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._row_values(entity)
+            )
+        entity.id = cursor.lastrowid
+        return entity
+
+    def import_all(self, tokens):
+        """Insert existing tokens keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO password_reset_tokens (id, token, user_id, expires_at, is_used, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(t.id,) + self._row_values(t) for t in tokens]
+            )
+
+    def find_by_id(self, entity_id):
+        """Find token by ID"""
+        row = self._query_one("SELECT * FROM password_reset_tokens WHERE id = ?", (entity_id,))
+        return self._to_token(row) if row else None
+
+    def find_all(self):
+        """Return all tokens"""
+        return [self._to_token(row) for row in self._query("SELECT * FROM password_reset_tokens ORDER BY id")]
+
+    def find_by_token(self, token_string):
+        """Find token by token string"""
+        row = self._query_one("SELECT * FROM password_reset_tokens WHERE token = ?", (token_string,))
+        return self._to_token(row) if row else None
+
+    def find_by_user_id(self, user_id):
+        """Find all tokens for a user"""
+        return [self._to_token(row) for row in self._query(
+            "SELECT * FROM password_reset_tokens WHERE user_id = ? ORDER BY id", (user_id,)
+        )]
+
+    def update(self, entity_id, updated_data):
+        """Update token by ID"""
+        token = self.find_by_id(entity_id)
+        if not token:
+            raise ValueError("Token not found")
+
+        if 'is_used' in updated_data:
+            token.is_used = updated_data['is_used']
+
+        with self._transaction() as conn:
+            conn.execute("UPDATE password_reset_tokens SET is_used = ? WHERE id = ?", (int(token.is_used), token.id))
+        return token
+
+    def delete(self, entity_id):
+        """Delete token by ID"""
+        with self._transaction() as conn:
+            if not conn.execute("DELETE FROM password_reset_tokens WHERE id = ?", (entity_id,)).rowcount:
+                raise ValueError("Token not found")
+        return True
+
+    def delete_expired_tokens(self):
+        """Clean up expired and used tokens"""
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM password_reset_tokens WHERE is_used = 1 OR expires_at <= ?",
+                (datetime.now().isoformat(),)
+            ).rowcount
@@ -0,0 +1,114 @@
+"""
+SQLite profile repository with the same interface as ProfileRepository
+
+Built by:
+"""
+
+import sqlite3
+from models.profile import Profile
+from repositories.sqlite_repository import SQLiteRepository
+
+class SQLiteProfileRepository(SQLiteRepository):
+    """Profile repository with SQLite persistence"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS profiles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id NOT NULL UNIQUE,
+        name TEXT,
+        major TEXT,
+        availability TEXT,
+        preferences TEXT
+    );
+    """
+
+    def _to_profile(self, row):
+        return Profile(
+            user_id=row['user_id'],
+            name=row['name'],
+            major=row['major'],
+            availability=self._loads(row['availability']) or [],
+            id=row['id'],
+            created_at=None,
+            preferences=self._loads(row['preferences'])
+        )
+
+    def _row_values(self, profile):
+        return (profile.user_id, profile.name, profile.major,
+                self._dumps(profile.availability), self._dumps(profile.preferences))
+
+    def create(self, entity):
+        """Create a new profile"""
+        if not isinstance(entity, Profile):
+            raise ValueError("Entity must be a Profile instance")
+
+        is_valid, errors = entity.validate()
+        if not is_valid:
+            raise ValueError(f"Validation failed: {', '.join(errors)}")
+
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO profiles (user_id, name, major, availability, preferences) VALUES (?, ?, ?, ?, ?)",
+                    self._row_values(entity)
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("Profile already exists for this user")
+
+        entity.id = cursor.lastrowid
+        return entity
+
+    def import_all(self, profiles):
+        """Insert existing profiles keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO profiles (id, user_id, name, major, availability, preferences) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(p.id,) + self._row_values(p) for p in profiles]
+            )
+
+    def find_by_id(self, entity_id):
+        """Find profile by ID"""
+        row = self._query_one("SELECT * FROM profiles WHERE id = ?", (entity_id,))
+        return self._to_profile(row) if row else None
+
+    def find_all(self):
+        """Return all profiles"""
+        return [self._to_profile(row) for row in self._query("SELECT * FROM profiles ORDER BY id")]
+
+    def find_by_user_id(self, user_id):
+        """Find profile by user ID"""
+        row = self._query_one("SELECT * FROM profiles WHERE user_id = ?", (user_id,))
+        return self._to_profile(row) if row else None
+
+    def update(self, entity_id, updated_data):
+        """Update profile by ID"""
+        profile = self.find_by_id(entity_id)
+        if not profile:
+            raise ValueError("Profile not found")
+
+        if 'name' in updated_data:
+            profile._name = updated_data['name']
+
+        if 'major' in updated_data:
+            profile._major = updated_data['major']
+
+        if 'availability' in updated_data:
+            profile._availability = updated_data['availability']
+
+        if 'preferences' in updated_data:
+            profile.preferences = updated_data['preferences']
+
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE profiles SET user_id = ?, name = ?, major = ?, availability = ?, preferences = ? WHERE id = ?",
+                self._row_values(profile) + (profile.id,)
+            )
+        return profile
+
+    def delete(self, entity_id):
+        """Delete profile by ID"""
+        with self._transaction() as conn:
+            if not conn.execute("DELETE FROM profiles WHERE id = ?", (entity_id,)).rowcount:
+                raise ValueError("Profile not found")
+        return True
@@ -0,0 +1,97 @@
+"""
+Base class for SQLite-backed repositories sharing one database file
+
+Built by:
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from repositories.base_repository import BaseRepository
+
+class SQLiteRepository(BaseRepository):
+    """
+    Connection handling shared by the SQLite repositories.
+    Each thread gets its own connection; the database runs in WAL mode so
+    readers never block the writer.
+    """
+
+    # Subclasses provide their CREATE TABLE / CREATE INDEX statements
+    SCHEMA = ""
+
+    def __init__(self, db_path):
+        self._db_path = os.path.abspath(db_path)
+        directory = os.path.dirname(self._db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run several statements atomically; commits on success, rolls back on error"""
+        conn = self._connection()
+        if getattr(self._local, 'depth', 0):
+            # Part of an enclosing transaction(), which commits
+            yield conn
+            return
+        with conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Hold the database write lock across several calls, e.g. a service's
+        read-modify-write. Works across processes; nested writes join it.
+        """
+        conn = self._connection()
+        depth = getattr(self._local, 'depth', 0)
+        if not depth:
+            conn.execute('BEGIN IMMEDIATE')
+        self._local.depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            self._local.depth = depth
+            if not depth:
+                conn.rollback()
+            raise
+        self._local.depth = depth
+        if not depth:
+            conn.commit()
+
+    def _query(self, sql, params=()):
+        return self._connection().execute(sql, params).fetchall()
+
+    def _query_one(self, sql, params=()):
+        return self._connection().execute(sql, params).fetchone()
+
+    @staticmethod
+    def _dumps(value):
+        return json.dumps(value)
+
+    @staticmethod
+    def _loads(value):
+        return json.loads(value) if value is not None else None
+
+    @staticmethod
+    def _chunks(values, size=500):
+        """Split values for IN (...) queries below SQLite's variable limit"""
+        values = list(values)
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
+    def flush(self):
+        """Every write is committed immediately, so there is nothing pending"""
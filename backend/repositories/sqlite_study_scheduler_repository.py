@@ -0,0 +1,71 @@
+"""
+SQLite study scheduler repository with the same interface as StudySchedulerRepository
+
+Built by:
+"""
+
+from models.study_scheduler import StudyScheduler
+from repositories.sqlite_repository import SQLiteRepository
+
+
+class SQLiteStudySchedulerRepository(SQLiteRepository):
+    """Study session repository with SQLite persistence"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS schedules (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id NOT NULL,
+        title TEXT,
+        start_time TEXT,
+        end_time TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_schedules_user ON schedules (user_id, id);
+    """
+
+    def _to_schedule(self, row):
+        return StudyScheduler(
+            user_id=row['user_id'],
+            title=row['title'],
+            start_time=row['start_time'],
+            end_time=row['end_time'],
+            id=row['id']
+        )
+
+    def create(self, schedule):
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO schedules (user_id, title, start_time, end_time) VALUES (?, ?, ?, ?)",
+                (schedule.user_id, schedule.title, schedule.start_time, schedule.end_time)
+            )
+        schedule.id = cursor.lastrowid
+        return schedule
+
+    def import_all(self, schedules):
+        """Insert existing sessions keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO schedules (id, user_id, title, start_time, end_time) VALUES (?, ?, ?, ?, ?)",
+                [(s.id, s.user_id, s.title, s.start_time, s.end_time) for s in schedules]
+            )
+
+    def delete(self, session_id):
+        with self._transaction() as conn:
+            if not conn.execute("DELETE FROM schedules WHERE id = ?", (session_id,)).rowcount:
+                raise ValueError("Session not found")
+        return True
+
+    def find_by_user_id(self, user_id):
+        row = self._query_one("SELECT * FROM schedules WHERE user_id = ? ORDER BY id LIMIT 1", (user_id,))
+        return self._to_schedule(row) if row else None
+
+    def find_all(self):
+        return [self._to_schedule(row) for row in self._query("SELECT * FROM schedules ORDER BY id")]
+
+    def find_by_id(self, id):
+        row = self._query_one("SELECT * FROM schedules WHERE id = ?", (id,))
+        return self._to_schedule(row) if row else None
+
+    def get_sessions_by_user(self, user_id):
+        return [self._to_schedule(row) for row in self._query(
+            "SELECT * FROM schedules WHERE user_id = ? ORDER BY id", (user_id,)
+        )]
@@ -0,0 +1,114 @@
+"""
+SQLite user repository with the same interface as UserRepository
+
+Built by:
+"""
+
+import sqlite3
+from models.user import User
+from repositories.sqlite_repository import SQLiteRepository
+
+class SQLiteUserRepository(SQLiteRepository):
+    """User repository with SQLite persistence"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        password_hash TEXT,
+        is_active INTEGER NOT NULL DEFAULT 1
+    );
+    """
+
+    def _to_user(self, row):
+        return User(
+            email=row['email'],
+            password_hash=row['password_hash'],
+            is_active=bool(row['is_active']),
+            id=row['id'],
+            created_at=None
+        )
+
+    def create(self, entity):
+        if not isinstance(entity, User):
+            raise ValueError("Entity must be a User instance")
+
+        is_valid, errors = entity.validate()
+        if not is_valid:
+            raise ValueError(f"Validation failed: {', '.join(errors)}")
+
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO users (email, password_hash, is_active) VALUES (?, ?, ?)",
+                    (entity.email, entity._password_hash, int(entity.is_active))
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("User with this email already exists")
+
+        entity.id = cursor.lastrowid
+        return entity
+
+    def import_all(self, users):
+        """Insert existing users keeping their ids (used when migrating from JSON)"""
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO users (id, email, password_hash, is_active) VALUES (?, ?, ?, ?)",
+                [(u.id, u.email, u._password_hash, int(u.is_active)) for u in users]
+            )
+
+    def find_by_id(self, entity_id):
+        """Find user by ID"""
+        row = self._query_one("SELECT * FROM users WHERE id = ?", (entity_id,))
+        return self._to_user(row) if row else None
+
+    def find_emails_by_ids(self, ids):
+        """Resolve many user IDs to emails in one pass; unknown IDs are omitted"""
+        emails = {}
+        for chunk in self._chunks(set(ids)):
+            placeholders = ','.join('?' * len(chunk))
+            for row in self._query(f"SELECT id, email FROM users WHERE id IN ({placeholders})", chunk):
+                emails[row['id']] = row['email']
+        return emails
+
+    def find_all(self):
+        """Return all users"""
+        return [self._to_user(row) for row in self._query("SELECT * FROM users ORDER BY id")]
+
+    def find_by_email(self, email):
+        """Find user by email"""
+        row = self._query_one("SELECT * FROM users WHERE email = ?", (email.lower().strip(),))
+        return self._to_user(row) if row else None
+
+    def update(self, entity_id, updated_data):
+        """Update user by ID"""
+        user = self.find_by_id(entity_id)
+        if not user:
+            raise ValueError("User not found")
+
+        if 'email' in updated_data:
+            user.email = updated_data['email']
+
+        if 'is_active' in updated_data:
+            user._is_active = updated_data['is_active']
+
+        if 'password_hash' in updated_data:
+            user._password_hash = updated_data['password_hash']
+
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "UPDATE users SET email = ?, password_hash = ?, is_active = ? WHERE id = ?",
+                    (user.email, user._password_hash, int(user.is_active), user.id)
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("User with this email already exists")
+        return user
+
+    def delete(self, entity_id):
+        """Delete user by ID"""
+        with self._transaction() as conn:
+            deleted = conn.execute("DELETE FROM users WHERE id = ?", (entity_id,)).rowcount
+        if not deleted:
+            raise ValueError("User not found")
+        return True
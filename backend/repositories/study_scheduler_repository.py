@@ -5,66 +5,50 @@ Built by: Josh Topp
 """
 
 
-import json
-import os
-from datetime import datetime
-from sched import scheduler
-
 from models.study_scheduler import StudyScheduler
-from repositories.base_repository import BaseRepository
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes
 
 
-class StudySchedulerRepository(BaseRepository):
-    def __init__(self, json_file):
-        self._json_file = os.path.abspath(json_file)
-        self._storage = {}
+class StudySchedulerRepository(JsonRepository):
+    def __init__(self, json_file, flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json'):
         self._id_counter = 1
-        self._load_from_file()
-
-    def _load_from_file(self):
-        try:
-            with open(self._json_file, 'r') as f:
-                data = json.load(f)
-            for s in data.values():
-                scheduler = StudyScheduler(
-                    user_id=s['user_id'],
-                    title=s['title'],
-                    start_time=s['start_time'],
-                    end_time=s['end_time'],
-                    id=s['id']
-                )
-                self._storage[scheduler.id] = scheduler
-                if scheduler.id >= self._id_counter:
-                    self._id_counter = scheduler.id + 1
-        except (FileNotFoundError, json.JSONDecodeError):
-            self._storage = {}
-            self._id_counter = 1
-
-    def _save_to_file(self):
-        directory = os.path.dirname(self._json_file)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-
-        data = {str(schedule.id): {
+        super().__init__(json_file, flush_interval, shared, lazy, snapshot_format)
+
+    def _build(self, key, s):
+        return StudyScheduler(
+            user_id=s['user_id'],
+            title=s['title'],
+            start_time=s['start_time'],
+            end_time=s['end_time'],
+            id=s['id']
+        )
+
+    def _track(self, schedule):
+        if schedule.id >= self._id_counter:
+            self._id_counter = schedule.id + 1
+
+    def _serialize(self, schedule):
+        return {
             'id': schedule.id,
             'user_id': schedule.user_id,
             'title': schedule.title,
             'start_time': schedule.start_time,
             'end_time': schedule.end_time
-        } for schedule in self._storage.values()}
-
-        with open(self._json_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        }
 
 
+    @writes
     def create(self, schedule):
         schedule.id = self._id_counter
         self._id_counter += 1
         self._storage[schedule.id] = schedule
-        self._save_to_file()
+        self._save_to_file(schedule.id)
         return schedule
 
 
+    @writes
     def delete(self, session_id):
         if session_id in self._storage:
             del self._storage[session_id]
@@ -72,6 +56,7 @@ class StudySchedulerRepository(BaseRepository):
             return True
         raise ValueError("Session not found")
 
+    @reads
     def find_by_user_id(self, user_id):
         for schedule in self._storage.values():
             if schedule.user_id == user_id:
@@ -79,11 +64,14 @@ class StudySchedulerRepository(BaseRepository):
         return None
 
 
+    @reads
     def find_all(self):
         return list(self._storage.values())
 
+    @reads
     def find_by_id(self, id):
         return self._storage.get(id)
 
+    @reads
     def get_sessions_by_user(self, user_id):
         return [schedule for schedule in self._storage.values() if user_id == schedule.user_id]
\ No newline at end of file
@@ -4,55 +4,61 @@ User repository for database operations on user accounts
 Built by: Max Quirk
 """
 
-import json
-import os
 from models.user import User
-from repositories.base_repository import BaseRepository
+from repositories.json_repository import JsonRepository
+from repositories.rw_lock import reads, writes
 
-class UserRepository(BaseRepository):
+class UserRepository(JsonRepository):
     """User repository with JSON persistence"""
 
-    def __init__(self, json_file):
-        self._json_file = os.path.abspath(json_file)
-        self._storage = {}
+    def __init__(self, json_file, flush_interval=0, shared=False, lazy=False,
+                 snapshot_format='json'):
+        # Secondary index: user id -> User, kept in sync with _storage (keyed by email)
+        self._by_id = {}
         self._id_counter = 1
-        self._load_from_file()
-
-    def _load_from_file(self):
-        try:
-            with open(self._json_file, 'r') as f:
-                data = json.load(f)
-            for u in data.values():
-                user = User(
-                    email=u['email'],
-                    password_hash=u.get('_password_hash'),  # Pass the hash directly
-                    is_active=u.get('_is_active', True),
-                    id=u['id'],
-                    created_at=None  # Or parse from JSON if you're storing it
-                )
-                self._storage[user.email] = user
-                if user.id >= self._id_counter:
-                    self._id_counter = user.id + 1
-        except (FileNotFoundError, json.JSONDecodeError):
-            self._storage = {}
-            self._id_counter = 1
-
-    def _save_to_file(self):
-        # Ensure directory exists
-        directory = os.path.dirname(self._json_file)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-            
-        data = {str(user.id): {
+        super().__init__(json_file, flush_interval, shared, lazy, snapshot_format)
+
+    def _build(self, key, u):
+        return User(
+            email=u['email'],
+            password_hash=u.get('_password_hash'),  # Pass the hash directly
+            is_active=u.get('_is_active', True),
+            id=u['id'],
+            created_at=None  # Or parse from JSON if you're storing it
+        )
+
+    def _key(self, user):
+        return user.email
+
+    def _snapshot_key(self, user):
+        return user.id
+
+    def _rebuild_index(self):
+        self._by_id = {}
+        super()._rebuild_index()
+
+    def _track(self, user):
+        self._by_id[user.id] = user
+        if user.id >= self._id_counter:
+            self._id_counter = user.id + 1
+
+    def _untrack(self, user):
+        if self._by_id.get(user.id) is user:
+            del self._by_id[user.id]
+
+    def _serialize(self, user):
+        return {
             'id': user.id,
             'email': user.email,
             '_password_hash': user._password_hash,
             '_is_active': user.is_active
-        } for user in self._storage.values()}
-        
-        with open(self._json_file, 'w') as f:
-            json.dump(data, f, indent=4)
+        }
+
+    def _snapshot_items(self):
+        # The file is keyed by id; _storage by email
+        return self._by_id.items()
 
+    @writes
     def create(self, entity):
         if not isinstance(entity, User):
             raise ValueError("Entity must be a User instance")
@@ -68,24 +74,36 @@ class UserRepository(BaseRepository):
         self._id_counter += 1
 
         self._storage[entity.email] = entity
-        self._save_to_file()
+        self._by_id[entity.id] = entity
+        self._save_to_file(entity.id)
         return entity
 
+    @reads
     def find_by_id(self, entity_id):
         """Find user by ID"""
-        for user in self._storage.values():
-            if user.id == entity_id:
-                return user
-        return None
-
+        return self._by_id.get(entity_id)
+
+    @reads
+    def find_emails_by_ids(self, ids):
+        """Resolve many user IDs to emails in one pass; unknown IDs are omitted"""
+        emails = {}
+        for user_id in ids:
+            user = self._by_id.get(user_id)
+            if user is not None:
+                emails[user_id] = user.email
+        return emails
+
+    @reads
     def find_all(self):
         """Return all users"""
         return list(self._storage.values())
 
+    @reads
     def find_by_email(self, email):
         """Find user by email"""
         return self._storage.get(email.lower().strip())
 
+    @writes
     def update(self, entity_id, updated_data):
         """Update user by ID"""
         user = self.find_by_id(entity_id)
@@ -95,6 +113,9 @@ class UserRepository(BaseRepository):
         # Update user attributes
         if 'email' in updated_data:
             # Remove old email key and add new one
+            existing = self.find_by_email(updated_data['email'])
+            if existing is not None and existing is not user:
+                raise ValueError("User with this email already exists")
             old_email = user.email
             user.email = updated_data['email']
             del self._storage[old_email]
@@ -106,9 +127,10 @@ class UserRepository(BaseRepository):
         if 'password_hash' in updated_data:
             user._password_hash = updated_data['password_hash']
 
-        self._save_to_file()
+        self._save_to_file(user.id)
         return user
 
+    @writes
     def delete(self, entity_id):
         """Delete user by ID"""
         user = self.find_by_id(entity_id)
@@ -116,5 +138,6 @@ class UserRepository(BaseRepository):
             raise ValueError("User not found")
         
         del self._storage[user.email]
+        del self._by_id[user.id]
         self._save_to_file()
         return True
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Write-behind persistence shared by the JSON repositories
+
+Built by:
+"""
+
+import atexit
+import threading
+import weakref
+from contextlib import nullcontext
+
+# Every live writer, so pending changes can be flushed on interpreter shutdown
+_writers = weakref.WeakSet()
+
+
+def flush_all():
+    """Write every repository that has unsaved changes"""
+    for writer in list(_writers):
+        try:
+            writer.flush()
+        except Exception as e:
+            print(f"Failed to save pending changes: {e}")
+
+
+atexit.register(flush_all)
+
+
+class WriteBehind:
+    """
+    Coalesces repository snapshot writes.
+
+    Repositories call mark_dirty() after each mutation. With interval 0 the
+    snapshot is written immediately, as before. With a positive interval the
+    write happens on a background timer at most once per interval, so a burst
+    of mutations costs a single write and requests never wait on json.dump.
+    Anything changed within the last interval is lost if the process is killed
+    without running atexit handlers; that window is the durability trade-off.
+
+    lock is the repository's ReadWriteLock; snapshots are taken under its read
+    side so they never see a half-applied mutation.
+    """
+
+    def __init__(self, write, interval=0, lock=None):
+        self._write = write
+        self.interval = interval
+        self._guard = lock
+        self._lock = threading.Lock()
+        # Held while writing so two flushes never interleave on the same file
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._timer = None
+        _writers.add(self)
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def mark_dirty(self):
+        with self._lock:
+            self._dirty = True
+            if not self.interval:
+                schedule = False
+            elif self._timer is None:
+                self._timer = threading.Timer(self.interval, self._on_timer)
+                self._timer.daemon = True
+                schedule = True
+            else:
+                # A flush is already pending and will pick this change up
+                return
+        if schedule:
+            self._timer.start()
+        else:
+            self.flush()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            # Keep the changes and try again on the next tick
+            print(f"Background save failed, retrying: {e}")
+            self.mark_dirty()
+
+    def flush(self):
+        """Write now if there are unsaved changes"""
+        # Repository lock first, then the write lock, the same order a mutating call uses
+        with self._guard.read() if self._guard else nullcontext():
+            with self._write_lock:
+                with self._lock:
+                    if not self._dirty:
+                        return
+                    self._dirty = False
+                try:
+                    self._write()
+                except Exception:
+                    with self._lock:
+                        self._dirty = True
+                    raise
@@ -4,16 +4,25 @@ Authentication service handling login, logout, and session management
 Built by: Max Quirk
 """
 
+import threading
 from models.user import User
+from services.password_hasher import HasherBusyError, PasswordHasher
 from validators.user_validator import UserValidator
 from validators.password_reset_validator import PasswordResetValidator
 
 class AuthService:
     """Authentication service"""
 
-    def __init__(self, user_repository, token_repository=None):
+    def __init__(self, user_repository, token_repository=None, password_hasher=None):
         self._user_repository = user_repository
         self._token_repository = token_repository
+        # bcrypt runs through the hasher so it can be moved off the request thread
+        self._hasher = password_hasher or PasswordHasher()
+        # Users whose hash is being upgraded to the target cost right now
+        self._rehashing = set()
+        self._rehash_lock = threading.Lock()
+        # Notified whenever a rehash finishes (see wait_for_rehash)
+        self._rehash_done = threading.Condition(self._rehash_lock)
         self._validator = UserValidator()
         self._reset_validator = PasswordResetValidator()
 
@@ -25,16 +34,52 @@ class AuthService:
         if not is_valid:
             raise ValueError(f"Validation failed: {', '.join(errors)}")
 
-        user = User(email=email, password=password)
+        user = User(email=email, password_hash=self._hasher.hash(password))
         created_user = self._user_repository.create(user)
         return created_user
 
     def login(self, email, password):
         user = self._user_repository.find_by_email(email)
-        if not user or not user.verify_password(password):
+        if not user or not self._hasher.verify(password, user.password_hash):
             raise ValueError("Invalid email or password")
+        if self._hasher.needs_rehash(user.password_hash):
+            self._start_rehash(user, password)
         return user
 
+    def _start_rehash(self, user, password):
+        """Re-hash at the target cost in the background; the login does not wait"""
+        with self._rehash_lock:
+            if user.id in self._rehashing:
+                return
+            self._rehashing.add(user.id)
+        threading.Thread(target=self._rehash, args=(user.id, user.password_hash, password),
+                         daemon=True).start()
+
+    def _rehash(self, user_id, old_hash, password):
+        try:
+            # Only on an idle worker, so a wave of outdated hashes cannot crowd out logins
+            new_hash = self._hasher.hash_if_idle(password)
+            with self._user_repository.transaction():
+                # Skip if the password was changed meanwhile
+                user = self._user_repository.find_by_id(user_id)
+                if user and user.password_hash == old_hash:
+                    self._user_repository.update(user_id, {'password_hash': new_hash})
+        except HasherBusyError:
+            # No spare capacity; the old hash still works, so try again on the next login
+            pass
+        except Exception as e:
+            # The old hash still works; try again on the next login
+            print(f"Password rehash for user {user_id} failed: {e}")
+        finally:
+            with self._rehash_lock:
+                self._rehashing.discard(user_id)
+                self._rehash_done.notify_all()
+
+    def wait_for_rehash(self, timeout=None):
+        """Wait for background rehashes to finish; False if some are still running after timeout"""
+        with self._rehash_lock:
+            return self._rehash_done.wait_for(lambda: not self._rehashing, timeout)
+
     def logout(self, session):
         session.clear()
 
@@ -94,8 +139,8 @@ class AuthService:
         if not user:
             raise ValueError("User not found")
 
-        # Update password (User model handles hashing)
-        new_hash = user._hash_password(new_password)
+        # Update password
+        new_hash = self._hasher.hash(new_password)
 
         # Save updated user with new password hash
         self._user_repository.update(user.id, {'password_hash': new_hash})
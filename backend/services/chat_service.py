@@ -4,93 +4,112 @@ Chat service for messaging functionality
 Built by:
 """
 
+from datetime import datetime
 from models.chat import Chat
 
 
 class ChatService:
 
-    def __init__(self, chat_repo):
+    def __init__(self, chat_repo, broker=None):
         self.chat_repo = chat_repo
+        # Optional MessageBroker; new messages are published to 'chat:<chat_id>'
+        self.broker = broker
+
+    @staticmethod
+    def topic(chat_id):
+        return f"chat:{chat_id}"
 
     def create_chat(self, name, owner_id, members=None, group_id=None):
         members = members or []
-        if group_id is not None:
-            chat_id = group_id
-        else:
-            chat_id = str(len(self.chat_repo.storage()) + 1)
-
-        chat = Chat(name, chat_id)
-        chat.members = [owner_id] + members
-        self.chat_repo.add(chat)
-        return chat
+        # Allocated and stored together, so another process cannot take the same id in between
+        with self.chat_repo.transaction():
+            if group_id is not None:
+                chat_id = group_id
+            else:
+                chat_id = self.chat_repo.next_id()
+
+            chat = Chat(name, chat_id)
+            chat.members = [owner_id] + members
+            self.chat_repo.add(chat)
+            return chat
 
     def leave_chat(self, user_id, chat_id):
-        chat = self.chat_repo.get(chat_id)
-        if chat:
-            if user_id in chat.members:
-                chat.members.remove(user_id)
-                self.chat_repo.update(chat_id, chat)
-                return chat
-            raise ValueError("User not in chat.")
-        raise KeyError("Chat not found.")
+        with self.chat_repo.transaction():
+            chat = self.chat_repo.get(chat_id)
+            if chat:
+                if user_id in chat.members:
+                    chat.members.remove(user_id)
+                    self.chat_repo.update(chat_id, chat)
+                    return chat
+                raise ValueError("User not in chat.")
+            raise KeyError("Chat not found.")
 
     def join_chat(self, user_id, chat_id):
-        chat = self.chat_repo.get(chat_id)
-        if chat:
-            if user_id not in chat.members:
-                chat.members.append(user_id)
-                self.chat_repo.update(chat_id, chat)
-                return chat
-            else:
-                raise ValueError("User is in chat.")
-        raise ValueError("Chat not found.")
+        with self.chat_repo.transaction():
+            chat = self.chat_repo.get(chat_id)
+            if chat:
+                if user_id not in chat.members:
+                    chat.members.append(user_id)
+                    self.chat_repo.update(chat_id, chat)
+                    return chat
+                else:
+                    raise ValueError("User is in chat.")
+            raise ValueError("Chat not found.")
 
     def create_DM(self, user_id, friend_id):
-        # Check if DM already exists (bidirectional check)
-        all_chats = self.chat_repo.find_all()
-        for chat in all_chats:
-            # Check if it's a DM between these two users (in either direction)
-            if (chat.name == f"DM_{user_id}_{friend_id}" or
-                chat.name == f"DM_{friend_id}_{user_id}"):
-                # DM already exists, return it
-                return chat
-
-        # Create new DM if it doesn't exist
-        chat_id = str(len(self.chat_repo.storage()) + 1)
-        chat_name = f"DM_{user_id}_{friend_id}"
-        chat = Chat(name=chat_name, chat_id=chat_id, members=[user_id, friend_id])
-        self.chat_repo.add(chat)
-        return chat
+        with self.chat_repo.transaction():
+            # Check if DM already exists (bidirectional check)
+            existing = self.chat_repo.find_dm(user_id, friend_id)
+            if existing is not None:
+                return existing
+
+            # Create new DM if it doesn't exist
+            chat_id = self.chat_repo.next_id()
+            chat_name = Chat.dm_name(user_id, friend_id)
+            chat = Chat(name=chat_name, chat_id=chat_id, members=[user_id, friend_id])
+            self.chat_repo.add(chat)
+            return chat
 
     def leave_DM(self, chat_id, user_id):
-        chat = self.chat_repo.get(chat_id)
-        if chat:
-            if user_id in chat.members:
-                chat.members.remove(user_id)
-                self.chat_repo.update(chat_id, chat)
-                return chat
-            raise ValueError("User not in chat.")
-        raise ValueError("Chat not found.")
+        with self.chat_repo.transaction():
+            chat = self.chat_repo.get(chat_id)
+            if chat:
+                if user_id in chat.members:
+                    chat.members.remove(user_id)
+                    self.chat_repo.update(chat_id, chat)
+                    return chat
+                raise ValueError("User not in chat.")
+            raise ValueError("Chat not found.")
 
     def send_message(self, user_id, chat_id, message, user_email=None):
-        chat = self.chat_repo.get(chat_id)
-        if chat:
-            if chat.messages is None:
-                chat.messages = []
-            # Use email if provided, otherwise fallback to user_id
-            sender = user_email if user_email else user_id
-            new_message = f"{sender}: {message}"
-            chat.messages.append(new_message)
-            self.chat_repo.update(chat_id, chat)
-            return chat
-        raise ValueError("Chat not found.")
+        """Append a message to a chat; returns the chat's summary (see Chat.to_summary)"""
+        # Use email if provided, otherwise fallback to user_id
+        sender = user_email if user_email else user_id
+        new_message = {
+            'sender_id': user_id,
+            'sender': sender,
+            'timestamp': datetime.now().isoformat(),
+            'body': message
+        }
+        with self.chat_repo.transaction():
+            # Stored on its own, without loading the chat's history
+            summary = self.chat_repo.append_message(chat_id, new_message)
+            if summary is None:
+                raise ValueError("Chat not found.")
+            new_message = summary['last_message']
+            if self.broker is not None:
+                self.broker.publish(self.topic(chat_id), new_message)
+            return summary
 
     def list_all_chats(self, user_id):
-        user_chats = {}
-        for chat in self.chat_repo.find_all():
-            if user_id in chat.members:
-                user_chats[chat.chat_id] = chat.to_dict()
-        return user_chats
+        return self.chat_repo.summaries_for_member(user_id)
+
+    def get_messages(self, chat_id, before=None, limit=50, after=None):
+        """Page of messages older than the before cursor (or newer than after), oldest first"""
+        messages = self.chat_repo.get_messages(chat_id, before=before, limit=limit, after=after)
+        if messages is None:
+            raise ValueError("Chat not found.")
+        return messages
 
     def get_chat(self, chat_id):
         chat = self.chat_repo.get(chat_id)
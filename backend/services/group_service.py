@@ -11,7 +11,7 @@ class GroupService:
 
     def __init__(self, group_repo):
         self.group_repo = group_repo
-        
+
     def create_group(self, name, owner_id, members=None, study_times=None, class_name=None):
         """Create a new group"""
         # Group constructor already adds owner to members, no need to do it again
@@ -21,37 +21,40 @@ class GroupService:
 
     def join_group(self, user_id, group_identifier):
         """Add a user to a group by ID or name"""
-        # Try to find by ID first, then by name
-        group = self.group_repo.get(group_identifier)
-        if not group:
-            raise ValueError("Group not found")
+        # Held across the read-modify-write so a concurrent change is not lost
+        with self.group_repo.transaction():
+            # Try to find by ID first, then by name
+            group = self.group_repo.get(group_identifier)
+            if not group:
+                raise ValueError("Group not found")
 
-        if user_id in group._members:
-            raise ValueError("User already in the group")
+            if user_id in group._members:
+                raise ValueError("User already in the group")
 
-        group.add_member(user_id)
-        self.group_repo.update(group.id, group)
-        return group
+            group.add_member(user_id)
+            self.group_repo.update(group.id, group)
+            return group
 
     def leave_group(self, user_id, group_identifier):
         """Remove a user from a group by ID or name"""
-        # Try to find by ID first, then by name
-        group = self.group_repo.get(group_identifier)
-        if not group:
-            raise ValueError("Group not found")
+        with self.group_repo.transaction():
+            # Try to find by ID first, then by name
+            group = self.group_repo.get(group_identifier)
+            if not group:
+                raise ValueError("Group not found")
 
-        if user_id not in group._members:
-            raise ValueError("User not in this group")
+            if user_id not in group._members:
+                raise ValueError("User not in this group")
 
-        group.remove_member(user_id)
+            group.remove_member(user_id)
 
-        # Clean up orphan groups - delete if no members remain
-        if len(group._members) == 0:
-            self.group_repo.remove(group.id)
-        else:
-            self.group_repo.update(group.id, group)
+            # Clean up orphan groups - delete if no members remain
+            if len(group._members) == 0:
+                self.group_repo.remove(group.id)
+            else:
+                self.group_repo.update(group.id, group)
 
-        return group
+            return group
 
     def list_all_groups(self):
         """List all groups"""
@@ -80,5 +83,9 @@ class GroupService:
         """Filter groups by specific study times"""
         return self.group_repo.filter_by(None, study_times=study_times)
 
+    def filter_groups(self, specified_class=None, study_times=None, match_all=True):
+        """Filter groups by class and study times combined with AND (match_all) or OR"""
+        return self.group_repo.filter_by(specified_class, study_times, match_all=match_all)
+
     def get_group(self, group_id):
         return self.group_repo.find_by_id(group_id)
\ No newline at end of file
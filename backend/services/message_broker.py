@@ -0,0 +1,108 @@
+"""
+In-process publish/subscribe for pushing new events to open streams
+
+Built by:
+"""
+
+import threading
+from collections import deque
+
+
+class BrokerFullError(RuntimeError):
+    """Raised by subscribe() when the broker already has max_subscribers listeners"""
+
+
+class Subscription:
+    """
+    A single listener's bounded queue.
+
+    Publishing never blocks. If the listener falls more than max_queue items
+    behind, its queue is dropped and the subscription is marked overflowed;
+    the stream should then end so the client reconnects from its last cursor.
+    """
+
+    def __init__(self, broker, topic, max_queue):
+        self._broker = broker
+        self.topic = topic
+        self._max_queue = max_queue
+        self._queue = deque()
+        self._ready = threading.Condition()
+        self.overflowed = False
+        self.closed = False
+
+    def put(self, item):
+        """Queue an item, returns False if the subscriber can no longer take it"""
+        with self._ready:
+            if self.closed or self.overflowed:
+                return False
+            if len(self._queue) >= self._max_queue:
+                self.overflowed = True
+                self._queue.clear()
+            else:
+                self._queue.append(item)
+            self._ready.notify()
+            return not self.overflowed
+
+    def get(self, timeout=None):
+        """Wait for queued items; returns an empty list on timeout, overflow or close"""
+        with self._ready:
+            if not self._queue and not (self.closed or self.overflowed):
+                self._ready.wait(timeout)
+            items = list(self._queue)
+            self._queue.clear()
+            return items
+
+    def close(self):
+        self._broker._unsubscribe(self)
+        with self._ready:
+            self.closed = True
+            self._queue.clear()
+            self._ready.notify_all()
+
+
+class MessageBroker:
+    """
+    Topic based broker; topics are plain strings such as 'chat:<chat_id>'.
+
+    Everything stays in this process: events published by another worker
+    never reach these subscribers. max_subscribers caps the open
+    subscriptions (0 for no cap), since each one is an open stream holding
+    a server thread.
+    """
+
+    def __init__(self, max_queue=100, max_subscribers=0):
+        self._max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self._topics = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, max_queue=None):
+        """New subscription to topic; raises BrokerFullError beyond max_subscribers"""
+        subscription = Subscription(self, topic, max_queue or self._max_queue)
+        with self._lock:
+            if self.max_subscribers and self._count >= self.max_subscribers:
+                raise BrokerFullError("Too many open streams, please try again shortly")
+            self._topics.setdefault(topic, set()).add(subscription)
+            self._count += 1
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._topics.get(subscription.topic)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            self._count -= 1
+            if not subscribers:
+                del self._topics[subscription.topic]
+
+    def publish(self, topic, item):
+        """Deliver an item to every subscriber of a topic, returns how many accepted it"""
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+        return sum(1 for subscription in subscribers if subscription.put(item))
+
+    def subscriber_count(self, topic):
+        with self._lock:
+            return len(self._topics.get(topic, ()))
@@ -7,16 +7,42 @@ Built by:
 from models.notification import Notification
 
 class NotificationService:
-    def __init__(self, repo):
+    def __init__(self, repo, broker=None):
         self.repo = repo
+        # Optional MessageBroker; new notifications are published to 'notifications:<user_id>'
+        self.broker = broker
+
+    @staticmethod
+    def topic(user_id):
+        return f"notifications:{user_id}"
+
+    def _publish(self, notification):
+        if self.broker is not None:
+            self.broker.publish(self.topic(notification.user_id), notification.to_dict())
 
     def send_notification(self, user_id, message):
         notification = Notification(user_id, message)
-        return self.repo.create(notification)
+        notification = self.repo.create(notification)
+        self._publish(notification)
+        return notification
+
+    def send_bulk(self, user_ids, message):
+        """Send the same message to many users with a single repository write"""
+        notifications = [Notification(user_id, message) for user_id in user_ids]
+        notifications = self.repo.create_many(notifications)
+        for notification in notifications:
+            self._publish(notification)
+        return notifications
 
     def get_notifications(self, user_id):
         return self.repo.find_by_user_id(user_id)
 
+    def get_notifications_page(self, user_id, after=None, limit=None):
+        return self.repo.find_by_user_id(user_id, after=after, limit=limit)
+
+    def get_unread_count(self, user_id):
+        return self.repo.count_unread(user_id)
+
     def mark_notifications_as_read(self, notif_id):
         return self.repo.mark_as_read(notif_id)
 
@@ -0,0 +1,101 @@
+"""
+Runs bcrypt hashing and verification in a pool of worker processes
+
+Built by:
+"""
+
+import multiprocessing
+import threading
+from models.user import DEFAULT_ROUNDS, hash_password, hash_rounds, check_password
+
+# The pool starts inside a request thread; forking a multi-threaded process can
+# leave the child stuck on a lock another thread held, so workers never fork it
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class HasherBusyError(RuntimeError):
+    """Raised instead of queueing when too many password operations are waiting"""
+
+
+class PasswordHasher:
+    """
+    Bounded bcrypt executor.
+
+    bcrypt is deliberately slow (~250 ms at cost 12), so running it on the
+    request thread lets a burst of logins pin every worker. Here it runs in a
+    fixed number of worker processes. At most workers + max_queue calls are
+    admitted; beyond that HasherBusyError is raised at once so the caller can
+    answer 503 instead of letting requests pile up. A call that gets no result
+    within timeout seconds raises HasherBusyError too, rather than holding the
+    request forever if a worker hangs.
+
+    Background work (rehashing on login) goes through hash_if_idle, which
+    only runs on a worker that is idle right now and never takes more than
+    background_limit workers (default half), so it cannot crowd out logins.
+
+    The pool is started on first use, so importing the app or building a
+    hasher spawns no processes. Its workers come from a fork server (or are
+    spawned), never forked from the threaded server process itself.
+    workers=0 hashes on the calling thread (tests, scripts).
+    """
+
+    def __init__(self, workers=0, max_queue=32, rounds=DEFAULT_ROUNDS, timeout=30, background_limit=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self.timeout = timeout
+        self.background_limit = max(1, workers // 2) if background_limit is None else background_limit
+        self._pending = 0
+        self._background = 0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _run(self, function, *args, background=False):
+        if not self.workers:
+            return function(*args)
+
+        with self._lock:
+            if background:
+                if self._pending >= self.workers or self._background >= self.background_limit:
+                    raise HasherBusyError("No idle worker for background hashing")
+            elif self._pending >= self.workers + self.max_queue:
+                raise HasherBusyError("Too many sign-in requests, please try again shortly")
+            if self._pool is None:
+                self._pool = multiprocessing.get_context(START_METHOD).Pool(self.workers)
+            pool = self._pool
+            self._pending += 1
+            self._background += background
+        try:
+            return pool.apply_async(function, args).get(self.timeout)
+        except multiprocessing.TimeoutError:
+            raise HasherBusyError("Sign-in is taking too long, please try again shortly")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._background -= background
+
+    @property
+    def pending(self):
+        """Operations running or waiting for a worker"""
+        return self._pending
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.rounds)
+
+    def hash_if_idle(self, password):
+        """hash() for background work; raises HasherBusyError at once unless a worker is idle"""
+        return self._run(hash_password, password, self.rounds, background=True)
+
+    def verify(self, password, password_hash):
+        return self._run(check_password, password, password_hash)
+
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash was made with a different cost than the target"""
+        return hash_rounds(password_hash) not in (None, self.rounds)
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
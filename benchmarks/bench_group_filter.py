@@ -0,0 +1,68 @@
+"""
+Benchmark for GroupRepository.filter_by over a large group set
+
+Builds 100k groups spread across course codes and study times and times
+class, time, AND and OR queries against the inverted indexes.
+
+Usage: python benchmarks/bench_group_filter.py [groups]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from repositories.group_repository import GroupRepository
+
+DEPARTMENTS = ["IT", "MAT", "BIO", "CHE", "PHY", "ENG", "HIS", "PSY", "ECO", "ACC"]
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def build_groups(path, n_groups):
+    rng = random.Random(326)
+    groups = {}
+    for i in range(n_groups):
+        gid = f"g{i}"
+        groups[gid] = {
+            'id': gid,
+            'name': f"Group {i}",
+            'owner_id': i,
+            'members': [i],
+            'study_times': [f"{rng.choice(DAYS)} {rng.randint(8, 20)}-{rng.randint(9, 22)}"],
+            'specified_class': f"{rng.choice(DEPARTMENTS)} {rng.randint(100, 399)}"
+        }
+    with open(path, 'w') as f:
+        json.dump(groups, f)
+
+
+def timed(label, fn, runs=200):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / runs
+    print(f"{label:<28} {elapsed * 1000:8.3f} ms  ({len(result)} groups)")
+
+
+def main():
+    n_groups = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'groups.json')
+        build_groups(path, n_groups)
+        repo = GroupRepository(path)
+
+        print(f"{n_groups} groups")
+        timed("class exact (IT 326)", lambda: repo.filter_by(specified_class="IT 326"))
+        timed("class partial (IT)", lambda: repo.filter_by(specified_class="IT"))
+        timed("class partial (326)", lambda: repo.filter_by(specified_class="326"))
+        timed("time (Mon 10-12)", lambda: repo.filter_by(study_times="Mon 10-12"))
+        timed("class AND time", lambda: repo.filter_by("IT 326", "Mon 10-12", match_all=True))
+        timed("class OR time", lambda: repo.filter_by("IT 326", "Mon 10-12", match_all=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark for /api/group/listall member email resolution
+
+Builds 10k users and 2k groups in a temporary data directory, then times
+the route against the old one-scan-per-member lookup.
+
+Usage: python benchmarks/bench_group_listall.py [users] [groups] [members]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+import app as app_module
+from repositories.user_repository import UserRepository
+from repositories.group_repository import GroupRepository
+from services.group_service import GroupService
+
+
+def build_data(directory, n_users, n_groups, n_members):
+    users = {str(i): {
+        'id': i,
+        'email': f"student{i}@school.edu",
+        '_password_hash': "x",
+        '_is_active': True
+    } for i in range(1, n_users + 1)}
+    with open(os.path.join(directory, 'users.json'), 'w') as f:
+        json.dump(users, f)
+
+    rng = random.Random(326)
+    groups = {}
+    for i in range(n_groups):
+        gid = f"g{i}"
+        groups[gid] = {
+            'id': gid,
+            'name': f"Group {i}",
+            'owner_id': rng.randint(1, n_users),
+            'members': rng.sample(range(1, n_users + 1), n_members),
+            'study_times': [],
+            'specified_class': "IT 326"
+        }
+    with open(os.path.join(directory, 'groups.json'), 'w') as f:
+        json.dump(groups, f)
+
+
+def legacy_convert(user_repo, user_ids):
+    """The previous implementation: a full scan of users per member"""
+    emails = []
+    for user_id in user_ids:
+        user = next((u for u in user_repo.find_all() if u.id == user_id), None)
+        emails.append(user.email if user else str(user_id))
+    return emails
+
+
+def main():
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_groups = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    n_members = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_data(directory, n_users, n_groups, n_members)
+        user_repo = UserRepository(os.path.join(directory, 'users.json'))
+        group_repo = GroupRepository(os.path.join(directory, 'groups.json'))
+        app_module.user_repo = user_repo
+        app_module.group_service = GroupService(group_repo)
+        client = app_module.app.test_client()
+
+        print(f"{n_users} users, {n_groups} groups, {n_members} members per group")
+
+        runs = 5
+        start = time.perf_counter()
+        for _ in range(runs):
+            response = client.get('/api/group/listall')
+        elapsed = (time.perf_counter() - start) / runs
+        assert len(response.get_json()['groups']) == n_groups
+        print(f"/api/group/listall (bulk):      {elapsed * 1000:9.2f} ms")
+
+        start = time.perf_counter()
+        for group in group_repo.find_all():
+            legacy_convert(user_repo, group.members)
+        elapsed = time.perf_counter() - start
+        print(f"per-member scan (resolve only): {elapsed * 1000:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for peak memory while loading large chat and notification files
+
+Writes the files in a temporary directory, then loads each one into its
+repository in a fresh process: once by parsing the whole file with read_json
+first (how the repositories used to load) and once with the streaming loader.
+Prints load time, peak RSS and the RSS left once loading is done, all above
+the RSS of a process that loaded nothing.
+
+Usage: python benchmarks/bench_load_memory.py [notifications]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from repositories import chat_repository, notification_repository
+from repositories.json_store import read_json, write_json
+
+
+def status_mb(field):
+    # VmHWM is the peak RSS; unlike ru_maxrss it does not carry over from the parent (Linux only)
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) / 1024
+
+
+def read_whole(path, build):
+    """The previous loader: parse the whole file, then build the models"""
+    return [build(key, record) for key, record in read_json(path).items()]
+
+
+def load(kind, mode, path):
+    if mode == 'none':
+        return None
+    if mode == 'whole':
+        notification_repository.read_records = read_whole
+        chat_repository.read_records = read_whole
+    if kind == 'notifications':
+        return notification_repository.NotificationRepository(path)
+    return chat_repository.ChatRepository(path)
+
+
+def child(kind, mode, path):
+    start = time.perf_counter()
+    loaded = load(kind, mode, path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'seconds': elapsed, 'peak': status_mb('VmHWM'), 'rss': status_mb('VmRSS')}))
+    return loaded
+
+
+def measure(kind, mode, path):
+    output = subprocess.run([sys.executable, __file__, '--child', kind, mode, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def build_files(directory, n):
+    notifications = os.path.join(directory, 'notifications.json')
+    write_json(notifications, {
+        str(i): {'id': i, 'user_id': i % 5000 + 1, 'message': f"New message in Study Group {i % 700}",
+                 'read': i % 3 == 0, 'created_at': None}
+        for i in range(1, n + 1)
+    })
+    chats = os.path.join(directory, 'chat.json')
+    write_json(chats, {
+        str(i): {'name': f"Chat {i}", 'chat_id': str(i), 'members': [i, i + 1],
+                 'messages': [{'id': m + 1, 'sender_id': i, 'sender': f"user{i}@university.edu",
+                               'timestamp': "2025-03-01T12:00:00", 'body': f"message {m}"}
+                              for m in range(50)]}
+        for i in range(1, n // 50 + 1)
+    })
+    return {'notifications': notifications, 'chats': chats}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = build_files(directory, n)
+        for kind, path in files.items():
+            size = os.path.getsize(path) / (1024 * 1024)
+            baseline = measure(kind, 'none', path)
+            print(f"{kind} ({size:.1f} MB file)")
+            for mode, label in (('whole', 'read_json'), ('stream', 'streaming')):
+                result = measure(kind, mode, path)
+                print(f"  {label:<10} load {result['seconds'] * 1000:8.1f} ms  "
+                      f"peak {result['peak'] - baseline['peak']:8.1f} MB  "
+                      f"after load {result['rss'] - baseline['rss']:8.1f} MB")
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        child(*sys.argv[2:5])
+    else:
+        main()
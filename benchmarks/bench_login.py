@@ -0,0 +1,78 @@
+"""
+Benchmark for login throughput under a burst of concurrent requests
+
+Runs AuthService.login from many threads at once, first with bcrypt on the
+calling threads and then through the PasswordHasher process pool, and
+prints logins per second plus how many requests were shed with 503.
+
+Usage: python benchmarks/bench_login.py [clients] [logins per client] [bcrypt rounds]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from models.user import User, hash_password
+from repositories.user_repository import UserRepository
+from services.auth_service import AuthService
+from services.password_hasher import PasswordHasher, HasherBusyError
+
+PASSWORD = "SecurePass123!"
+
+
+def run(label, auth_service, clients, per_client):
+    shed = []
+    barrier = threading.Barrier(clients)
+
+    def client(index):
+        barrier.wait()
+        for _ in range(per_client):
+            try:
+                auth_service.login(f"user{index}@university.edu", PASSWORD)
+            except HasherBusyError:
+                shed.append(index)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    served = clients * per_client - len(shed)
+    print(f"{label:<32} {served / elapsed:8.1f} logins/s  ({served} served, {len(shed)} shed, {elapsed:.2f} s)")
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    workers = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = UserRepository(os.path.join(directory, 'users.json'), flush_interval=60)
+        password_hash = hash_password(PASSWORD, rounds)
+        for i in range(clients):
+            repo.create(User(f"user{i}@university.edu", password_hash=password_hash))
+
+        print(f"{clients} clients x {per_client} logins, bcrypt cost {rounds}, {workers} CPUs")
+        run("request threads", AuthService(repo, password_hasher=PasswordHasher(rounds=rounds)),
+            clients, per_client)
+
+        pooled = PasswordHasher(workers=workers, max_queue=clients, rounds=rounds)
+        run(f"process pool ({workers} workers)", AuthService(repo, password_hasher=pooled),
+            clients, per_client)
+        pooled.close()
+
+        shedding = PasswordHasher(workers=workers, max_queue=0, rounds=rounds)
+        run("process pool, no queue", AuthService(repo, password_hasher=shedding), clients, per_client)
+        shedding.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark for the memory taken by each model instance
+
+Builds many instances of each hot model and reports bytes per entity as
+measured by tracemalloc, for the slotted models and for dict-backed copies
+of the same classes (identical methods, no __slots__), which is how the
+models were stored before. Nested values such as message lists and the
+created_at datetime are counted too, the same for both.
+
+Usage: python benchmarks/bench_model_memory.py [entities]
+"""
+
+import os
+import sys
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from models.user import User
+from models.friend import Friend
+from models.notification import Notification
+from models.group import Group
+from models.profile import Profile
+from models.study_scheduler import StudyScheduler
+from models.chat import Chat
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+CREATED_AT = datetime(2025, 3, 1, 12, 0)
+
+SAMPLES = {
+    Notification: lambda i: Notification(i % 5000, f"New message in Study Group {i % 700}", id=i),
+    Friend: lambda i: Friend(i, i + 1, id=f"f{i}", created_at=CREATED_AT),
+    User: lambda i: User(f"user{i}@university.edu", password_hash=PASSWORD_HASH, id=i, created_at=CREATED_AT),
+    Group: lambda i: Group(f"Group {i}", i, members=[i + 1], study_times=["Mon 10-12"],
+                           specified_class="IT 326", id=f"g{i}", created_at=CREATED_AT),
+    Profile: lambda i: Profile(i, name=f"Student {i}", major="IT", id=i, created_at=CREATED_AT),
+    StudyScheduler: lambda i: StudyScheduler(i, "Exam prep", "2025-03-01T10:00", "2025-03-01T12:00", id=i),
+    Chat: lambda i: Chat(f"Chat {i}", chat_id=str(i), members=[i, i + 1]),
+}
+
+
+_copies = {}
+
+
+def dict_backed(cls):
+    """Copy of a model class (and its model bases) without __slots__"""
+    if cls in _copies or not cls.__module__.startswith('models.'):
+        return _copies.get(cls, cls)
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in ('__slots__', '__dict__', '__weakref__')
+                 and name not in getattr(cls, '__slots__', ())}
+    bases = tuple(dict_backed(base) for base in cls.__bases__)
+    _copies[cls] = type(cls)(cls.__name__, bases, namespace)
+    return _copies[cls]
+
+
+def bytes_per_entity(make, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [make(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding them costs 8 bytes per entity either way
+    return (after - before) / len(entities) - 8
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{'model':<16} {'dict':>8} {'slots':>8}   bytes per entity, {n} entities")
+
+    for cls, sample in SAMPLES.items():
+        plain = dict_backed(cls)
+        make_plain = lambda i, sample=sample, cls=cls, plain=plain: _as(plain, sample(i), cls)
+        slotted = bytes_per_entity(sample, n)
+        before = bytes_per_entity(make_plain, n)
+        print(f"{cls.__name__:<16} {before:8.0f} {slotted:8.0f}   {(1 - slotted / before) * 100:5.1f}% smaller")
+
+
+def _as(plain, entity, cls):
+    """
+    entity's attributes moved onto an instance of the dict-backed class. The
+    constructors use super(), which only accepts the original class, so the
+    slotted instance is built first and dropped.
+    """
+    copy = object.__new__(plain)
+    for klass in cls.__mro__:
+        for name in getattr(klass, '__slots__', ()):
+            if hasattr(entity, name):
+                setattr(copy, name, getattr(entity, name))
+    return copy
+
+
+if __name__ == '__main__':
+    main()
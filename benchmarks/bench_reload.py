@@ -0,0 +1,97 @@
+"""
+Benchmark for catching up with another worker's change to shared storage
+
+Two repositories share one data file (SHARED_STORAGE). Each round the first
+changes one entity and the second then makes its own change, so it has to
+reload before saving. Times the second one's reload and save: the old full
+reload (every entity rebuilt and re-indexed, then every entity serialized
+again on save) against the incremental reload, which rebuilds only the
+entity that changed and keeps the rest serialized.
+
+Usage: python benchmarks/bench_reload.py [entities]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from repositories.json_repository import JsonRepository
+from repositories.notification_repository import NotificationRepository
+from repositories.group_repository import GroupRepository
+from models.notification import Notification
+from models.group import Group
+
+ROUNDS = 5
+
+
+def timed(round_):
+    total = 0
+    for _ in range(ROUNDS):
+        total += round_()
+    return total / ROUNDS * 1000
+
+
+def report(label, full, incremental):
+    print(f"{label:<22} full reload {full:8.1f} ms   incremental {incremental:8.1f} ms   "
+          f"{full / incremental:5.1f}x")
+
+
+def compare(label, first, second, change_first, change_second):
+    def round_():
+        change_first()
+        start = time.perf_counter()
+        change_second()
+        return time.perf_counter() - start
+
+    with patch.object(JsonRepository, '_changed_records', return_value=None):
+        full = timed(round_)
+    report(label, full, timed(round_))
+
+
+def bench_notifications(directory, n):
+    path = os.path.join(directory, 'notifications.json')
+    NotificationRepository(path).create_many(
+        [Notification(i % 5000 + 1, f"New message in Study Group {i % 700}") for i in range(n)])
+    first = NotificationRepository(path, shared=True)
+    second = NotificationRepository(path, shared=True)
+    ids = iter(range(1, n + 1))
+    compare("notifications", first, second,
+            lambda: first.mark_as_read(next(ids)), lambda: second.mark_as_read(next(ids)))
+
+
+def bench_groups(directory, n, shards=0):
+    path = os.path.join(directory, f'groups-{shards}.json')
+    seed = GroupRepository(path, flush_interval=3600, shards=shards)
+    for i in range(n):
+        seed.create(Group(f"Group {i}", owner_id=i, members=[i + 1, i + 2], study_times=["Mon 10-12"],
+                          specified_class="IT 326"))
+    seed.flush()
+    first = GroupRepository(path, shared=True, shards=shards)
+    second = GroupRepository(path, shared=True, shards=shards)
+    groups = iter(first.find_all())
+
+    def change(repo):
+        group = repo.get(next(groups).id)
+        group.add_member(n + len(group.members))
+        repo.update(group.id, group)
+
+    label = f"groups ({shards} shards)" if shards else "groups"
+    compare(label, first, second, lambda: change(first), lambda: change(second))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{n} entities, one changed per worker, mean of {ROUNDS} rounds")
+
+    with tempfile.TemporaryDirectory() as directory:
+        bench_notifications(directory, n)
+        bench_groups(directory, n)
+        bench_groups(directory, n, shards=16)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark for saving a large repository after a single change
+
+Fills notification and group repositories with 100k entities, then times a
+save after changing one of them: the old way (every entity serialized and
+encoded again) against the repositories' snapshot cache, which only
+re-encodes the entity that changed.
+
+Usage: python benchmarks/bench_save.py [entities]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from repositories.json_store import write_json
+from repositories.notification_repository import NotificationRepository
+from repositories.group_repository import GroupRepository
+from models.notification import Notification
+from models.group import Group
+
+ROUNDS = 5
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def report(label, full, cached):
+    print(f"{label:<14} full rewrite {full:8.1f} ms   cached {cached:8.1f} ms   {full / cached:5.1f}x")
+
+
+def bench_notifications(directory, n):
+    repo = NotificationRepository(os.path.join(directory, 'notifications.json'), flush_interval=3600)
+    repo.create_many([Notification(i % 5000 + 1, f"New message in Study Group {i % 700}") for i in range(n)])
+    repo.flush()
+    target = repo.find_all()[n // 2]
+
+    def full():
+        write_json(repo._json_file, {str(nid): repo._serialize(notif) for nid, notif in repo._storage.items()})
+
+    def cached():
+        repo.mark_as_read(target.id)
+        repo.flush()
+
+    report("notifications", timed(full), timed(cached))
+
+
+def bench_groups(directory, n):
+    repo = GroupRepository(os.path.join(directory, 'groups.json'), flush_interval=3600)
+    for i in range(n):
+        repo.create(Group(f"Group {i}", owner_id=i, members=[i + 1, i + 2], study_times=["Mon 10-12"],
+                          specified_class="IT 326"))
+    repo.flush()
+    target = repo.find_all()[n // 2]
+
+    def full():
+        write_json(repo.filepath, {gid: group.to_dict() for gid, group in repo._storage.items()})
+
+    def cached():
+        target.add_member(len(target.members) + n)
+        repo.update(target.id, target)
+        repo.flush()
+
+    report("groups", timed(full), timed(cached))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{n} entities, one changed per save, mean of {ROUNDS} saves")
+
+    with tempfile.TemporaryDirectory() as directory:
+        bench_notifications(directory, n)
+        bench_groups(directory, n)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark for the JSON and compact snapshot formats
+
+Writes the same notifications and chats in both formats and compares file
+size, save time and the time for a repository to load the file.
+
+Usage: python benchmarks/bench_snapshot_format.py [notifications]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from repositories.json_store import write_json
+from repositories.notification_repository import NotificationRepository
+from repositories.chat_repository import ChatRepository
+
+
+def notifications(n):
+    return {
+        str(i): {'id': i, 'user_id': i % 5000 + 1, 'message': f"New message in Study Group {i % 700}",
+                 'read': i % 3 == 0, 'created_at': None}
+        for i in range(1, n + 1)
+    }
+
+
+def chats(n):
+    return {
+        str(i): {'name': f"Chat {i}", 'chat_id': str(i), 'members': [i, i + 1],
+                 'messages': [{'id': m + 1, 'sender_id': i, 'sender': f"user{i}@university.edu",
+                               'timestamp': "2025-03-01T12:00:00", 'body': f"message {m}"}
+                              for m in range(50)]}
+        for i in range(1, n + 1)
+    }
+
+
+def compare(label, data, load):
+    with tempfile.TemporaryDirectory() as directory:
+        for snapshot_format in ('json', 'compact'):
+            path = os.path.join(directory, f"{snapshot_format}.json")
+            start = time.perf_counter()
+            write_json(path, data, snapshot_format=snapshot_format)
+            saved = time.perf_counter() - start
+
+            start = time.perf_counter()
+            load(path)
+            loaded = time.perf_counter() - start
+
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{label:<14} {snapshot_format:<8} {size:8.2f} MB  save {saved * 1000:8.1f} ms  "
+                  f"load {loaded * 1000:8.1f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    compare("notifications", notifications(n), NotificationRepository)
+    compare("chats", chats(n // 50), lambda path: ChatRepository(path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark for application startup with large JSON data files
+
+Builds users, groups, chats and notifications in a temporary directory and
+times constructing all eight repositories the way app.py does, eagerly and
+with lazy=True, plus the first login-style lookup that loads users.json.
+
+Usage: python benchmarks/bench_startup.py [users]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend')))
+
+from repositories.user_repository import UserRepository
+from repositories.group_repository import GroupRepository
+from repositories.friend_repository import FriendRepository
+from repositories.notification_repository import NotificationRepository
+from repositories.study_scheduler_repository import StudySchedulerRepository
+from repositories.chat_repository import ChatRepository
+from repositories.profile_repository import ProfileRepository
+from repositories.password_reset_token_repository import PasswordResetTokenRepository
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+
+
+def write(directory, name, data):
+    with open(os.path.join(directory, name), 'w') as f:
+        json.dump(data, f)
+
+
+def build_data(directory, n_users):
+    write(directory, 'users.json', {
+        str(i): {'id': i, 'email': f"user{i}@university.edu", '_password_hash': PASSWORD_HASH,
+                 '_is_active': True}
+        for i in range(1, n_users + 1)
+    })
+    write(directory, 'groups.json', {
+        f"g{i}": {'id': f"g{i}", 'name': f"Group {i}", 'owner_id': i, 'members': [i, i + 1],
+                  'study_times': ["Mon 10-12"], 'specified_class': "IT 326"}
+        for i in range(n_users // 5)
+    })
+    write(directory, 'chat.json', {
+        str(i): {'name': f"Chat {i}", 'chat_id': str(i), 'members': [i, i + 1],
+                 'messages': [f"user{i}@university.edu: message {m}" for m in range(50)]}
+        for i in range(1, n_users // 5 + 1)
+    })
+    write(directory, 'notifications.json', {
+        str(i): {'id': i, 'user_id': i % n_users + 1, 'message': f"Notification {i}", 'read': False,
+                 'created_at': None}
+        for i in range(1, n_users * 5 + 1)
+    })
+
+
+def construct(directory, lazy):
+    path = lambda name: os.path.join(directory, name)
+    return {
+        'users': UserRepository(path('users.json'), lazy=lazy),
+        'tokens': PasswordResetTokenRepository(path('password_reset_tokens.json'), lazy=lazy),
+        'groups': GroupRepository(path('groups.json'), lazy=lazy),
+        'profiles': ProfileRepository(path('profiles.json'), lazy=lazy),
+        'friends': FriendRepository(path('friends.json'), lazy=lazy),
+        'notifications': NotificationRepository(path('notifications.json'), lazy=lazy),
+        'schedules': StudySchedulerRepository(path('schedule.json'), lazy=lazy),
+        'chats': ChatRepository(path('chat.json'), journal=True, lazy=lazy),
+    }
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<32} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_data(directory, n_users)
+        print(f"{n_users} users, {n_users // 5} groups, {n_users // 5} chats x 50 messages, "
+              f"{n_users * 5} notifications")
+
+        timed("eager startup", lambda: construct(directory, lazy=False))
+        repos = timed("lazy startup", lambda: construct(directory, lazy=True))
+        timed("lazy first login lookup", lambda: repos['users'].find_by_email("user1@university.edu"))
+        timed("lazy first chat list", lambda: repos['chats'].find_all())
+
+
+if __name__ == '__main__':
+    main()
@@ -44,6 +44,90 @@ async function loadAllChats() {
 const createBtn = document.getElementById("createChatBtn");
 const chatNameInput = document.getElementById("newChat")
 
+function renderMessage(msg) {
+    const p = document.createElement("p");
+    p.dataset.id = msg.id;
+    p.textContent = `${msg.sender}: ${msg.body}`;
+    return p;
+}
+
+let chatStream = null;
+let lastMessageId = 0;
+//Ids already on screen; a sent message comes back from /api/chat/send and may
+//also arrive through the stream
+let shownMessageIds = new Set();
+
+//Adds a message once, in id order, below the history already shown
+function showMessage(msg) {
+    if (shownMessageIds.has(msg.id)) return;
+    shownMessageIds.add(msg.id);
+    lastMessageId = Math.max(lastMessageId, msg.id);
+
+    const placeholder = document.getElementById("noMessages");
+    if (placeholder) placeholder.remove();
+    const messagesDiv = document.getElementById("chatMessages");
+    const later = Array.from(messagesDiv.querySelectorAll("p[data-id]"))
+        .find(p => Number(p.dataset.id) > msg.id);
+    messagesDiv.insertBefore(renderMessage(msg), later || null);
+    messagesDiv.scrollTop = messagesDiv.scrollHeight;
+}
+
+//Loads one page of history; older pages are prepended above the current ones
+async function loadChatMessages(chatId, before) {
+    const params = new URLSearchParams({ limit: 50 });
+    if (before) params.set("before", before);
+
+    const res = await fetch(`/api/chat/${encodeURIComponent(chatId)}/messages?${params}`);
+    if (!res.ok) return;
+
+    const data = await res.json();
+    const messagesDiv = document.getElementById("chatMessages");
+
+    const oldButton = document.getElementById("loadOlderMessagesBtn");
+    if (oldButton) oldButton.remove();
+
+    if (!before) {
+        lastMessageId = data.messages.length ? data.messages[data.messages.length - 1].id : 0;
+        shownMessageIds = new Set();
+        openChatStream(chatId);
+    }
+
+    if (!before && data.messages.length === 0) {
+        messagesDiv.innerHTML = "<p id=\"noMessages\">No messages yet.</p>";
+        return;
+    }
+
+    const page = document.createDocumentFragment();
+    if (data.before) {
+        const older = document.createElement("button");
+        older.id = "loadOlderMessagesBtn";
+        older.textContent = "Load older messages";
+        older.onclick = () => loadChatMessages(chatId, data.before);
+        page.appendChild(older);
+    }
+    data.messages.forEach(msg => {
+        shownMessageIds.add(msg.id);
+        page.appendChild(renderMessage(msg));
+    });
+    messagesDiv.prepend(page);
+}
+
+//Pushes new messages into the open popup; the browser reconnects on its own
+//and resumes from the last event id it saw. The stream only carries messages
+//sent through the same server process (see message_broker in app.py)
+function openChatStream(chatId) {
+    closeChatStream();
+    chatStream = new EventSource(`/api/chat/${encodeURIComponent(chatId)}/stream?since=${lastMessageId}`);
+    chatStream.onmessage = (event) => showMessage(JSON.parse(event.data));
+}
+
+function closeChatStream() {
+    if (chatStream) {
+        chatStream.close();
+        chatStream = null;
+    }
+}
+
 //for the chat popup
 function openChatPopup(chat) {
 
@@ -53,16 +137,7 @@ function openChatPopup(chat) {
 
     const messagesDiv = document.getElementById("chatMessages");
     messagesDiv.innerHTML = "";
-
-    if (chat.messages && chat.messages.length > 0) {
-        chat.messages.forEach(msg => {
-            const p = document.createElement("p");
-            p.textContent = msg;
-            messagesDiv.appendChild(p);
-        });
-    } else {
-        messagesDiv.innerHTML = "<p>No messages yet.</p>";
-    }
+    loadChatMessages(chat.chat_id, null);
 
     document.getElementById("sendChatMessageBtn").onclick = async () => {
         const messageInput = document.getElementById("chatMessageInput");
@@ -81,11 +156,13 @@ function openChatPopup(chat) {
             return;
         }
 
+        //Shown right away; the stream may be served by another process
+        showMessage(result.sent);
         messageInput.value = "";
-        loadAllChats();
-        openChatPopup(result.study);
     };
     document.getElementById("closeChatPopupBtn").onclick = () => {
+        closeChatStream();
+        loadAllChats();
         document.getElementById("chatPopup").style.display = "none";
     };
 
@@ -10,7 +10,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 <li><a href="index.html">Home</a></li>
                 <li><a href="groups.html">Groups</a></li>
                 <li><a href="chat.html">Chats</a></li>
-                <li><a href="notifications.html">Notifications</a></li>
+                <li><a href="notifications.html">Notifications <span id="notificationBadge"></span></a></li>
                 <li><a href="friends_list.html">Friends List</a></li>
                 <li><a href="logout.html">Logout</a></li>
             </ul>
@@ -22,5 +22,34 @@ document.addEventListener('DOMContentLoaded', function() {
     const headerPlaceholder = document.getElementById('header-placeholder');
     if (headerPlaceholder) {
         headerPlaceholder.innerHTML = headerHTML;
+        loadUnreadBadge();
+        // Each open stream holds a server thread, so only pages that ask for live counts open one
+        if (headerPlaceholder.hasAttribute('data-live-notifications')) watchNotifications();
     }
-})
\ No newline at end of file
+})
+
+// Only the unread counter is fetched here, not the notification history.
+// Also called after notifications are marked read or deleted.
+async function loadUnreadBadge() {
+    try {
+        const res = await fetch("/api/notifications/unread_count");
+        if (!res.ok) return;
+        const data = await res.json();
+        const badge = document.getElementById("notificationBadge");
+        if (badge && data.success) {
+            badge.textContent = data.unread > 0 ? `(${data.unread})` : "";
+        }
+    } catch (err) {
+        console.error(err);
+    }
+}
+
+// New notifications are pushed by the server; the count itself is always re-fetched,
+// since the stream only carries notifications created in the same server process
+// and misses whatever happened while it was disconnected
+function watchNotifications() {
+    const stream = new EventSource("/api/notifications/stream");
+    stream.onopen = () => loadUnreadBadge();
+    stream.onmessage = () => loadUnreadBadge();
+    window.addEventListener("pagehide", () => stream.close());
+}
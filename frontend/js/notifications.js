@@ -73,6 +73,7 @@ async function markAsRead(notificationID, isRead, liElement){
         const data = await res.json();
         if(!data.success) return;
         liElement.querySelector('span').style.textDecoration = isRead ? 'line-through': 'none';
+        loadUnreadBadge();
     }
     catch(err){
         console.error(err);
@@ -90,6 +91,7 @@ async function deleteNotification(notificationID, li){
         const data = await res.json();
         if(!data.success) return;
         li.remove();
+        loadUnreadBadge();
 
     }
     catch(err){
@@ -0,0 +1 @@
+# Repository tests package initialization
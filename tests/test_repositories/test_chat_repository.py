@@ -0,0 +1,214 @@
+"""
+Unit tests for ChatRepository
+
+Covers snapshot persistence and the append-only journal mode.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.chat_repository import ChatRepository
+from models.chat import Chat
+
+
+class TestChatRepository(unittest.TestCase):
+    """Test suite for ChatRepository"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'chat.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _log_lines(self):
+        with open(self.path + '.log') as f:
+            return f.readlines()
+
+    def test_snapshot_mode_round_trip(self):
+        """Test default mode writes the snapshot and reloads it"""
+        repo = ChatRepository(self.path)
+        repo.add(Chat("Study", "1", members=[1, 2]))
+
+        reloaded = ChatRepository(self.path)
+
+        self.assertEqual(reloaded.get("1").members, [1, 2])
+        self.assertFalse(os.path.exists(self.path + '.log'))
+
+    def test_journal_message_is_single_append_record(self):
+        """Test a new message appends one record without touching the snapshot"""
+        repo = ChatRepository(self.path, journal=True)
+        repo.add(Chat("Study", "1", members=[1, 2]))
+
+        chat = repo.get("1")
+        chat.messages.append("a@x.edu: hi")
+        repo.update("1", chat)
+
+        lines = self._log_lines()
+        self.assertEqual(len(lines), 2)
+        record = json.loads(lines[1])
+        self.assertEqual(record['op'], 'append')
+        self.assertEqual(record['messages'], ["a@x.edu: hi"])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_journal_replayed_on_load(self):
+        """Test journal records are replayed over the snapshot"""
+        repo = ChatRepository(self.path, journal=True)
+        repo.add(Chat("Study", "1", members=[1]))
+        chat = repo.get("1")
+        chat.members.append(2)
+        repo.update("1", chat)
+        chat.messages.append("a@x.edu: one")
+        chat.messages.append("b@x.edu: two")
+        repo.update("1", chat)
+
+        reloaded = ChatRepository(self.path, journal=True)
+
+        self.assertEqual(reloaded.get("1").members, [1, 2])
+        messages = reloaded.get("1").messages
+        self.assertEqual([m['body'] for m in messages], ["one", "two"])
+        self.assertEqual([m['id'] for m in messages], [1, 2])
+
+    def test_compaction_rebuilds_snapshot(self):
+        """Test reaching compact_every folds the journal into the snapshot"""
+        repo = ChatRepository(self.path, journal=True, compact_every=3)
+        repo.add(Chat("Study", "1", members=[1]))
+        chat = repo.get("1")
+        for i in range(2):
+            chat.messages.append(f"a@x.edu: {i}")
+            repo.update("1", chat)
+
+        self.assertFalse(os.path.exists(self.path + '.log'))
+        with open(self.path) as f:
+            self.assertEqual(len(json.load(f)["1"]["messages"]), 2)
+
+    def test_replay_after_compaction_is_idempotent(self):
+        """Test a stale journal left behind by a crashed compaction does not duplicate messages"""
+        repo = ChatRepository(self.path, journal=True)
+        repo.add(Chat("Study", "1", members=[1]))
+        chat = repo.get("1")
+        chat.messages.append("a@x.edu: hi")
+        repo.update("1", chat)
+        with open(self.path + '.log') as f:
+            stale = f.read()
+        repo.compact()
+        with open(self.path + '.log', 'w') as f:
+            f.write(stale)
+
+        reloaded = ChatRepository(self.path, journal=True)
+
+        self.assertEqual([m['body'] for m in reloaded.get("1").messages], ["hi"])
+
+    def test_torn_final_record_is_ignored(self):
+        """Test a partially written last line does not break loading"""
+        repo = ChatRepository(self.path, journal=True)
+        repo.add(Chat("Study", "1", members=[1]))
+        with open(self.path + '.log', 'a') as f:
+            f.write('{"op": "append", "chat_')
+
+        reloaded = ChatRepository(self.path, journal=True)
+
+        self.assertEqual(reloaded.get("1").name, "Study")
+
+    def test_append_after_torn_record_is_kept(self):
+        """Test a message sent after a crash left a torn line survives the next reload"""
+        repo = ChatRepository(self.path, journal=True)
+        repo.add(Chat("Study", "1", members=[1]))
+        with open(self.path + '.log', 'a') as f:
+            f.write('{"op": "append", "chat_')
+
+        reopened = ChatRepository(self.path, journal=True)
+        chat = reopened.get("1")
+        chat.messages.append("a@x.edu: after the crash")
+        reopened.update("1", chat)
+        chat.messages.append("a@x.edu: and another")
+        reopened.update("1", chat)
+
+        reloaded = ChatRepository(self.path, journal=True)
+
+        self.assertEqual([m['body'] for m in reloaded.get("1").messages], ["after the crash", "and another"])
+        self.assertEqual(len(self._log_lines()), 3)
+
+    def test_leftover_journal_folded_when_journal_disabled(self):
+        """Test opening without journal mode compacts an existing journal"""
+        repo = ChatRepository(self.path, journal=True)
+        repo.add(Chat("Study", "1", members=[1]))
+
+        reloaded = ChatRepository(self.path)
+
+        self.assertEqual(reloaded.get("1").name, "Study")
+        self.assertFalse(os.path.exists(self.path + '.log'))
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_legacy_string_messages_are_structured(self):
+        """Test "sender: text" messages from older files load as message dicts"""
+        with open(self.path, 'w') as f:
+            json.dump({"1": {"name": "Study", "chat_id": "1", "members": [1],
+                             "messages": ["a@x.edu: hi: there"]}}, f)
+
+        message = ChatRepository(self.path).get("1").messages[0]
+
+        self.assertEqual(message['id'], 1)
+        self.assertEqual(message['sender'], "a@x.edu")
+        self.assertEqual(message['body'], "hi: there")
+
+    def test_get_messages_pages_backwards(self):
+        """Test paging with the before cursor walks from newest to oldest"""
+        repo = ChatRepository(self.path)
+        repo.add(Chat("Study", "1", members=[1], messages=[f"a@x.edu: {i}" for i in range(5)]))
+
+        newest = repo.get_messages("1", limit=2)
+        older = repo.get_messages("1", before=newest[0]['id'], limit=2)
+        oldest = repo.get_messages("1", before=older[0]['id'], limit=2)
+
+        self.assertEqual([m['body'] for m in newest], ["3", "4"])
+        self.assertEqual([m['body'] for m in older], ["1", "2"])
+        self.assertEqual([m['body'] for m in oldest], ["0"])
+        self.assertIsNone(repo.get_messages("missing"))
+
+    def test_get_messages_after_cursor(self):
+        """Test the after cursor returns newer messages oldest first"""
+        repo = ChatRepository(self.path)
+        repo.add(Chat("Study", "1", members=[1], messages=[f"a@x.edu: {i}" for i in range(5)]))
+
+        self.assertEqual([m['id'] for m in repo.get_messages("1", after=2, limit=2)], [3, 4])
+        self.assertEqual(repo.get_messages("1", after=5), [])
+
+    def test_find_dm_either_order(self):
+        """Test a DM is found from both users and after a reload"""
+        repo = ChatRepository(self.path, journal=True)
+        repo.add(Chat("Study", "1", members=[1, 2]))
+        repo.add(Chat(Chat.dm_name(1, 2), "2", members=[1, 2]))
+
+        self.assertEqual(repo.find_dm(1, 2).chat_id, "2")
+        self.assertEqual(repo.find_dm(2, 1).chat_id, "2")
+        self.assertIsNone(repo.find_dm(1, 3))
+        self.assertEqual(ChatRepository(self.path, journal=True).find_dm(2, 1).chat_id, "2")
+
+    def test_create_rejects_existing_id(self):
+        """Test adding a chat under a taken id raises instead of replacing it"""
+        repo = ChatRepository(self.path)
+        repo.add(Chat("Study", "1", members=[1]))
+
+        with self.assertRaises(ValueError):
+            repo.add(Chat("Other", "1", members=[2]))
+        self.assertEqual(ChatRepository(self.path).get("1").name, "Study")
+
+    def test_next_id_never_reuses_ids(self):
+        """Test ids continue after the highest numeric id, not the chat count"""
+        repo = ChatRepository(self.path)
+        repo.add(Chat("Old", "7", members=[1]))
+        repo.add(Chat("Group", "a1b2", members=[1]))
+
+        self.assertEqual(repo.next_id(), "8")
+        self.assertEqual(ChatRepository(self.path).next_id(), "8")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Concurrency stress tests for the JSON repositories
+
+Many threads hit the same repository at once; ids must stay unique and no
+update may be lost.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.rw_lock import ReadWriteLock
+from repositories.user_repository import UserRepository
+from repositories.notification_repository import NotificationRepository
+from repositories.group_repository import GroupRepository
+from repositories.chat_repository import ChatRepository
+from services.chat_service import ChatService
+from models.user import User
+from models.notification import Notification
+from models.group import Group
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+THREADS = 8
+PER_THREAD = 100
+
+
+def run_threads(target, count=THREADS):
+    """Start count threads on target(index) together and re-raise the first failure"""
+    errors = []
+    barrier = threading.Barrier(count)
+
+    def worker(index):
+        try:
+            barrier.wait()
+            target(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test suite for ReadWriteLock"""
+
+    def test_writer_excludes_readers(self):
+        """Test no reader runs while a writer holds the lock"""
+        lock = ReadWriteLock()
+        active = {'readers': 0, 'writers': 0}
+        overlaps = []
+
+        def work(index):
+            for _ in range(200):
+                if index % 2:
+                    with lock.write():
+                        active['writers'] += 1
+                        if active['readers'] or active['writers'] > 1:
+                            overlaps.append(index)
+                        active['writers'] -= 1
+                else:
+                    with lock.read():
+                        active['readers'] += 1
+                        if active['writers']:
+                            overlaps.append(index)
+                        active['readers'] -= 1
+
+        run_threads(work)
+
+        self.assertEqual(overlaps, [])
+
+    def test_reentrant(self):
+        """Test nested acquisition on one thread, including reads under a write"""
+        lock = ReadWriteLock()
+
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+
+    def test_read_cannot_upgrade(self):
+        """Test taking the write side while reading fails instead of deadlocking"""
+        lock = ReadWriteLock()
+
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                with lock.write():
+                    pass
+
+
+class TestRepositoryConcurrency(unittest.TestCase):
+    """Stress tests against real repositories"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_concurrent_user_creates_get_unique_ids(self):
+        """Test parallel sign-ups never share an id"""
+        repo = UserRepository(self._path('users.json'), flush_interval=60)
+
+        run_threads(lambda t: [
+            repo.create(User(f"user{t}_{i}@university.edu", password_hash=PASSWORD_HASH))
+            for i in range(PER_THREAD)
+        ])
+        repo.flush()
+
+        ids = [user.id for user in repo.find_all()]
+        self.assertEqual(len(ids), THREADS * PER_THREAD)
+        self.assertEqual(len(set(ids)), len(ids))
+        with open(self._path('users.json')) as f:
+            self.assertEqual(len(json.load(f)), len(ids))
+
+    def test_concurrent_notifications_and_reads(self):
+        """Test creates, bulk creates and reads interleave without losing records"""
+        repo = NotificationRepository(self._path('notifications.json'), flush_interval=0.01)
+
+        def work(t):
+            for i in range(PER_THREAD):
+                if i % 2:
+                    repo.create(Notification(t, f"single {i}"))
+                else:
+                    repo.create_many([Notification(t, f"bulk {i}"), Notification(t, f"bulk {i}")])
+                repo.find_by_user_id(t)
+                repo.count_unread(t)
+
+        run_threads(work)
+        repo.flush()
+
+        ids = [n.id for n in repo.find_all()]
+        expected = THREADS * (PER_THREAD // 2 * 3)
+        self.assertEqual(len(ids), expected)
+        self.assertEqual(len(set(ids)), expected)
+        self.assertEqual(sum(repo.count_unread(t) for t in range(THREADS)), expected)
+        self.assertEqual(len(NotificationRepository(self._path('notifications.json')).find_all()), expected)
+
+    def test_concurrent_group_updates_keep_indexes_consistent(self):
+        """Test membership updates racing with index reads"""
+        repo = GroupRepository(self._path('groups.json'), flush_interval=60)
+        groups = [Group(f"Group {i}", owner_id=0) for i in range(THREADS)]
+        for group in groups:
+            repo.create(group)
+
+        def work(t):
+            group = groups[t]
+            for i in range(PER_THREAD):
+                group.add_member(1000 + i)
+                repo.update(group.id, group)
+                repo.get_groups_for_user(1000 + i)
+                repo.filter_by(specified_class="CS")
+
+        run_threads(work)
+
+        for i in range(PER_THREAD):
+            self.assertEqual(len(repo.get_groups_for_user(1000 + i)), THREADS)
+
+    def test_concurrent_chat_messages_and_chat_creation(self):
+        """Test message ids and chat ids stay unique under parallel sends"""
+        repo = ChatRepository(self._path('chat.json'), journal=True)
+        service = ChatService(repo)
+        chat = service.create_chat("Study", 1)
+
+        def work(t):
+            for i in range(PER_THREAD // 4):
+                service.send_message(1, chat.chat_id, f"{t}-{i}")
+                service.create_chat(f"Chat {t}-{i}", t)
+
+        run_threads(work)
+
+        messages = repo.get(chat.chat_id).messages
+        self.assertEqual([m['id'] for m in messages], list(range(1, THREADS * (PER_THREAD // 4) + 1)))
+        chat_ids = [c.chat_id for c in repo.find_all()]
+        self.assertEqual(len(chat_ids), len(set(chat_ids)))
+        reloaded = ChatRepository(self._path('chat.json'), journal=True)
+        self.assertEqual(len(reloaded.get(chat.chat_id).messages), len(messages))
+
+    def test_background_flush_races_with_writes(self):
+        """Test snapshots taken by the flusher never see a half-applied change"""
+        repo = UserRepository(self._path('users.json'), flush_interval=0.001)
+        stop = time.time() + 0.5
+
+        def work(t):
+            i = 0
+            while time.time() < stop:
+                repo.create(User(f"user{t}_{i}@university.edu", password_hash=PASSWORD_HASH))
+                i += 1
+
+        run_threads(work, count=4)
+        repo.flush()
+
+        reloaded = UserRepository(self._path('users.json'))
+        self.assertEqual(len(reloaded.find_all()), len(repo.find_all()))
+
+
+if __name__ == '__main__':
+    unittest.main()
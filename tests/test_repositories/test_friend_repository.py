@@ -0,0 +1,100 @@
+"""
+Unit tests for FriendRepository
+
+Covers the adjacency and pair indexes used by friendship lookups.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.friend_repository import FriendRepository
+from models.friend import Friend
+
+
+class TestFriendRepository(unittest.TestCase):
+    """Test suite for FriendRepository"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'friends.json')
+        self.repo = FriendRepository(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_find_friendship_either_direction(self):
+        """Test pair lookup ignores who sent the request"""
+        request = self.repo.send_friend_request(1, 2)
+
+        self.assertIs(self.repo.find_friendship(1, 2), request)
+        self.assertIs(self.repo.find_friendship(2, 1), request)
+        self.assertIsNone(self.repo.find_friendship(1, 3))
+
+    def test_pending_requests_by_direction(self):
+        """Test sent and received pending requests are indexed separately"""
+        request = self.repo.send_friend_request(1, 2)
+
+        self.assertEqual(self.repo.get_pending_requests_sent(1), [request])
+        self.assertEqual(self.repo.get_pending_requests_received(2), [request])
+        self.assertEqual(self.repo.get_pending_requests_sent(2), [])
+        self.assertEqual(self.repo.get_pending_requests_received(1), [])
+
+    def test_accept_moves_between_status_buckets(self):
+        """Test accepting a request updates the (user, status) indexes"""
+        request = self.repo.send_friend_request(1, 2)
+
+        self.repo.accept_friend_request(request.id)
+
+        self.assertEqual(self.repo.get_pending_requests_received(2), [])
+        self.assertEqual(self.repo.get_friends_list(1), [2])
+        self.assertEqual(self.repo.get_friends_list(2), [1])
+
+    def test_get_friends_for_user_without_status(self):
+        """Test all friendships involving a user are returned"""
+        self.repo.add(Friend(1, 2))
+        self.repo.send_friend_request(3, 1)
+        self.repo.add(Friend(4, 5))
+
+        friends = self.repo.get_friends_for_user(1)
+
+        self.assertEqual(sorted(f.get_other_user(1) for f in friends), [2, 3])
+
+    def test_remove_clears_indexes(self):
+        """Test removed friendships disappear from every index"""
+        friendship = self.repo.add(Friend(1, 2))
+
+        self.repo.remove(friendship.id)
+
+        self.assertIsNone(self.repo.find_friendship(1, 2))
+        self.assertEqual(self.repo.get_friends_for_user(1), [])
+        self.assertEqual(self.repo.get_friends_list(2), [])
+
+    def test_unindexing_drops_empty_buckets(self):
+        """Test declined and accepted requests leave no empty index entries behind"""
+        declined = self.repo.send_friend_request(1, 2)
+        self.repo.reject_friend_request(declined.id)
+        accepted = self.repo.send_friend_request(3, 4)
+        self.repo.accept_friend_request(accepted.id)
+
+        self.assertEqual(set(self.repo._by_user), {3, 4})
+        self.assertEqual(set(self.repo._sent), {(3, Friend.STATUS_ACCEPTED)})
+        self.assertEqual(set(self.repo._received), {(4, Friend.STATUS_ACCEPTED)})
+        self.assertEqual(set(self.repo._by_pair), {frozenset((3, 4))})
+
+    def test_indexes_rebuilt_on_load(self):
+        """Test indexes are rebuilt from the JSON file"""
+        request = self.repo.send_friend_request(1, 2)
+
+        reloaded = FriendRepository(self.path)
+
+        self.assertEqual(reloaded.find_friendship(2, 1).id, request.id)
+        self.assertEqual(len(reloaded.get_pending_requests_received(2)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
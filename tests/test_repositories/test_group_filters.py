@@ -0,0 +1,41 @@
+"""
+Unit tests for the group filter helpers
+
+Covers key normalization and the AND/OR merge both group repositories use.
+"""
+
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.group_filters import normalize_class, normalize_time, class_keys, time_keys, matching_ids
+from models.group import Group
+
+
+class TestGroupFilters(unittest.TestCase):
+    """Test suite for group_filters"""
+
+    def test_keys_are_normalized(self):
+        """Test course codes ignore spacing and case, study times case and extra whitespace"""
+        group = Group("Study Group", owner_id=1, study_times=["Mon  10-12", " "], specified_class="it 326, CS101")
+
+        self.assertEqual(normalize_class(" it 326 "), "IT326")
+        self.assertEqual(normalize_time("MON   10-12"), "mon 10-12")
+        self.assertEqual(class_keys(group), {"IT326", "CS101"})
+        self.assertEqual(time_keys(group), {"mon 10-12"})
+
+    def test_matching_ids_and_or(self):
+        """Test match_all intersects the criteria and otherwise unites them, keeping order"""
+        match_class = lambda value: {3: None, 1: None}
+        match_time = lambda value: {1: None, 2: None}
+
+        self.assertEqual(list(matching_ids(match_class, match_time, "IT326", "Mon", match_all=True)), [1])
+        self.assertEqual(list(matching_ids(match_class, match_time, "IT326", "Mon")), [3, 1, 2])
+        self.assertEqual(list(matching_ids(match_class, match_time, study_times="Mon")), [1, 2])
+        self.assertEqual(matching_ids(match_class, match_time), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
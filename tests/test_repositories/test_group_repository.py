@@ -0,0 +1,135 @@
+"""
+Unit tests for GroupRepository
+
+Covers the membership and filter indexes.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.group_repository import GroupRepository
+from services.group_service import GroupService
+from models.group import Group
+
+
+class TestGroupRepository(unittest.TestCase):
+    """Test suite for GroupRepository"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'groups.json')
+        self.repo = GroupRepository(self.path)
+        self.service = GroupService(self.repo)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _group_ids_for(self, user_id, repo=None):
+        return sorted(g.id for g in (repo or self.repo).get_groups_for_user(user_id))
+
+    def test_create_indexes_owner_and_members(self):
+        """Test create_group indexes every initial member"""
+        group = self.service.create_group("Study", 1, [2, 3])
+
+        self.assertEqual(self._group_ids_for(1), [group.id])
+        self.assertEqual(self._group_ids_for(3), [group.id])
+        self.assertEqual(self._group_ids_for(4), [])
+
+    def test_join_and_leave_update_index(self):
+        """Test join_group and leave_group keep the index in sync"""
+        group = self.service.create_group("Study", 1)
+
+        self.service.join_group(2, group.id)
+        self.assertEqual(self._group_ids_for(2), [group.id])
+
+        self.service.leave_group(2, group.id)
+        self.assertEqual(self._group_ids_for(2), [])
+        self.assertEqual(self._group_ids_for(1), [group.id])
+
+    def test_orphan_group_removed_from_index(self):
+        """Test a group deleted after its last member leaves is unindexed"""
+        group = self.service.create_group("Study", 1)
+
+        self.service.leave_group(1, group.id)
+
+        self.assertEqual(self._group_ids_for(1), [])
+
+    def test_unindexing_drops_empty_member_buckets(self):
+        """Test leaving the last group and deleting a group leave no empty index entries"""
+        kept = self.service.create_group("Study", 1, [2])
+        removed = self.service.create_group("Algorithms", 3, [4])
+
+        self.service.leave_group(2, kept.id)
+        self.repo.remove(removed.id)
+
+        self.assertEqual(self.repo._by_member, {1: {kept.id: None}})
+
+    def test_index_rebuilt_on_load(self):
+        """Test the membership index is rebuilt from disk"""
+        first = self.service.create_group("One", 1, [2])
+        second = self.service.create_group("Two", 2)
+
+        reloaded = GroupRepository(self.path)
+
+        self.assertEqual(self._group_ids_for(2, reloaded), sorted([first.id, second.id]))
+
+    def test_filter_by_class_normalized_substring(self):
+        """Test class filtering ignores case/whitespace and matches partial codes"""
+        it326 = self.service.create_group("A", 1, class_name="IT 326")
+        it327 = self.service.create_group("B", 1, class_name=["IT 327", "MAT 145"])
+        self.service.create_group("C", 1, class_name="BIO 101")
+
+        self.assertEqual([g.id for g in self.repo.filter_by(specified_class="it326")], [it326.id])
+        self.assertEqual(sorted(g.id for g in self.repo.filter_by(specified_class="IT")), sorted([it326.id, it327.id]))
+        self.assertEqual([g.id for g in self.repo.filter_by(specified_class="MAT 145")], [it327.id])
+
+    def test_filter_by_time(self):
+        """Test time filtering matches any offered slot"""
+        group = self.service.create_group("A", 1, study_times=["Mon 3-5pm", "Wed 1-2pm"])
+        self.service.create_group("B", 1, study_times=["Fri 9-10am"])
+
+        self.assertEqual([g.id for g in self.repo.filter_by(study_times="wed  1-2PM")], [group.id])
+        self.assertEqual([g.id for g in self.repo.filter_by(None, study_times=["Wed 1-2pm"])], [group.id])
+
+    def test_filter_by_and_or(self):
+        """Test combined filters intersect or union without duplicates"""
+        both = self.service.create_group("A", 1, study_times=["Mon"], class_name="IT 326")
+        class_only = self.service.create_group("B", 1, study_times=["Tue"], class_name="IT 326")
+        time_only = self.service.create_group("C", 1, study_times=["Mon"], class_name="BIO 101")
+
+        anded = self.repo.filter_by("IT 326", "Mon", match_all=True)
+        ored = self.repo.filter_by("IT 326", "Mon", match_all=False)
+
+        self.assertEqual([g.id for g in anded], [both.id])
+        self.assertEqual(sorted(g.id for g in ored), sorted([both.id, class_only.id, time_only.id]))
+
+    def test_filter_index_survives_reload_and_remove(self):
+        """Test filter indexes are rebuilt on load and cleared on removal"""
+        group = self.service.create_group("A", 1, study_times=["Mon"], class_name=["IT 326", "IT 327"])
+
+        reloaded = GroupRepository(self.path)
+        self.assertEqual([g.id for g in reloaded.filter_by(specified_class="IT 327")], [group.id])
+
+        reloaded.remove(group.id)
+        self.assertEqual(reloaded.filter_by("IT", "Mon"), [])
+
+    def test_partial_class_index_follows_changes(self):
+        """Test codes added and removed after load are matched by partial queries"""
+        first = self.service.create_group("A", 1, class_name=["IT 326"])
+        reloaded = GroupRepository(self.path)
+        second = reloaded.create(Group("B", 2, specified_class=["MAT 326"]))
+
+        self.assertEqual(sorted(g.id for g in reloaded.filter_by(specified_class="326")),
+                         sorted([first.id, second.id]))
+        reloaded.remove(second.id)
+        self.assertEqual([g.id for g in reloaded.filter_by(specified_class="326")], [first.id])
+        self.assertEqual(reloaded._class_suffixes, sorted((key[i:], key) for key in ["IT326"] for i in range(5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
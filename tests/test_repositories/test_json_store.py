@@ -0,0 +1,248 @@
+"""
+Unit tests for the JSON snapshot helpers
+
+Covers atomic replacement, the retained backup, recovery on load, the
+compact snapshot format and the streaming loader.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.json_store import (read_json, read_records, write_json, backup_path, snapshot_format,
+                                     SnapshotVersionError)
+from repositories.notification_repository import NotificationRepository
+from models.notification import Notification
+from repositories.user_repository import UserRepository
+from repositories.chat_repository import ChatRepository
+from repositories.json_repository import JsonRepository
+from models.user import User
+from models.chat import Chat
+from convert_snapshots import convert
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+
+
+class TestJsonStore(unittest.TestCase):
+    """Test suite for read_json and write_json"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'users.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_write_keeps_previous_snapshot(self):
+        """Test each write keeps the snapshot it replaces as the backup"""
+        write_json(self.path, {"v": 1})
+        write_json(self.path, {"v": 2})
+
+        self.assertEqual(read_json(self.path), {"v": 2})
+        with open(backup_path(self.path)) as f:
+            self.assertEqual(json.load(f), {"v": 1})
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), ['users.json', 'users.json.bak'])
+
+    def test_failed_write_leaves_snapshot_intact(self):
+        """Test a crash while serializing does not touch the existing file"""
+        write_json(self.path, {"v": 1})
+
+        with patch('repositories.json_store.json.dump', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_json(self.path, {"v": 2})
+
+        self.assertEqual(read_json(self.path), {"v": 1})
+        self.assertFalse([name for name in os.listdir(self.tmpdir) if name.endswith('.tmp')])
+
+    def test_truncated_snapshot_recovers_from_backup(self):
+        """Test a damaged snapshot falls back to the previous one and is kept aside"""
+        write_json(self.path, {"v": 1})
+        write_json(self.path, {"v": 2})
+        with open(self.path, 'w') as f:
+            f.write('{"v": ')
+
+        self.assertEqual(read_json(self.path), {"v": 1})
+        self.assertTrue(os.path.exists(self.path + '.corrupt'))
+
+    def test_missing_files_raise(self):
+        """Test the usual FileNotFoundError when there is nothing to load"""
+        with self.assertRaises(FileNotFoundError):
+            read_json(self.path)
+
+    def test_repository_survives_torn_write(self):
+        """Test a repository reloads the previous snapshot instead of starting empty"""
+        repo = UserRepository(self.path)
+        repo.create(User("a@university.edu", password_hash=PASSWORD_HASH))
+        repo.create(User("b@university.edu", password_hash=PASSWORD_HASH))
+        with open(self.path, 'w') as f:
+            f.write('{')
+
+        reloaded = UserRepository(self.path)
+
+        self.assertIsNotNone(reloaded.find_by_email("a@university.edu"))
+
+
+class TestJsonRepository(unittest.TestCase):
+    """Test suite for the JsonRepository base class"""
+
+    def test_missing_hooks_fail_on_creation(self):
+        """Test a subclass without _build or _serialize cannot be instantiated"""
+        class NoSerialize(JsonRepository):
+            create = find_by_id = find_all = lambda self, *args: None
+
+            def _build(self, key, record):
+                return record
+
+        with self.assertRaises(TypeError):
+            NoSerialize(os.path.join(tempfile.gettempdir(), 'unused.json'), lazy=True)
+
+
+class TestCompactSnapshots(unittest.TestCase):
+    """Test suite for the compact snapshot format"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'notifications.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip_including_irregular_records(self):
+        """Test records with the shared keys, other keys and non-record data all survive"""
+        data = {"1": {"id": 1, "tags": ["a"]}, "2": {"id": 2, "tags": None}, "3": {"id": 3}}
+
+        write_json(self.path, data, snapshot_format='compact')
+        self.assertEqual(snapshot_format(self.path), 'compact')
+        self.assertEqual(read_json(self.path), data)
+
+        write_json(self.path, [1, 2, 3], snapshot_format='compact')
+        self.assertEqual(read_json(self.path), [1, 2, 3])
+
+    def test_unknown_format_rejected(self):
+        """Test a misspelled format fails instead of writing something unreadable"""
+        with self.assertRaises(ValueError):
+            write_json(self.path, {}, snapshot_format='binary')
+
+    def test_newer_version_is_refused(self):
+        """Test a snapshot from a newer format version fails loudly instead of using the backup"""
+        write_json(self.path, {"v": {"n": 1}}, snapshot_format='compact')
+        write_json(self.path, {"v": {"n": 2}}, snapshot_format='compact')
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(raw.replace(b'"version": 1', b'"version": 99'))
+
+        with self.assertRaises(SnapshotVersionError):
+            read_json(self.path)
+        with self.assertRaises(SnapshotVersionError):
+            read_records(self.path, lambda key, record: record)
+        self.assertFalse(os.path.exists(self.path + '.corrupt'))
+
+    def test_repository_does_not_start_empty_over_newer_version(self):
+        """Test a repository refuses to load a newer snapshot rather than overwrite it"""
+        for path in (self.path, backup_path(self.path)):
+            write_json(path, {"1": User("a@university.edu", password_hash=PASSWORD_HASH, id=1).to_dict()},
+                       snapshot_format='compact')
+            with open(path, 'rb') as f:
+                raw = f.read()
+            with open(path, 'wb') as f:
+                f.write(raw.replace(b'"version": 1', b'"version": 2'))
+
+        for repository in (UserRepository, NotificationRepository):
+            with self.assertRaises(SnapshotVersionError):
+                repository(self.path)
+        with open(self.path, 'rb') as f:
+            self.assertIn(b'"version": 2', f.readlines()[1])
+
+    def test_repository_converts_json_file_on_next_save(self):
+        """Test a compact repository reads an existing JSON file and saves it compactly"""
+        repo = NotificationRepository(self.path)
+        for i in range(20):
+            repo.create(Notification(1, f"Notification {i}"))
+        json_size = os.path.getsize(self.path)
+
+        compact = NotificationRepository(self.path, snapshot_format='compact')
+        self.assertEqual(len(compact.find_all()), 20)
+        compact.create(Notification(2, "New"))
+
+        self.assertEqual(snapshot_format(self.path), 'compact')
+        self.assertLess(os.path.getsize(self.path), json_size)
+        reloaded = NotificationRepository(self.path)
+        self.assertEqual([n.message for n in reloaded.find_by_user_id(2)], ["New"])
+        self.assertEqual(reloaded.count_unread(1), 20)
+
+    def test_convert_covers_shards_and_chat_journal(self):
+        """Test the converter rewrites shard files and keeps messages only in the journal"""
+        chats = ChatRepository(os.path.join(self.tmpdir, 'chat.json'), journal=True, shards=4)
+        chats.create(Chat("Algorithms", chat_id="1", members=[1, 2]))
+        chats.append_message("1", {'sender_id': 1, 'message': "in the journal"})
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir, 'chat.json.log')))
+
+        with patch('builtins.print'):
+            convert(self.tmpdir, 'compact', shards=4)
+
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, 'chat.json.log')))
+        shard_dir = os.path.join(self.tmpdir, 'chat.4-shards')
+        shard_files = [name for name in os.listdir(shard_dir) if name[0].isdigit() and name.endswith('.json')]
+        self.assertTrue(shard_files)
+        for name in shard_files:
+            self.assertEqual(snapshot_format(os.path.join(shard_dir, name)), 'compact')
+        reloaded = ChatRepository(os.path.join(self.tmpdir, 'chat.json'), shards=4)
+        self.assertEqual([m['message'] for m in reloaded.get_messages("1")], ["in the journal"])
+
+
+
+class TestReadRecords(unittest.TestCase):
+    """Test suite for the streaming read_records"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'notifications.json')
+        self.data = {
+            str(i): {'id': i, 'message': f"msg \"{i}\" \u00e9", 'values': [i, i * 1.5, None, True],
+                     'nested': {'k\\ey': [{}, []]}}
+            for i in range(1, 60)
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _pairs(self, path):
+        return read_records(path, lambda key, record: (key, record))
+
+    def test_matches_read_json_in_both_formats(self):
+        """Test records parsed across many small chunks equal a full parse"""
+        for fmt in ('json', 'compact'):
+            write_json(self.path, self.data, snapshot_format=fmt)
+            # Tiny chunks so nearly every record straddles a chunk boundary
+            with patch('repositories.json_store.STREAM_CHUNK', 5):
+                pairs = self._pairs(self.path)
+            self.assertEqual(dict(pairs), read_json(self.path))
+            self.assertEqual([key for key, _ in pairs], list(self.data))
+
+        write_json(self.path, {})
+        self.assertEqual(self._pairs(self.path), [])
+
+    def test_damaged_file_falls_back_to_backup(self):
+        """Test a truncated or malformed file loads the previous snapshot instead"""
+        write_json(self.path, {"1": {"v": 1}})
+        write_json(self.path, self.data)
+        for damaged in ('{"1": {"v": 1}, "2": {"v": ', '{"1": {"v": 1}} trailing', '{"1": 1,}'):
+            with open(self.path, 'w') as f:
+                f.write(damaged)
+            self.assertEqual(self._pairs(self.path), [("1", {"v": 1})])
+
+    def test_missing_file_raises(self):
+        """Test a missing file raises FileNotFoundError like read_json"""
+        with self.assertRaises(FileNotFoundError):
+            self._pairs(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
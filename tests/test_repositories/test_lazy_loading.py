@@ -0,0 +1,86 @@
+"""
+Tests for repositories created with lazy=True
+
+The backing file must be read on first use, never before, and a write to an
+untouched repository must not replace what is already on disk.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.user_repository import UserRepository
+from repositories.group_repository import GroupRepository
+from repositories.friend_repository import FriendRepository
+from repositories.chat_repository import ChatRepository
+from services.chat_service import ChatService
+from models.user import User
+from models.group import Group
+from models.friend import Friend
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+
+
+class TestLazyLoading(unittest.TestCase):
+    """Test suite for lazy repository loading"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_file_is_read_on_first_use(self):
+        """Test construction does not read the file; the first lookup does"""
+        lazy = UserRepository(self._path('users.json'), lazy=True)
+        UserRepository(self._path('users.json')).create(
+            User("a@university.edu", password_hash=PASSWORD_HASH))
+
+        self.assertFalse(lazy._loaded)
+        self.assertIsNotNone(lazy.find_by_email("a@university.edu"))
+        self.assertTrue(lazy._loaded)
+
+    def test_first_write_keeps_existing_data(self):
+        """Test a write before any read loads the file instead of overwriting it"""
+        GroupRepository(self._path('groups.json')).create(Group("Algorithms", owner_id=1))
+
+        lazy = GroupRepository(self._path('groups.json'), lazy=True)
+        lazy.create(Group("Databases", owner_id=2))
+
+        names = sorted(g.name for g in GroupRepository(self._path('groups.json')).find_all())
+        self.assertEqual(names, ["Algorithms", "Databases"])
+        self.assertEqual(len(lazy.get_groups_for_user(1)), 1)
+
+    def test_chat_journal_replayed_on_first_use(self):
+        """Test a lazy chat repository loads the snapshot plus the journal"""
+        service = ChatService(ChatRepository(self._path('chat.json'), journal=True))
+        chat = service.create_chat("Study", 1)
+        service.send_message(1, chat.chat_id, "hello")
+
+        lazy = ChatRepository(self._path('chat.json'), journal=True, lazy=True)
+
+        self.assertEqual([m['body'] for m in lazy.get(chat.chat_id).messages], ["hello"])
+        self.assertEqual(lazy.next_id(), str(int(chat.chat_id) + 1))
+
+
+    def test_storage_property_loads(self):
+        """Test .storage on an untouched lazy repository returns what is on disk"""
+        friendship = FriendRepository(self._path('friends.json')).add(Friend(1, 2))
+        GroupRepository(self._path('groups.json')).create(Group("Algorithms", owner_id=1))
+
+        friends = FriendRepository(self._path('friends.json'), lazy=True)
+        groups = GroupRepository(self._path('groups.json'), lazy=True)
+
+        self.assertEqual(list(friends.storage), [friendship.id])
+        self.assertEqual(len(groups.storage), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
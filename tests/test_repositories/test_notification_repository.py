@@ -0,0 +1,96 @@
+"""
+Unit tests for NotificationRepository
+
+Covers the per-user index, cursor pagination and unread counters.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.notification_repository import NotificationRepository
+from models.notification import Notification
+
+
+class TestNotificationRepository(unittest.TestCase):
+    """Test suite for NotificationRepository"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'notifications.json')
+        self.repo = NotificationRepository(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _send(self, user_id, message="hi"):
+        return self.repo.create(Notification(user_id, message))
+
+    def test_find_by_user_id_only_returns_user_notifications(self):
+        """Test the per-user index returns a user's notifications in id order"""
+        first = self._send(1)
+        self._send(2)
+        second = self._send(1)
+
+        self.assertEqual([n.id for n in self.repo.find_by_user_id(1)], [first.id, second.id])
+
+    def test_pagination_with_cursor(self):
+        """Test after/limit page through notifications"""
+        ids = [self._send(1).id for _ in range(5)]
+
+        page = self.repo.find_by_user_id(1, limit=2)
+        self.assertEqual([n.id for n in page], ids[:2])
+
+        page = self.repo.find_by_user_id(1, after=page[-1].id, limit=2)
+        self.assertEqual([n.id for n in page], ids[2:4])
+
+        page = self.repo.find_by_user_id(1, after=ids[-1])
+        self.assertEqual(page, [])
+
+    def test_unread_counter(self):
+        """Test unread count tracks create, mark_as_read and delete"""
+        first = self._send(1)
+        second = self._send(1)
+        self.assertEqual(self.repo.count_unread(1), 2)
+
+        self.repo.mark_as_read(first.id)
+        self.repo.mark_as_read(first.id)
+        self.assertEqual(self.repo.count_unread(1), 1)
+
+        self.repo.delete(second.id)
+        self.assertEqual(self.repo.count_unread(1), 0)
+        self.repo.delete(first.id)
+        self.assertEqual(self.repo.count_unread(1), 0)
+        self.assertEqual(self.repo.find_by_user_id(1), [])
+
+    def test_create_many_persists_once(self):
+        """Test bulk insert assigns ids, indexes and writes the file once"""
+        writes = []
+        original = self.repo._save_to_file
+        self.repo._save_to_file = lambda: (writes.append(1), original())
+
+        created = self.repo.create_many([Notification(uid, "hello") for uid in (1, 2, 3)])
+
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(len({n.id for n in created}), 3)
+        self.assertEqual(self.repo.count_unread(2), 1)
+        self.assertEqual(len(NotificationRepository(self.path).find_by_user_id(3)), 1)
+
+    def test_index_rebuilt_on_load(self):
+        """Test the index and counters are rebuilt from disk"""
+        first = self._send(1)
+        self._send(1)
+        self.repo.mark_as_read(first.id)
+
+        reloaded = NotificationRepository(self.path)
+
+        self.assertEqual(len(reloaded.find_by_user_id(1)), 2)
+        self.assertEqual(reloaded.count_unread(1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
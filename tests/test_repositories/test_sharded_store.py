@@ -0,0 +1,129 @@
+"""
+Tests for sharded group and chat storage
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.group_repository import GroupRepository
+from repositories.chat_repository import ChatRepository
+from repositories.sharded_store import ShardedStore
+from services.chat_service import ChatService
+from models.group import Group
+from models.chat import Chat
+
+
+class TestShardedStorage(unittest.TestCase):
+    """Test repositories created with shards > 0"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.groups_path = os.path.join(self.tmpdir, 'groups.json')
+        self.chat_path = os.path.join(self.tmpdir, 'chat.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _shard_files(self, path, count):
+        store = ShardedStore(path, count)
+        return {i: store.shard_path(i) for i in range(count)}
+
+    def _signatures(self, paths):
+        return {i: os.stat(p).st_ino if os.path.exists(p) else None for i, p in paths.items()}
+
+    def test_update_rewrites_only_its_shard(self):
+        """Test updating one group replaces only the shard file holding it"""
+        repo = GroupRepository(self.groups_path, shards=4)
+        groups = [repo.create(Group(f"Group {i}", owner_id=i)) for i in range(20)]
+        shards = self._shard_files(self.groups_path, 4)
+        before = self._signatures(shards)
+
+        target = groups[7]
+        target.add_member(99)
+        repo.update(target.id, target)
+
+        after = self._signatures(shards)
+        changed = [i for i in shards if before[i] != after[i]]
+        self.assertEqual(changed, [ShardedStore(self.groups_path, 4).shard_of(target.id)])
+        reloaded = GroupRepository(self.groups_path, shards=4)
+        self.assertIn(99, reloaded.get(target.id).members)
+        self.assertEqual(len(reloaded.find_all()), 20)
+
+    def test_single_file_migrates_to_shards(self):
+        """Test an existing single file is moved into shards on the first save"""
+        GroupRepository(self.groups_path).create(Group("Algorithms", owner_id=1))
+
+        repo = GroupRepository(self.groups_path, shards=3)
+        repo.create(Group("Databases", owner_id=2))
+
+        self.assertTrue(ShardedStore(self.groups_path, 3).complete)
+        names = sorted(g.name for g in GroupRepository(self.groups_path, shards=3).find_all())
+        self.assertEqual(names, ["Algorithms", "Databases"])
+        # Changing the shard count again carries everything over
+        self.assertEqual(len(GroupRepository(self.groups_path, shards=5).find_all()), 2)
+
+    def test_only_shards_loads_a_subset(self):
+        """Test only_shards loads those shards and rejects writes to the others"""
+        repo = GroupRepository(self.groups_path, shards=4)
+        groups = [repo.create(Group(f"Group {i}", owner_id=i)) for i in range(20)]
+        store = ShardedStore(self.groups_path, 4)
+
+        partial = GroupRepository(self.groups_path, shards=4, only_shards=[0])
+        self.assertEqual({g.id for g in partial.find_all()},
+                         {g.id for g in groups if store.shard_of(g.id) == 0})
+
+        outside = next(g for g in groups if store.shard_of(g.id) != 0)
+        with self.assertRaises(ValueError):
+            partial.save_group_info(outside)
+        # A write inside the loaded shard keeps the other shards intact
+        inside = next(g for g in groups if store.shard_of(g.id) == 0)
+        inside.add_member(99)
+        partial.update(inside.id, inside)
+        reloaded = GroupRepository(self.groups_path, shards=4)
+        self.assertEqual(len(reloaded.find_all()), 20)
+        self.assertIn(99, reloaded.get(inside.id).members)
+
+    def test_only_shards_needs_a_complete_layout(self):
+        """Test a subset cannot be loaded before the shards have been written"""
+        GroupRepository(self.groups_path).create(Group("Algorithms", owner_id=1))
+        with self.assertRaises(ValueError):
+            GroupRepository(self.groups_path, shards=4, only_shards=[0])
+        with self.assertRaises(ValueError):
+            ChatRepository(self.chat_path, journal=True, shards=4, only_shards=[0])
+
+    def test_chat_compaction_rewrites_touched_shards(self):
+        """Test journal compaction only rewrites shards with new records"""
+        repo = ChatRepository(self.chat_path, journal=True, shards=4)
+        service = ChatService(repo)
+        chats = [service.create_chat(f"Chat {i}", i) for i in range(12)]
+        repo.compact()
+        shards = self._shard_files(self.chat_path, 4)
+        before = self._signatures(shards)
+
+        service.send_message(1, chats[5].chat_id, "hello")
+        repo.compact()
+
+        after = self._signatures(shards)
+        changed = [i for i in shards if before[i] != after[i]]
+        self.assertEqual(changed, [ShardedStore(self.chat_path, 4).shard_of(chats[5].chat_id)])
+        reloaded = ChatRepository(self.chat_path, shards=4)
+        self.assertEqual([m['body'] for m in reloaded.get(chats[5].chat_id).messages], ["hello"])
+        self.assertEqual(reloaded.next_id(), "13")
+
+    def test_partial_chat_repository_cannot_allocate_ids(self):
+        """Test next_id is refused when some chats were not loaded"""
+        repo = ChatRepository(self.chat_path, shards=2)
+        repo.create(Chat("Study", chat_id=repo.next_id(), members=[1]))
+
+        partial = ChatRepository(self.chat_path, shards=2, only_shards=[0])
+        with self.assertRaises(ValueError):
+            partial.next_id()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,232 @@
+"""
+Tests for shared storage between worker processes
+
+Two repository instances on the same files stand in for two processes.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import multiprocessing
+import threading
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.user_repository import UserRepository
+from repositories.group_repository import GroupRepository
+from repositories.chat_repository import ChatRepository
+from repositories.notification_repository import NotificationRepository
+from repositories.json_store import read_json
+from repositories.sqlite_chat_repository import SQLiteChatRepository
+from services.chat_service import ChatService
+from services.group_service import GroupService
+from models.user import User
+from models.group import Group
+from models.notification import Notification
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+PER_PROCESS = 25
+
+
+def send_messages(path, worker):
+    service = ChatService(ChatRepository(path, journal=True, shared=True))
+    for i in range(PER_PROCESS):
+        service.send_message(worker, "1", f"{worker}-{i}")
+
+
+class TestSharedJsonStorage(unittest.TestCase):
+    """Test JSON repositories kept in sync across instances"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_reads_see_other_instance_writes(self):
+        """Test a lookup reloads after another process has saved"""
+        first = UserRepository(self._path('users.json'), shared=True)
+        second = UserRepository(self._path('users.json'), shared=True)
+
+        first.create(User("a@university.edu", password_hash=PASSWORD_HASH))
+
+        self.assertIsNotNone(second.find_by_email("a@university.edu"))
+
+    def test_writes_merge_instead_of_overwriting(self):
+        """Test both instances' creates survive and ids do not collide"""
+        first = UserRepository(self._path('users.json'), shared=True)
+        second = UserRepository(self._path('users.json'), shared=True)
+
+        a = first.create(User("a@university.edu", password_hash=PASSWORD_HASH))
+        b = second.create(User("b@university.edu", password_hash=PASSWORD_HASH))
+
+        self.assertNotEqual(a.id, b.id)
+        self.assertEqual(len(UserRepository(self._path('users.json')).find_all()), 2)
+
+    def test_service_read_modify_write_is_not_lost(self):
+        """Test joins through two services on a stale group both land"""
+        first = GroupRepository(self._path('groups.json'), shared=True)
+        second = GroupRepository(self._path('groups.json'), shared=True)
+        group = Group("Algorithms", owner_id=1)
+        first.create(group)
+        second.find_all()
+
+        GroupService(first).join_group(2, group.id)
+        GroupService(second).join_group(3, group.id)
+
+        members = GroupRepository(self._path('groups.json')).get(group.id)._members
+        self.assertEqual(sorted(members), [1, 2, 3])
+
+    def test_chat_journal_is_replayed_incrementally(self):
+        """Test new messages are picked up from the journal without a full reload"""
+        path = self._path('chat.json')
+        first = ChatService(ChatRepository(path, journal=True, shared=True))
+        second_repo = ChatRepository(path, journal=True, shared=True)
+        chat = first.create_chat("Study", 1)
+        first.send_message(1, chat.chat_id, "hello")
+        self.assertEqual(len(second_repo.get(chat.chat_id).messages), 1)
+
+        loaded = second_repo._load_from_file
+        second_repo._load_from_file = lambda: self.fail("full reload")
+        first.send_message(1, chat.chat_id, "again")
+        messages = second_repo.get_messages(chat.chat_id)
+        second_repo._load_from_file = loaded
+
+        self.assertEqual([m['body'] for m in messages], ["hello", "again"])
+
+    def test_chat_ids_are_not_reused_across_instances(self):
+        """Test two instances creating chats at once get distinct ids and both chats survive"""
+        path = self._path('chat.json')
+        services = [ChatService(ChatRepository(path, journal=True, shared=True)) for _ in range(2)]
+        # Both allocate an id before either stores its chat, unless allocation and add are one transaction
+        barrier = threading.Barrier(2, timeout=0.5)
+        for service in services:
+            allocate = service.chat_repo.next_id
+
+            def next_id_then_wait(allocate=allocate):
+                chat_id = allocate()
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    pass
+                return chat_id
+            service.chat_repo.next_id = next_id_then_wait
+
+        created, errors = [], []
+
+        def create(service, name):
+            try:
+                created.append(service.create_chat(name, 1))
+            except ValueError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=create, args=(service, name))
+                   for service, name in zip(services, ["Algorithms", "Databases"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len({chat.chat_id for chat in created}), 2)
+        names = sorted(c.name for c in ChatRepository(path, journal=True).find_all())
+        self.assertEqual(names, ["Algorithms", "Databases"])
+
+    def test_chat_compaction_forces_full_reload(self):
+        """Test another process compacting the journal is picked up"""
+        path = self._path('chat.json')
+        first = ChatService(ChatRepository(path, journal=True, compact_every=2, shared=True))
+        second_repo = ChatRepository(path, journal=True, shared=True)
+        chat = first.create_chat("Study", 1)
+        for body in ["one", "two", "three"]:
+            first.send_message(1, chat.chat_id, body)
+
+        self.assertEqual([m['body'] for m in second_repo.get(chat.chat_id).messages],
+                         ["one", "two", "three"])
+
+    def test_reload_rebuilds_only_changed_entities(self):
+        """Test unchanged entities and their indexes are kept when another instance saves"""
+        first = NotificationRepository(self._path('notifications.json'), shared=True)
+        second = NotificationRepository(self._path('notifications.json'), shared=True)
+        kept, read, deleted = first.create_many([Notification(1, "a"), Notification(1, "b"), Notification(2, "c")])
+        untouched = second.find_by_id(kept.id)
+
+        first.mark_as_read(read.id)
+        first.delete(deleted.id)
+        added = first.create(Notification(2, "d"))
+        with patch.object(NotificationRepository, '_build', autospec=True,
+                          side_effect=NotificationRepository._build) as build:
+            self.assertEqual(second.count_unread(1), 1)
+
+        self.assertEqual(build.call_count, 2)
+        self.assertIs(second.find_by_id(kept.id), untouched)
+        self.assertIsNone(second.find_by_id(deleted.id))
+        self.assertEqual([n.message for n in second.find_by_user_id(2)], ["d"])
+        self.assertEqual(second.create(Notification(2, "e")).id, added.id + 1)
+
+    def test_sharded_reload_reads_only_changed_shards(self):
+        """Test another instance's update to one group reads back just its shard"""
+        first = GroupRepository(self._path('groups.json'), shared=True, shards=8)
+        second = GroupRepository(self._path('groups.json'), shared=True, shards=8)
+        groups = [first.create(Group(f"Group {i}", owner_id=i, specified_class="IT 326")) for i in range(20)]
+        second.find_all()
+
+        group = groups[7]
+        group.add_member(99)
+        first.update(group.id, group)
+        with patch('repositories.json_repository.read_json', side_effect=read_json) as read:
+            self.assertEqual([g.id for g in second.get_groups_for_user(99)], [group.id])
+
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual(len(second.filter_by(specified_class="IT")), 20)
+
+    def test_concurrent_processes_keep_every_message(self):
+        """Test real worker processes appending to one chat lose nothing"""
+        path = self._path('chat.json')
+        ChatService(ChatRepository(path, journal=True, shared=True)).create_chat("Study", 1)
+
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=send_messages, args=(path, w)) for w in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        messages = ChatRepository(path, journal=True).get("1").messages
+        self.assertEqual(len(messages), 3 * PER_PROCESS)
+        self.assertEqual([m['id'] for m in messages], list(range(1, 3 * PER_PROCESS + 1)))
+
+
+class TestSQLiteTransaction(unittest.TestCase):
+    """Test SQLiteRepository.transaction"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'study_buddy.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_rollback_undoes_nested_writes(self):
+        """Test an error inside a transaction discards everything in it"""
+        repo = SQLiteChatRepository(self.path)
+        service = ChatService(repo)
+        chat = service.create_chat("Study", 1)
+
+        with self.assertRaises(ValueError):
+            with repo.transaction():
+                service.send_message(1, chat.chat_id, "lost")
+                raise ValueError("abort")
+        service.send_message(1, chat.chat_id, "kept")
+
+        self.assertEqual([m['body'] for m in SQLiteChatRepository(self.path).get(chat.chat_id).messages], ["kept"])
+
+
+if __name__ == '__main__':
+    unittest.main()
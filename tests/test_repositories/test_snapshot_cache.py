@@ -0,0 +1,114 @@
+"""
+Tests for reusing serialized entities between saves
+
+Only entities whose version changed, or that a repository reported as
+changed, may be serialized again, and the file must match a full rewrite.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.snapshot_cache import SnapshotCache
+from repositories.group_repository import GroupRepository
+from repositories.notification_repository import NotificationRepository
+from models.group import Group
+from models.friend import Friend
+from models.notification import Notification
+
+
+class TestSnapshotCache(unittest.TestCase):
+    """Test suite for SnapshotCache"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'groups.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_unchanged_entities_are_not_serialized_again(self):
+        """Test a second save only serializes the group that changed"""
+        groups = {g.id: g for g in (Group(f"Group {i}", owner_id=i) for i in range(5))}
+        serialize = Mock(side_effect=Group.to_dict)
+        cache = SnapshotCache(serialize)
+
+        cache.write(self.path, groups.items())
+        changed = next(iter(groups.values()))
+        changed.add_member(99)
+        serialize.reset_mock()
+        cache.write(self.path, groups.items())
+
+        serialize.assert_called_once_with(changed)
+        with open(self.path) as f:
+            self.assertIn(99, json.load(f)[changed.id]['members'])
+
+    def test_file_matches_full_rewrite(self):
+        """Test the assembled file is byte for byte what json.dump writes"""
+        groups = {g.id: g for g in (Group(f"Group {i}", owner_id=i, study_times=["Mon 10-12"])
+                                    for i in range(3))}
+        SnapshotCache(Group.to_dict).write(self.path, groups.items())
+
+        with open(self.path) as f:
+            written = f.read()
+        expected = json.dumps({gid: g.to_dict() for gid, g in groups.items()}, indent=4)
+        self.assertEqual(written, expected)
+
+    def test_discard_and_removed_entities(self):
+        """Test discarded keys are serialized again and removed entities leave the file"""
+        groups = {g.id: g for g in (Group(f"Group {i}", owner_id=i) for i in range(3))}
+        serialize = Mock(side_effect=Group.to_dict)
+        cache = SnapshotCache(serialize)
+        cache.write(self.path, groups.items())
+
+        first, second, third = groups
+        del groups[third]
+        cache.discard(second)
+        serialize.reset_mock()
+        cache.write(self.path, groups.items())
+
+        serialize.assert_called_once_with(groups[second])
+        with open(self.path) as f:
+            self.assertEqual(sorted(json.load(f)), sorted([first, second]))
+
+    def test_slotted_models_track_changes(self):
+        """Test models without an instance dict still get a new version from their setters"""
+        friendship = Friend(1, 2, status=Friend.STATUS_PENDING)
+        notification = Notification(1, "hello")
+        self.assertFalse(hasattr(friendship, '__dict__'))
+        self.assertFalse(hasattr(notification, '__dict__'))
+
+        serialize = Mock(side_effect=Friend.to_dict)
+        cache = SnapshotCache(serialize)
+        cache.write(self.path, [(friendship.id, friendship)])
+        friendship.status = Friend.STATUS_ACCEPTED
+        cache.write(self.path, [(friendship.id, friendship)])
+
+        self.assertEqual(serialize.call_count, 2)
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)[friendship.id]['status'], Friend.STATUS_ACCEPTED)
+
+    def test_repository_persists_in_place_changes(self):
+        """Test changes the repositories make in place still reach the file"""
+        notifications = NotificationRepository(os.path.join(self.tmpdir, 'notifications.json'))
+        created = notifications.create_many([Notification(1, "a"), Notification(1, "b")])
+        notifications.mark_as_read(created[0].id)
+
+        groups = GroupRepository(self.path)
+        group = groups.create(Group("Algorithms", owner_id=1))
+        group.add_member(2)
+        groups.update(group.id, group)
+
+        reloaded = NotificationRepository(os.path.join(self.tmpdir, 'notifications.json'))
+        self.assertEqual([n.read for n in reloaded.find_all()], [True, False])
+        self.assertEqual(sorted(GroupRepository(self.path).get(group.id).members), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,342 @@
+"""
+Unit tests for the SQLite repositories
+
+Checks each SQLite repository honours the same contract as its JSON
+counterpart, including persistence across reopening the database.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.sqlite_user_repository import SQLiteUserRepository
+from repositories.sqlite_group_repository import SQLiteGroupRepository
+from repositories.sqlite_friend_repository import SQLiteFriendRepository
+from repositories.sqlite_chat_repository import SQLiteChatRepository
+from repositories.sqlite_notification_repository import SQLiteNotificationRepository
+from repositories.sqlite_profile_repository import SQLiteProfileRepository
+from repositories.sqlite_study_scheduler_repository import SQLiteStudySchedulerRepository
+from repositories.sqlite_password_reset_token_repository import SQLitePasswordResetTokenRepository
+from repositories.group_repository import GroupRepository
+from repositories.chat_repository import ChatRepository
+from migrate_json_to_sqlite import migrate
+from models.user import User
+from models.group import Group
+from models.chat import Chat
+from models.notification import Notification
+from models.profile import Profile
+from models.study_scheduler import StudyScheduler
+from models.password_reset import PasswordResetToken
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+
+
+class SQLiteTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmpdir, 'study_buddy.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+
+class TestSQLiteUserRepository(SQLiteTestCase):
+
+    def test_create_and_find(self):
+        """Test users are found by id, email and batch id lookup after reopening"""
+        repo = SQLiteUserRepository(self.db)
+        user = repo.create(User(email="A@School.edu", password_hash=PASSWORD_HASH))
+
+        reopened = SQLiteUserRepository(self.db)
+
+        self.assertEqual(reopened.find_by_id(user.id).email, "a@school.edu")
+        self.assertEqual(reopened.find_by_email(" a@school.edu ").id, user.id)
+        self.assertEqual(reopened.find_emails_by_ids([user.id, 99]), {user.id: "a@school.edu"})
+
+    def test_duplicate_email_rejected(self):
+        """Test creating or renaming to a taken email raises ValueError"""
+        repo = SQLiteUserRepository(self.db)
+        repo.create(User(email="a@school.edu", password_hash=PASSWORD_HASH))
+        second = repo.create(User(email="b@school.edu", password_hash=PASSWORD_HASH))
+
+        with self.assertRaises(ValueError):
+            repo.create(User(email="a@school.edu", password_hash=PASSWORD_HASH))
+        with self.assertRaises(ValueError):
+            repo.update(second.id, {'email': "a@school.edu"})
+
+    def test_update_and_delete(self):
+        """Test password updates persist and deleted users are gone"""
+        repo = SQLiteUserRepository(self.db)
+        user = repo.create(User(email="a@school.edu", password_hash=PASSWORD_HASH))
+
+        repo.update(user.id, {'password_hash': "new-hash"})
+        self.assertEqual(repo.find_by_id(user.id)._password_hash, "new-hash")
+
+        repo.delete(user.id)
+        self.assertIsNone(repo.find_by_id(user.id))
+        with self.assertRaises(ValueError):
+            repo.delete(user.id)
+
+
+class TestSQLiteGroupRepository(SQLiteTestCase):
+
+    def test_membership_and_filters(self):
+        """Test member lookup and class/time filtering"""
+        repo = SQLiteGroupRepository(self.db)
+        group = repo.add(Group("Study", 1, [2], "IT 326", ["Mon 3-5pm"]))
+        repo.add(Group("Other", 3, None, "BIO 101", ["Tue"]))
+
+        group.add_member(4)
+        repo.update(group.id, group)
+
+        self.assertEqual([g.id for g in repo.get_groups_for_user(4)], [group.id])
+        self.assertEqual([g.id for g in repo.filter_by(specified_class="it")], [group.id])
+        self.assertEqual([g.id for g in repo.filter_by("IT 326", "mon 3-5PM", match_all=True)], [group.id])
+        self.assertEqual(len(repo.filter_by("IT 326", "Tue", match_all=False)), 2)
+        self.assertEqual(repo.find_by_name("study").id, group.id)
+
+    def test_remove(self):
+        """Test removed groups disappear from every lookup"""
+        repo = SQLiteGroupRepository(self.db)
+        group = repo.add(Group("Study", 1, None, "IT 326"))
+
+        repo.remove(group.id)
+
+        self.assertIsNone(repo.get(group.id))
+        self.assertEqual(repo.get_groups_for_user(1), [])
+        self.assertEqual(repo.filter_by(specified_class="IT"), [])
+        with self.assertRaises(ValueError):
+            repo.update(group.id, group)
+
+
+class TestSQLiteFriendRepository(SQLiteTestCase):
+
+    def test_request_lifecycle(self):
+        """Test sending, finding and accepting a friend request"""
+        repo = SQLiteFriendRepository(self.db)
+        request = repo.send_friend_request(1, 2)
+
+        self.assertEqual(repo.find_friendship(2, 1).id, request.id)
+        self.assertEqual([f.id for f in repo.get_pending_requests_received(2)], [request.id])
+        self.assertEqual([f.id for f in repo.get_pending_requests_sent(1)], [request.id])
+
+        repo.accept_friend_request(request.id)
+
+        self.assertEqual(repo.get_friends_list(1), [2])
+        self.assertEqual(repo.get_pending_requests_received(2), [])
+
+    def test_reject_removes(self):
+        """Test rejecting deletes the request"""
+        repo = SQLiteFriendRepository(self.db)
+        request = repo.send_friend_request(1, 2)
+
+        repo.reject_friend_request(request.id)
+
+        self.assertIsNone(repo.find_friendship(1, 2))
+
+    def test_concurrent_requests_insert_once(self):
+        """Test two requests racing between the check and the insert create one friendship"""
+        repo = SQLiteFriendRepository(self.db)
+        find = repo.find_friendship
+        # Both requests check before either inserts, unless the first one holds the write lock
+        barrier = threading.Barrier(2, timeout=0.5)
+
+        def find_then_wait(*args):
+            found = find(*args)
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+            return found
+
+        repo.find_friendship = find_then_wait
+        threads = [threading.Thread(target=repo.send_friend_request, args=pair) for pair in ((1, 2), (2, 1))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(repo.find_all()), 1)
+
+
+class TestSQLiteChatRepository(SQLiteTestCase):
+
+    def test_messages_appended(self):
+        """Test messages and membership changes survive reopening"""
+        repo = SQLiteChatRepository(self.db)
+        repo.add(Chat("Study", "1", members=[1]))
+        chat = repo.get("1")
+        chat.members.append(2)
+        chat.messages.append("a@x.edu: one")
+        repo.update("1", chat)
+        chat.messages.append("b@x.edu: two")
+        repo.update("1", chat)
+
+        reopened = SQLiteChatRepository(self.db).get("1")
+
+        self.assertEqual(reopened.members, [1, 2])
+        self.assertEqual([m['body'] for m in reopened.messages], ["one", "two"])
+
+    def test_get_messages_pages_backwards(self):
+        """Test paging with the before cursor walks from newest to oldest"""
+        repo = SQLiteChatRepository(self.db)
+        repo.add(Chat("Study", "1", members=[1], messages=[f"a@x.edu: {i}" for i in range(5)]))
+
+        newest = repo.get_messages("1", limit=2)
+        older = repo.get_messages("1", before=newest[0]['id'], limit=2)
+
+        self.assertEqual([m['id'] for m in newest], [4, 5])
+        self.assertEqual([m['body'] for m in older], ["1", "2"])
+        self.assertEqual([m['id'] for m in repo.get_messages("1", after=2, limit=2)], [3, 4])
+        self.assertIsNone(repo.get_messages("missing"))
+
+    def test_next_id_skips_existing_ids(self):
+        """Test allocated chat ids continue after imported numeric ids"""
+        repo = SQLiteChatRepository(self.db)
+        repo.import_all([Chat("Old", "7", members=[1]), Chat("Group", "a1b2", members=[1])])
+
+        first = repo.next_id()
+        second = SQLiteChatRepository(self.db).next_id()
+
+        self.assertEqual((first, second), ("8", "9"))
+
+    def test_find_dm_either_order(self):
+        """Test a DM is found from both users"""
+        repo = SQLiteChatRepository(self.db)
+        repo.add(Chat(Chat.dm_name(1, 2), "1", members=[1, 2]))
+
+        self.assertEqual(repo.find_dm(2, 1).chat_id, "1")
+        self.assertIsNone(repo.find_dm(1, 3))
+
+    def test_update_missing_chat(self):
+        """Test updating an unknown chat raises ValueError"""
+        repo = SQLiteChatRepository(self.db)
+
+        with self.assertRaises(ValueError):
+            repo.update("missing", Chat("x", "missing"))
+
+    def test_append_message_and_summaries(self):
+        """Test sending stores one row and listings match Chat.to_summary"""
+        repo = SQLiteChatRepository(self.db)
+        repo.add(Chat("Study", "1", members=[1, 2], messages=["a@x.edu: old"]))
+        repo.add(Chat("Other", "2", members=[2]))
+
+        summary = repo.append_message("1", {'sender_id': 1, 'sender': "a@x.edu", 'timestamp': None, 'body': "new"})
+
+        self.assertEqual(summary, repo.get("1").to_summary())
+        self.assertEqual(summary['last_message']['id'], 2)
+        self.assertIsNone(repo.append_message("missing", {'body': "x"}))
+        self.assertEqual(list(repo.summaries_for_member(1)), ["1"])
+        self.assertEqual(repo.summaries_for_member(2), {"1": summary, "2": repo.get("2").to_summary()})
+
+    def test_membership_index_backfilled(self):
+        """Test databases from before chat_members get the table filled on open"""
+        repo = SQLiteChatRepository(self.db)
+        repo.add(Chat("Study", "1", members=[1, 2]))
+        with repo._transaction() as conn:
+            conn.execute("DELETE FROM chat_members")
+
+        reopened = SQLiteChatRepository(self.db)
+
+        self.assertEqual(list(reopened.summaries_for_member(2)), ["1"])
+        chat = reopened.get("1")
+        chat.members.remove(2)
+        reopened.update("1", chat)
+        self.assertEqual(reopened.summaries_for_member(2), {})
+
+
+class TestSQLiteNotificationRepository(SQLiteTestCase):
+
+    def test_pagination_and_unread(self):
+        """Test cursor pagination and unread counting"""
+        repo = SQLiteNotificationRepository(self.db)
+        created = repo.create_many([Notification(1, f"m{i}") for i in range(4)])
+        repo.create(Notification(2, "other"))
+
+        page = repo.find_by_user_id(1, after=created[1].id, limit=5)
+        self.assertEqual([n.id for n in page], [n.id for n in created[2:]])
+
+        repo.mark_as_read(created[0].id)
+        repo.delete(created[1].id)
+        self.assertEqual(repo.count_unread(1), 2)
+        with self.assertRaises(ValueError):
+            repo.delete(created[1].id)
+
+
+class TestSQLiteProfileRepository(SQLiteTestCase):
+
+    def test_create_update(self):
+        """Test profiles are unique per user and updates persist"""
+        repo = SQLiteProfileRepository(self.db)
+        profile = repo.create(Profile(user_id=1, name="Max", availability=["Mon"]))
+
+        with self.assertRaises(ValueError):
+            repo.create(Profile(user_id=1))
+
+        repo.update(profile.id, {'major': "IT", 'availability': ["Tue"]})
+        found = SQLiteProfileRepository(self.db).find_by_user_id(1)
+
+        self.assertEqual(found.major, "IT")
+        self.assertEqual(found.availability, ["Tue"])
+
+
+class TestSQLiteStudySchedulerRepository(SQLiteTestCase):
+
+    def test_sessions_by_user(self):
+        """Test sessions are listed per user and deleted"""
+        repo = SQLiteStudySchedulerRepository(self.db)
+        session = repo.create(StudyScheduler(1, "Exam", "a", "b"))
+        repo.create(StudyScheduler(2, "Other", "a", "b"))
+
+        self.assertEqual([s.id for s in repo.get_sessions_by_user(1)], [session.id])
+
+        repo.delete(session.id)
+        self.assertEqual(repo.get_sessions_by_user(1), [])
+
+
+class TestSQLitePasswordResetTokenRepository(SQLiteTestCase):
+
+    def test_token_lifecycle(self):
+        """Test tokens are found, marked used and cleaned up"""
+        repo = SQLitePasswordResetTokenRepository(self.db)
+        token = repo.create(PasswordResetToken(user_id=1))
+        expired = repo.create(PasswordResetToken(user_id=2, expires_at=datetime.now() - timedelta(minutes=1)))
+
+        self.assertTrue(repo.find_by_token(token.token).is_valid())
+
+        self.assertEqual(repo.delete_expired_tokens(), 1)
+        self.assertIsNone(repo.find_by_id(expired.id))
+
+        repo.update(token.id, {'is_used': True})
+        self.assertFalse(repo.find_by_token(token.token).is_valid())
+
+
+
+class TestMigrateJsonToSQLite(SQLiteTestCase):
+
+    def test_sharded_data_directory(self):
+        """Test groups and chats are read from their shards, including unsaved journal messages"""
+        groups = GroupRepository(os.path.join(self.tmpdir, 'groups.json'), shards=4)
+        group = groups.create(Group("Algorithms", owner_id=1, specified_class="IT 326"))
+        chats = ChatRepository(os.path.join(self.tmpdir, 'chat.json'), journal=True, shards=4)
+        chats.create(Chat("Study", chat_id="1", members=[1, 2]))
+        chats.append_message("1", {'sender_id': 1, 'body': "hello"})
+
+        with patch('builtins.print'):
+            migrate(self.tmpdir, self.db, shards=4)
+
+        self.assertEqual(SQLiteGroupRepository(self.db).get(group.id).name, "Algorithms")
+        messages = SQLiteChatRepository(self.db).get_messages("1")
+        self.assertEqual([m['body'] for m in messages], ["hello"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for UserRepository
+
+Covers the id index kept alongside the email-keyed storage.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.user_repository import UserRepository
+from models.user import User
+
+# Pre-computed hash so tests don't pay for bcrypt
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+
+
+class TestUserRepository(unittest.TestCase):
+    """Test suite for UserRepository"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'users.json')
+        self.repo = UserRepository(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _create(self, email):
+        return self.repo.create(User(email=email, password_hash=PASSWORD_HASH))
+
+    def test_find_by_id_after_create(self):
+        """Test created users are reachable by id"""
+        user = self._create("a@school.edu")
+
+        self.assertIs(self.repo.find_by_id(user.id), user)
+
+    def test_find_by_id_missing(self):
+        """Test unknown ids return None"""
+        self.assertIsNone(self.repo.find_by_id(42))
+
+    def test_find_by_id_after_reload(self):
+        """Test the id index is rebuilt when loading from disk"""
+        user = self._create("a@school.edu")
+
+        reloaded = UserRepository(self.path)
+
+        self.assertEqual(reloaded.find_by_id(user.id).email, "a@school.edu")
+
+    def test_find_by_id_after_email_change(self):
+        """Test email changes keep both lookups consistent"""
+        user = self._create("a@school.edu")
+
+        self.repo.update(user.id, {'email': "b@school.edu"})
+
+        self.assertEqual(self.repo.find_by_id(user.id).email, "b@school.edu")
+        self.assertIs(self.repo.find_by_email("b@school.edu"), user)
+        self.assertIsNone(self.repo.find_by_email("a@school.edu"))
+
+    def test_email_change_to_taken_email_fails(self):
+        """Test changing to another user's email is rejected"""
+        first = self._create("a@school.edu")
+        second = self._create("b@school.edu")
+
+        with self.assertRaises(ValueError):
+            self.repo.update(second.id, {'email': "a@school.edu"})
+
+        self.assertIs(self.repo.find_by_email("a@school.edu"), first)
+        self.assertIs(self.repo.find_by_id(second.id), second)
+
+    def test_find_emails_by_ids(self):
+        """Test batch resolution returns emails for known ids only"""
+        first = self._create("a@school.edu")
+        second = self._create("b@school.edu")
+
+        result = self.repo.find_emails_by_ids([first.id, second.id, 999])
+
+        self.assertEqual(result, {first.id: "a@school.edu", second.id: "b@school.edu"})
+
+    def test_find_by_id_after_delete(self):
+        """Test deleted users are removed from the id index"""
+        user = self._create("a@school.edu")
+
+        self.repo.delete(user.id)
+
+        self.assertIsNone(self.repo.find_by_id(user.id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Unit tests for WriteBehind
+
+Covers synchronous mode, coalesced background writes and explicit flushes.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+import shutil
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from repositories.write_behind import WriteBehind, flush_all
+from repositories.user_repository import UserRepository
+from models.user import User
+
+PASSWORD_HASH = "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K"
+
+
+class TestWriteBehind(unittest.TestCase):
+    """Test suite for WriteBehind"""
+
+    def setUp(self):
+        self.writes = 0
+
+    def _write(self):
+        self.writes += 1
+
+    def test_zero_interval_writes_immediately(self):
+        """Test interval 0 keeps the old write-per-change behaviour"""
+        writer = WriteBehind(self._write)
+
+        writer.mark_dirty()
+        writer.mark_dirty()
+
+        self.assertEqual(self.writes, 2)
+        self.assertFalse(writer.dirty)
+
+    def test_changes_are_coalesced(self):
+        """Test a burst of changes within one interval is written once"""
+        writer = WriteBehind(self._write, interval=0.05)
+
+        for _ in range(10):
+            writer.mark_dirty()
+        self.assertEqual(self.writes, 0)
+        time.sleep(0.3)
+
+        self.assertEqual(self.writes, 1)
+        self.assertFalse(writer.dirty)
+
+    def test_flush_writes_pending_changes_once(self):
+        """Test flush writes immediately and is a no-op when clean"""
+        writer = WriteBehind(self._write, interval=60)
+
+        writer.mark_dirty()
+        writer.flush()
+        writer.flush()
+
+        self.assertEqual(self.writes, 1)
+
+    def test_flush_all_covers_every_writer(self):
+        """Test the shutdown hook flushes all dirty writers"""
+        first = WriteBehind(self._write, interval=60)
+        second = WriteBehind(self._write, interval=60)
+        first.mark_dirty()
+        second.mark_dirty()
+
+        flush_all()
+
+        self.assertEqual(self.writes, 2)
+
+    def test_failed_write_stays_dirty(self):
+        """Test a failing write keeps the changes pending for the next flush"""
+        failures = [OSError("disk full")]
+        def write():
+            if failures:
+                raise failures.pop()
+            self._write()
+        writer = WriteBehind(write, interval=60)
+        writer.mark_dirty()
+
+        with self.assertRaises(OSError):
+            writer.flush()
+        self.assertTrue(writer.dirty)
+        writer.flush()
+
+        self.assertEqual(self.writes, 1)
+        self.assertFalse(writer.dirty)
+
+
+class TestRepositoryWriteBehind(unittest.TestCase):
+    """Test a repository in write-behind mode"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'users.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_repository_defers_until_flush(self):
+        """Test mutations reach disk only when flushed"""
+        repo = UserRepository(self.path, flush_interval=60)
+        repo.create(User("a@university.edu", password_hash=PASSWORD_HASH))
+
+        self.assertFalse(os.path.exists(self.path))
+        repo.flush()
+
+        with open(self.path) as f:
+            self.assertEqual(len(json.load(f)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
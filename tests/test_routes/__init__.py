@@ -0,0 +1 @@
+# Route tests package initialization
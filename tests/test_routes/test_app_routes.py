@@ -0,0 +1,203 @@
+"""
+Route tests for the Flask app
+
+Drives the chat and notification endpoints through the Flask test client,
+with every service the routes use backed by repositories in a temporary
+directory.
+"""
+
+import unittest
+import os
+import sys
+import json
+import tempfile
+import shutil
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+# Hash on the calling thread; set before the app builds its hasher
+os.environ.setdefault('HASH_WORKERS', '0')
+
+import app as app_module
+from repositories.chat_repository import ChatRepository
+from repositories.notification_repository import NotificationRepository
+from repositories.user_repository import UserRepository
+from services.chat_service import ChatService
+from services.notification_service import NotificationService
+from services.message_broker import MessageBroker
+
+
+def sse_frames(response, count):
+    """The first count SSE events of a streamed response, as (id, data) pairs"""
+    frames = []
+    for chunk in response.response:
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if chunk.startswith(':'):
+            continue
+        lines = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+        frames.append((int(lines['id']), json.loads(lines['data'])))
+        if len(frames) == count:
+            break
+    return frames
+
+
+class TestAppRoutes(unittest.TestCase):
+    """Test suite for the chat and notification routes"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.broker = MessageBroker(max_subscribers=1)
+        self.chat_service = ChatService(ChatRepository(os.path.join(self.tmpdir, 'chat.json')), self.broker)
+        self.notification_service = NotificationService(
+            NotificationRepository(os.path.join(self.tmpdir, 'notifications.json')), self.broker)
+        for name, value in [('message_broker', self.broker), ('chat_service', self.chat_service),
+                            ('notification_service', self.notification_service),
+                            ('user_repo', UserRepository(os.path.join(self.tmpdir, 'users.json'))),
+                            ('STREAM_KEEPALIVE', 0.05)]:
+            patcher = patch.object(app_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = app_module.app.test_client()
+        with self.client.session_transaction() as session:
+            session['user_id'] = 1
+
+        self.chat = self.chat_service.create_chat("Study", 1, members=[2])
+        for i in range(1, 6):
+            self.chat_service.send_message(1, self.chat.chat_id, f"message {i}")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _bodies(self, response):
+        return [message['body'] for message in response.get_json()['messages']]
+
+    def test_chat_messages_pages_with_before_and_after(self):
+        """Test the messages route pages back with before and forward with after"""
+        url = f'/api/chat/{self.chat.chat_id}/messages'
+
+        newest = self.client.get(url, query_string={'limit': 2})
+        older = self.client.get(url, query_string={'before': newest.get_json()['before'], 'limit': 2})
+        newer = self.client.get(url, query_string={'after': 3})
+
+        self.assertEqual(self._bodies(newest), ["message 4", "message 5"])
+        self.assertEqual(self._bodies(older), ["message 2", "message 3"])
+        self.assertEqual(self._bodies(newer), ["message 4", "message 5"])
+        self.assertEqual(self.client.get(url, query_string={'before': 2}).get_json()['before'], None)
+
+    def test_chat_messages_rejects_invalid_cursors(self):
+        """Test non-integer before/after/limit and a limit below 1 are answered with 400"""
+        url = f'/api/chat/{self.chat.chat_id}/messages'
+
+        for query in [{'before': 'x'}, {'after': '1.5'}, {'limit': 'ten'}, {'limit': 0}]:
+            response = self.client.get(url, query_string=query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertFalse(response.get_json()['success'])
+
+    def test_chat_messages_requires_membership(self):
+        """Test only members can read a chat, and an unknown chat is 404"""
+        with self.client.session_transaction() as session:
+            session['user_id'] = 3
+
+        self.assertEqual(self.client.get(f'/api/chat/{self.chat.chat_id}/messages').status_code, 403)
+        self.assertEqual(self.client.get('/api/chat/missing/messages').status_code, 404)
+
+    def test_chat_stream_replays_since(self):
+        """Test the chat stream first replays the messages after since, then live ones"""
+        response = self.client.get(f'/api/chat/{self.chat.chat_id}/stream', query_string={'since': 3},
+                                   buffered=False)
+        self.addCleanup(response.close)
+
+        replayed = sse_frames(response, 2)
+        self.chat_service.send_message(2, self.chat.chat_id, "message 6")
+        live = sse_frames(response, 1)
+
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        self.assertEqual([(i, message['body']) for i, message in replayed], [(4, "message 4"), (5, "message 5")])
+        self.assertEqual([(i, message['body']) for i, message in live], [(6, "message 6")])
+
+    def test_chat_stream_invalid_since(self):
+        """Test a non-integer since is answered with 400"""
+        response = self.client.get(f'/api/chat/{self.chat.chat_id}/stream', query_string={'since': 'x'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_chat_stream_busy_when_broker_full(self):
+        """Test a stream beyond the broker's subscriber limit gets 503 with Retry-After"""
+        first = self.client.get(f'/api/chat/{self.chat.chat_id}/stream', buffered=False)
+        self.addCleanup(first.close)
+
+        second = self.client.get(f'/api/chat/{self.chat.chat_id}/stream', buffered=False)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 503)
+        self.assertEqual(second.headers['Retry-After'], '1')
+        first.close()
+        third = self.client.get(f'/api/chat/{self.chat.chat_id}/stream', buffered=False)
+        third.close()
+        self.assertEqual(third.status_code, 200)
+
+    def test_unread_count(self):
+        """Test the unread count covers only the user's notifications that are not read yet"""
+        first = self.notification_service.send_notification(1, "first")
+        self.notification_service.send_notification(1, "second")
+        self.notification_service.send_notification(2, "someone else's")
+        self.notification_service.mark_notifications_as_read(first.id)
+
+        response = self.client.get('/api/notifications/unread_count')
+
+        self.assertEqual(response.get_json(), {'success': True, 'unread': 1})
+
+    def test_notifications_page_with_next_cursor(self):
+        """Test paginated notifications hand out a next cursor until the last page"""
+        for i in range(1, 6):
+            self.notification_service.send_notification(1, f"notification {i}")
+        self.notification_service.send_notification(2, "someone else's")
+
+        pages, after = [], None
+        while True:
+            query = {'limit': 2} if after is None else {'after': after, 'limit': 2}
+            page = self.client.get('/api/notifications', query_string=query).get_json()
+            pages.append([notification['message'] for notification in page['notifications']])
+            after = page['next']
+            if after is None:
+                break
+
+        self.assertEqual(pages, [["notification 1", "notification 2"], ["notification 3", "notification 4"],
+                                 ["notification 5"]])
+
+    def test_notifications_page_rejects_invalid_cursors(self):
+        """Test non-integer after/limit and a limit below 1 are answered with 400"""
+        for query in [{'after': 'x'}, {'limit': 'ten'}, {'limit': 0}]:
+            response = self.client.get('/api/notifications', query_string=query)
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_notification_stream_replays_since(self):
+        """Test the notification stream replays what came after since, then pushes new ones"""
+        first = self.notification_service.send_notification(1, "first")
+        self.notification_service.send_notification(1, "second")
+        response = self.client.get('/api/notifications/stream', query_string={'since': first.id},
+                                   buffered=False)
+        self.addCleanup(response.close)
+
+        replayed = sse_frames(response, 1)
+        self.notification_service.send_notification(1, "third")
+        live = sse_frames(response, 1)
+
+        self.assertEqual([message['message'] for _, message in replayed + live], ["second", "third"])
+        self.assertGreater(live[0][0], replayed[0][0])
+
+    def test_notification_stream_busy_when_broker_full(self):
+        """Test the notification stream shares the stream limit and answers 503 beyond it"""
+        chat_stream = self.client.get(f'/api/chat/{self.chat.chat_id}/stream', buffered=False)
+        self.addCleanup(chat_stream.close)
+
+        response = self.client.get('/api/notifications/stream', buffered=False)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,11 +9,13 @@ import unittest
 from unittest.mock import Mock, MagicMock, patch
 import sys
 import os
+import threading
 
 # Add backend to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
 
 from services.auth_service import AuthService
+from services.password_hasher import HasherBusyError
 from models.user import User
 from models.password_reset import PasswordResetToken
 
@@ -25,12 +27,18 @@ class TestAuthService(unittest.TestCase):
         """Set up test fixtures before each test"""
         # Mock repositories
         self.mock_user_repo = Mock()
+        self.mock_user_repo.transaction.return_value = MagicMock()
         self.mock_token_repo = Mock()
+        self.mock_hasher = Mock()
+        self.mock_hasher.hash.return_value = "hashed_password"
+        self.mock_hasher.hash_if_idle.return_value = "hashed_password"
+        self.mock_hasher.needs_rehash.return_value = False
 
         # Create service instance with mocked dependencies
         self.auth_service = AuthService(
             user_repository=self.mock_user_repo,
-            token_repository=self.mock_token_repo
+            token_repository=self.mock_token_repo,
+            password_hasher=self.mock_hasher
         )
 
     def tearDown(self):
@@ -53,6 +61,8 @@ class TestAuthService(unittest.TestCase):
 
         # Assert
         self.mock_user_repo.create.assert_called_once()
+        self.mock_hasher.hash.assert_called_once_with(password)
+        self.assertEqual(self.mock_user_repo.create.call_args[0][0].password_hash, "hashed_password")
         self.assertEqual(result, mock_user)
         self.assertEqual(result.email, email)
 
@@ -99,7 +109,8 @@ class TestAuthService(unittest.TestCase):
         password = "SecurePass123!"
         mock_user = Mock(spec=User)
         mock_user.email = email
-        mock_user.verify_password.return_value = True
+        mock_user.password_hash = "stored_hash"
+        self.mock_hasher.verify.return_value = True
         self.mock_user_repo.find_by_email.return_value = mock_user
 
         # Act
@@ -107,7 +118,7 @@ class TestAuthService(unittest.TestCase):
 
         # Assert
         self.mock_user_repo.find_by_email.assert_called_once_with(email)
-        mock_user.verify_password.assert_called_once_with(password)
+        self.mock_hasher.verify.assert_called_once_with(password, "stored_hash")
         self.assertEqual(result, mock_user)
 
     def test_login_user_not_found(self):
@@ -123,13 +134,75 @@ class TestAuthService(unittest.TestCase):
 
         self.assertIn("Invalid email or password", str(context.exception))
 
+    def test_login_rehashes_outdated_hash_in_background(self):
+        """Test a hash below the target cost is replaced after a successful login"""
+        # Arrange
+        mock_user = Mock(spec=User)
+        mock_user.id = "user123"
+        mock_user.password_hash = "old_hash"
+        self.mock_hasher.verify.return_value = True
+        self.mock_hasher.needs_rehash.return_value = True
+        self.mock_user_repo.find_by_email.return_value = mock_user
+        self.mock_user_repo.find_by_id.return_value = mock_user
+        updated = threading.Event()
+        self.mock_user_repo.update.side_effect = lambda *args: updated.set()
+
+        # Act
+        result = self.auth_service.login("test@university.edu", "SecurePass123!")
+
+        # Assert
+        self.assertEqual(result, mock_user)
+        self.assertTrue(updated.wait(5))
+        self.mock_hasher.hash_if_idle.assert_called_once_with("SecurePass123!")
+        self.mock_user_repo.update.assert_called_once_with("user123", {'password_hash': "hashed_password"})
+
+    def test_login_rehash_skipped_if_password_changed(self):
+        """Test the background rehash never overwrites a newer password"""
+        # Arrange
+        mock_user = Mock(spec=User)
+        mock_user.id = "user123"
+        mock_user.password_hash = "old_hash"
+        changed_user = Mock(spec=User)
+        changed_user.password_hash = "reset_hash"
+        self.mock_hasher.verify.return_value = True
+        self.mock_hasher.needs_rehash.return_value = True
+        self.mock_user_repo.find_by_email.return_value = mock_user
+        looked_up = threading.Event()
+        def find_by_id(user_id):
+            looked_up.set()
+            return changed_user
+        self.mock_user_repo.find_by_id.side_effect = find_by_id
+
+        # Act
+        self.auth_service.login("test@university.edu", "SecurePass123!")
+
+        # Assert
+        self.assertTrue(looked_up.wait(5))
+        self.assertTrue(self.auth_service.wait_for_rehash(5), "Rehash did not finish")
+        self.mock_user_repo.update.assert_not_called()
+
+    def test_login_rehash_deferred_when_hasher_busy(self):
+        """Test a rehash with no idle worker is dropped quietly and the login still succeeds"""
+        mock_user = Mock(spec=User)
+        mock_user.id = "user123"
+        mock_user.password_hash = "old_hash"
+        self.mock_hasher.verify.return_value = True
+        self.mock_hasher.needs_rehash.return_value = True
+        self.mock_hasher.hash_if_idle.side_effect = HasherBusyError("busy")
+        self.mock_user_repo.find_by_email.return_value = mock_user
+
+        self.assertEqual(self.auth_service.login("test@university.edu", "SecurePass123!"), mock_user)
+
+        self.assertTrue(self.auth_service.wait_for_rehash(5), "Rehash did not finish")
+        self.mock_user_repo.update.assert_not_called()
+
     def test_login_wrong_password(self):
         """Test login fails with incorrect password"""
         # Arrange
         email = "test@university.edu"
         password = "WrongPassword"
         mock_user = Mock(spec=User)
-        mock_user.verify_password.return_value = False
+        self.mock_hasher.verify.return_value = False
         self.mock_user_repo.find_by_email.return_value = mock_user
 
         # Act & Assert
@@ -231,7 +304,6 @@ class TestAuthService(unittest.TestCase):
 
         mock_user = Mock(spec=User)
         mock_user.id = "user123"
-        mock_user._hash_password.return_value = "hashed_new_password"
         self.mock_user_repo.find_by_id.return_value = mock_user
 
         # Act
@@ -241,7 +313,8 @@ class TestAuthService(unittest.TestCase):
         self.mock_token_repo.find_by_token.assert_called_once_with(token_string)
         mock_token.is_valid.assert_called_once()
         self.mock_user_repo.find_by_id.assert_called_once_with("user123")
-        self.mock_user_repo.update.assert_called_once()
+        self.mock_hasher.hash.assert_called_once_with(new_password)
+        self.mock_user_repo.update.assert_called_once_with("user123", {'password_hash': "hashed_password"})
         self.mock_token_repo.update.assert_called_once()
         self.assertEqual(result, mock_user)
 
@@ -6,7 +6,7 @@ Uses mocking for repositories and models as per rubric requirements.
 """
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, MagicMock
 import sys
 import os
 
@@ -21,6 +21,13 @@ class TestChatService(unittest.TestCase):
 
     def setUp(self):
         self.mock_chat_repo = Mock()
+        self.mock_chat_repo.transaction.return_value = MagicMock()
+        # Stores the message as the chat's first and returns the summary, like the repositories
+        self.appended = []
+        def append_message(chat_id, message):
+            self.appended.append({'id': 1, **message})
+            return {'chat_id': chat_id, 'last_message': self.appended[-1]}
+        self.mock_chat_repo.append_message.side_effect = append_message
         self.chat_service = ChatService(chat_repo=self.mock_chat_repo)
 
 
@@ -135,8 +142,8 @@ class TestChatService(unittest.TestCase):
         user_id = "user123"
         friend_id = "user456"
 
-        self.mock_chat_repo.find_all.return_value = []
-        self.mock_chat_repo.storage.return_value = []
+        self.mock_chat_repo.find_dm.return_value = None
+        self.mock_chat_repo.next_id.return_value = "1"
 
         result = self.chat_service.create_DM(user_id, friend_id)
 
@@ -150,7 +157,7 @@ class TestChatService(unittest.TestCase):
 
         existing_dm = Mock(spec=Chat)
         existing_dm.name = f"DM_{user_id}_{friend_id}"
-        self.mock_chat_repo.find_all.return_value = [existing_dm]
+        self.mock_chat_repo.find_dm.return_value = existing_dm
 
         result = self.chat_service.create_DM(user_id, friend_id)
 
@@ -164,10 +171,12 @@ class TestChatService(unittest.TestCase):
 
         existing_dm = Mock(spec=Chat)
         existing_dm.name = f"DM_{friend_id}_{user_id}"  # Reverse order
-        self.mock_chat_repo.find_all.return_value = [existing_dm]
+        self.mock_chat_repo.find_dm.return_value = existing_dm
 
         result = self.chat_service.create_DM(user_id, friend_id)
 
+        self.mock_chat_repo.find_dm.assert_called_once_with(user_id, friend_id)
+        self.mock_chat_repo.find_all.assert_not_called()
         self.assertEqual(result, existing_dm)
 
 
@@ -177,15 +186,14 @@ class TestChatService(unittest.TestCase):
         chat_id = "chat123"
         message = "Hello, world!"
 
-        mock_chat = Mock(spec=Chat)
-        mock_chat.messages = []
-        self.mock_chat_repo.get.return_value = mock_chat
-
         result = self.chat_service.send_message(user_id, chat_id, message)
 
-        self.assertEqual(len(mock_chat.messages), 1)
-        self.assertIn(message, mock_chat.messages[0])
-        self.mock_chat_repo.update.assert_called_once()
+        self.assertEqual(len(self.appended), 1)
+        self.assertEqual(self.appended[0]['body'], message)
+        self.assertEqual(self.appended[0]['sender_id'], user_id)
+        self.assertEqual(result['last_message']['id'], 1)
+        self.mock_chat_repo.append_message.assert_called_once()
+        self.mock_chat_repo.transaction.return_value.__enter__.assert_called_once()
 
     def test_send_message_with_email(self):
         """Test sending message with email as sender"""
@@ -194,19 +202,25 @@ class TestChatService(unittest.TestCase):
         chat_id = "chat123"
         message = "Hi there"
 
-        mock_chat = Mock(spec=Chat)
-        mock_chat.messages = []
-        self.mock_chat_repo.get.return_value = mock_chat
-
         result = self.chat_service.send_message(user_id, chat_id, message, user_email)
 
         # Check that email was used in the message
-        self.assertEqual(len(mock_chat.messages), 1)
-        self.assertIn(user_email, mock_chat.messages[0])
+        self.assertEqual(len(self.appended), 1)
+        self.assertEqual(self.appended[0]['sender'], user_email)
+
+    def test_send_message_publishes_to_broker(self):
+        """Test a sent message is published on the chat's topic"""
+        broker = Mock()
+        service = ChatService(chat_repo=self.mock_chat_repo, broker=broker)
+
+        service.send_message("user123", "chat123", "Hello")
+
+        broker.publish.assert_called_once_with("chat:chat123", self.appended[0])
 
     def test_send_message_chat_not_found(self):
         """Test sending message to non-existent chat fails"""
-        self.mock_chat_repo.get.return_value = None
+        self.mock_chat_repo.append_message.side_effect = None
+        self.mock_chat_repo.append_message.return_value = None
 
         with self.assertRaises(ValueError) as context:
             self.chat_service.send_message("user123", "nonexistent", "message")
@@ -217,33 +231,23 @@ class TestChatService(unittest.TestCase):
     def test_list_all_chats_happy_path(self):
         """Test successfully listing all user chats"""
         user_id = "user123"
-
-        mock_chat1 = Mock(spec=Chat)
-        mock_chat1.chat_id = "chat1"
-        mock_chat1.members = ["user123", "user456"]
-        mock_chat1.to_dict.return_value = {"chat_id": "chat1"}
-
-        mock_chat2 = Mock(spec=Chat)
-        mock_chat2.chat_id = "chat2"
-        mock_chat2.members = ["user123"]
-        mock_chat2.to_dict.return_value = {"chat_id": "chat2"}
-
-        self.mock_chat_repo.find_all.return_value = [mock_chat1, mock_chat2]
+        self.mock_chat_repo.summaries_for_member.return_value = {
+            "chat1": {"chat_id": "chat1"},
+            "chat2": {"chat_id": "chat2"},
+        }
 
         result = self.chat_service.list_all_chats(user_id)
 
         self.assertEqual(len(result), 2)
         self.assertIn("chat1", result)
+        self.mock_chat_repo.summaries_for_member.assert_called_once_with(user_id)
+        self.mock_chat_repo.find_all.assert_not_called()
 
     def test_list_all_chats_no_chats(self):
         """Test listing chats when user has none"""
-        user_id = "user123"
+        self.mock_chat_repo.summaries_for_member.return_value = {}
 
-        mock_chat = Mock(spec=Chat)
-        mock_chat.members = ["user456"]
-        self.mock_chat_repo.find_all.return_value = [mock_chat]
-
-        result = self.chat_service.list_all_chats(user_id)
+        result = self.chat_service.list_all_chats("user123")
 
         self.assertEqual(len(result), 0)
 
@@ -265,6 +269,25 @@ class TestChatService(unittest.TestCase):
 
         self.assertIsNone(result)
 
+    def test_get_messages_happy_path(self):
+        """Test getting a page of messages passes the cursor through"""
+        page = [{"id": 4, "body": "hi"}]
+        self.mock_chat_repo.get_messages.return_value = page
+
+        result = self.chat_service.get_messages("chat123", before=5, limit=1)
+
+        self.assertEqual(result, page)
+        self.mock_chat_repo.get_messages.assert_called_once_with("chat123", before=5, limit=1, after=None)
+
+    def test_get_messages_chat_not_found(self):
+        """Test getting messages of a non-existent chat fails"""
+        self.mock_chat_repo.get_messages.return_value = None
+
+        with self.assertRaises(ValueError) as context:
+            self.chat_service.get_messages("nonexistent")
+
+        self.assertIn("Chat not found", str(context.exception))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
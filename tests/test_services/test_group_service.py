@@ -24,6 +24,7 @@ class TestGroupService(unittest.TestCase):
         """Set up test fixtures before each test"""
         # Mock repository
         self.mock_group_repo = Mock()
+        self.mock_group_repo.transaction.return_value = MagicMock()
 
         # Create service instance with mocked dependency
         self.group_service = GroupService(group_repo=self.mock_group_repo)
@@ -408,6 +409,27 @@ class TestGroupService(unittest.TestCase):
         # Assert
         self.assertEqual(len(result), 0)
 
+    def test_filter_groups_combined(self):
+        """Test combined class and time filtering defaults to AND"""
+        # Arrange
+        mock_groups = [Mock(id="group1")]
+        self.mock_group_repo.filter_by.return_value = mock_groups
+
+        # Act
+        result = self.group_service.filter_groups("CS101", "Monday 3-5pm")
+
+        # Assert
+        self.mock_group_repo.filter_by.assert_called_once_with("CS101", "Monday 3-5pm", match_all=True)
+        self.assertEqual(result, mock_groups)
+
+    def test_filter_groups_any(self):
+        """Test combined filtering can match either criterion"""
+        # Act
+        self.group_service.filter_groups("CS101", "Monday 3-5pm", match_all=False)
+
+        # Assert
+        self.mock_group_repo.filter_by.assert_called_once_with("CS101", "Monday 3-5pm", match_all=False)
+
 
     def test_get_group_happy_path(self):
         """Test successfully getting a group by ID"""
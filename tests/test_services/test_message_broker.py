@@ -0,0 +1,95 @@
+"""
+Unit tests for MessageBroker
+
+Covers topic delivery, waiting, and the bounded per-subscriber queue.
+"""
+
+import unittest
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from services.message_broker import MessageBroker, BrokerFullError
+
+
+class TestMessageBroker(unittest.TestCase):
+    """Test suite for MessageBroker"""
+
+    def setUp(self):
+        self.broker = MessageBroker(max_queue=3)
+
+    def test_publish_reaches_only_topic_subscribers(self):
+        """Test items are delivered to subscribers of the same topic only"""
+        first = self.broker.subscribe("chat:1")
+        other = self.broker.subscribe("chat:2")
+
+        delivered = self.broker.publish("chat:1", {"id": 1})
+
+        self.assertEqual(delivered, 1)
+        self.assertEqual(first.get(timeout=0), [{"id": 1}])
+        self.assertEqual(other.get(timeout=0), [])
+
+    def test_publish_without_subscribers(self):
+        """Test publishing to an idle topic is a no-op"""
+        self.assertEqual(self.broker.publish("chat:1", {"id": 1}), 0)
+
+    def test_subscriber_cap(self):
+        """Test subscriptions beyond max_subscribers are refused until one closes"""
+        broker = MessageBroker(max_subscribers=2)
+        first = broker.subscribe("chat:1")
+        broker.subscribe("notifications:1")
+
+        with self.assertRaises(BrokerFullError):
+            broker.subscribe("chat:2")
+        first.close()
+        first.close()
+        broker.subscribe("chat:2")
+        with self.assertRaises(BrokerFullError):
+            broker.subscribe("chat:3")
+
+    def test_get_wakes_on_publish(self):
+        """Test a waiting subscriber is woken by a publish from another thread"""
+        subscription = self.broker.subscribe("chat:1")
+        received = []
+        waiter = threading.Thread(target=lambda: received.extend(subscription.get(timeout=5)))
+        waiter.start()
+
+        self.broker.publish("chat:1", {"id": 1})
+        waiter.join(timeout=5)
+
+        self.assertEqual(received, [{"id": 1}])
+
+    def test_get_times_out_empty(self):
+        """Test an idle subscription returns nothing after the timeout"""
+        subscription = self.broker.subscribe("chat:1")
+
+        self.assertEqual(subscription.get(timeout=0.01), [])
+        self.assertFalse(subscription.overflowed)
+
+    def test_slow_subscriber_overflows(self):
+        """Test a full queue is dropped and the subscriber marked overflowed"""
+        slow = self.broker.subscribe("chat:1")
+        fast = self.broker.subscribe("chat:1", max_queue=10)
+
+        for i in range(4):
+            self.broker.publish("chat:1", {"id": i})
+
+        self.assertTrue(slow.overflowed)
+        self.assertEqual(slow.get(timeout=0), [])
+        self.assertEqual(len(fast.get(timeout=0)), 4)
+        self.assertEqual(self.broker.publish("chat:1", {"id": 5}), 1)
+
+    def test_close_unsubscribes(self):
+        """Test closing removes the subscription from its topic"""
+        subscription = self.broker.subscribe("chat:1")
+
+        subscription.close()
+
+        self.assertEqual(self.broker.subscriber_count("chat:1"), 0)
+        self.assertEqual(self.broker.publish("chat:1", {"id": 1}), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -63,6 +63,49 @@ class TestNotificationService(unittest.TestCase):
 
         self.mock_repo.create.assert_called_once()
 
+    def test_send_bulk_happy_path(self):
+        """Test bulk send builds one notification per user and writes once"""
+        user_ids = ["user1", "user2", "user3"]
+        self.mock_repo.create_many.side_effect = lambda notifications: notifications
+
+        result = self.notification_service.send_bulk(user_ids, "Group updated")
+
+        self.mock_repo.create_many.assert_called_once()
+        self.mock_repo.create.assert_not_called()
+        self.assertEqual([n.user_id for n in result], user_ids)
+        self.assertTrue(all(n.message == "Group updated" for n in result))
+
+    def test_send_bulk_no_users(self):
+        """Test bulk send with no recipients"""
+        self.mock_repo.create_many.side_effect = lambda notifications: notifications
+
+        result = self.notification_service.send_bulk([], "Nobody")
+
+        self.assertEqual(result, [])
+
+    def test_send_notification_publishes_to_broker(self):
+        """Test a created notification is pushed on the user's topic"""
+        broker = Mock()
+        service = NotificationService(repo=self.mock_repo, broker=broker)
+        notification = Notification("user123", "Hello")
+        notification.id = 7
+        self.mock_repo.create.return_value = notification
+
+        service.send_notification("user123", "Hello")
+
+        broker.publish.assert_called_once_with("notifications:user123", notification.to_dict())
+
+    def test_send_bulk_publishes_each_notification(self):
+        """Test bulk sends publish one event per recipient"""
+        broker = Mock()
+        service = NotificationService(repo=self.mock_repo, broker=broker)
+        self.mock_repo.create_many.side_effect = lambda notifications: notifications
+
+        service.send_bulk(["user1", "user2"], "Meeting moved")
+
+        topics = [call.args[0] for call in broker.publish.call_args_list]
+        self.assertEqual(topics, ["notifications:user1", "notifications:user2"])
+
     def test_get_notifications_happy_path(self):
         """Test successfully getting user notifications"""
         user_id = "user123"
@@ -98,6 +141,26 @@ class TestNotificationService(unittest.TestCase):
 
         self.assertEqual(len(result), 0)
 
+    def test_get_notifications_page(self):
+        """Test paginated retrieval passes the cursor through"""
+        user_id = "user123"
+        mock_notif = Mock(spec=Notification)
+        self.mock_repo.find_by_user_id.return_value = [mock_notif]
+
+        result = self.notification_service.get_notifications_page(user_id, after=5, limit=10)
+
+        self.mock_repo.find_by_user_id.assert_called_once_with(user_id, after=5, limit=10)
+        self.assertEqual(result, [mock_notif])
+
+    def test_get_unread_count(self):
+        """Test unread count comes from the repository counter"""
+        self.mock_repo.count_unread.return_value = 3
+
+        result = self.notification_service.get_unread_count("user123")
+
+        self.mock_repo.count_unread.assert_called_once_with("user123")
+        self.assertEqual(result, 3)
+
     def test_mark_notifications_as_read_happy_path(self):
         """Test successfully marking notification as read"""
         notif_id = "notif123"
@@ -0,0 +1,132 @@
+"""
+Unit tests for PasswordHasher
+
+Covers inline and pooled hashing, the configured cost and load shedding.
+"""
+
+import unittest
+import threading
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../backend')))
+
+from services.password_hasher import PasswordHasher, HasherBusyError, START_METHOD
+
+
+class TestPasswordHasher(unittest.TestCase):
+    """Test suite for PasswordHasher"""
+
+    def test_inline_hash_and_verify(self):
+        """Test workers=0 hashes on the calling thread with the configured cost"""
+        hasher = PasswordHasher(rounds=4)
+
+        password_hash = hasher.hash("SecurePass123!")
+
+        self.assertTrue(password_hash.startswith("$2b$04$"))
+        self.assertTrue(hasher.verify("SecurePass123!", password_hash))
+        self.assertFalse(hasher.verify("wrong", password_hash))
+        self.assertFalse(hasher.verify("SecurePass123!", None))
+
+    def test_needs_rehash_compares_cost(self):
+        """Test only hashes made with a different cost are flagged"""
+        hasher = PasswordHasher(rounds=5)
+
+        self.assertTrue(hasher.needs_rehash(PasswordHasher(rounds=4).hash("SecurePass123!")))
+        self.assertFalse(hasher.needs_rehash(hasher.hash("SecurePass123!")))
+        self.assertFalse(hasher.needs_rehash("not a bcrypt hash"))
+
+    def test_pool_hash_and_verify(self):
+        """Test hashing in worker processes gives hashes the model accepts"""
+        hasher = PasswordHasher(workers=2, rounds=4)
+        self.addCleanup(hasher.close)
+
+        password_hash = hasher.hash("SecurePass123!")
+
+        self.assertTrue(hasher.verify("SecurePass123!", password_hash))
+        self.assertFalse(hasher.verify("wrong", password_hash))
+        self.assertEqual(hasher.pending, 0)
+
+    def test_sheds_load_when_queue_is_full(self):
+        """Test calls beyond workers + max_queue fail fast instead of waiting"""
+        hasher = PasswordHasher(workers=1, max_queue=0, rounds=12)
+        self.addCleanup(hasher.close)
+        worker = threading.Thread(target=hasher.hash, args=("SecurePass123!",))
+        worker.start()
+        deadline = time.monotonic() + 5
+        while hasher.pending == 0:
+            if time.monotonic() > deadline:
+                self.fail("Hash never started")
+            time.sleep(0.001)
+
+        with self.assertRaises(HasherBusyError):
+            hasher.verify("SecurePass123!", "$2b$04$abcdefghijklmnopqrstuuJ8s0X9mGkNVYb3s1F0OQ8oBhKxW0E9K")
+        worker.join()
+
+        self.assertEqual(hasher.pending, 0)
+
+    def test_background_hash_needs_an_idle_worker(self):
+        """Test hash_if_idle is refused while logins hold the workers, and runs once one is free"""
+        hasher = PasswordHasher(workers=1, max_queue=4, rounds=12)
+        self.addCleanup(hasher.close)
+        worker = threading.Thread(target=hasher.hash, args=("SecurePass123!",))
+        worker.start()
+        deadline = time.monotonic() + 5
+        while hasher.pending == 0:
+            if time.monotonic() > deadline:
+                self.fail("Hash never started")
+            time.sleep(0.001)
+
+        with self.assertRaises(HasherBusyError):
+            hasher.hash_if_idle("SecurePass123!")
+        worker.join()
+
+        hasher.rounds = 4
+        self.assertTrue(hasher.verify("SecurePass123!", hasher.hash_if_idle("SecurePass123!")))
+        self.assertEqual(hasher.pending, 0)
+
+    def test_background_limit(self):
+        """Test background hashes never take more than background_limit workers"""
+        hasher = PasswordHasher(workers=4)
+
+        self.assertEqual(hasher.background_limit, 2)
+        hasher._background = 2
+        with self.assertRaises(HasherBusyError):
+            hasher.hash_if_idle("SecurePass123!")
+        self.assertIsNone(hasher._pool)
+
+    def test_pool_started_on_first_use(self):
+        """Test building a pooled hasher spawns no processes until it is used"""
+        hasher = PasswordHasher(workers=1, rounds=4)
+        self.addCleanup(hasher.close)
+
+        self.assertIsNone(hasher._pool)
+        hasher.hash("SecurePass123!")
+        self.assertIsNotNone(hasher._pool)
+
+    def test_workers_are_not_forked_from_the_server(self):
+        """Test the pool, started from a request thread, does not fork the threaded server"""
+        hasher = PasswordHasher(workers=1, rounds=4)
+        self.addCleanup(hasher.close)
+        result = []
+        caller = threading.Thread(target=lambda: result.append(hasher.hash("SecurePass123!")))
+        caller.start()
+        caller.join(30)
+
+        self.assertIn(START_METHOD, ('forkserver', 'spawn'))
+        self.assertEqual(hasher._pool._ctx.get_start_method(), START_METHOD)
+        self.assertTrue(hasher.verify("SecurePass123!", result[0]))
+
+    def test_slow_call_times_out(self):
+        """Test a call that gets no result in time raises HasherBusyError and frees its slot"""
+        hasher = PasswordHasher(workers=1, rounds=12, timeout=0.01)
+        self.addCleanup(hasher.close)
+
+        with self.assertRaises(HasherBusyError):
+            hasher.hash("SecurePass123!")
+        self.assertEqual(hasher.pending, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()